@@ -0,0 +1,101 @@
+"""
+Compara el pico de memoria y el tiempo de exportar a HTML el reporte de un día con
+muchas ventas construyendo el documento completo, como se hacía antes, y
+escribiéndolo a medida que se genera con generate_html_file.
+
+Uso, desde la raíz del proyecto:
+
+    python -m benchmarks.html_report_streaming [número de ventas]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from model.connection import create_database_engine
+from model.entity.models import Base, Product, Sale
+from model.report.day import DaySaleReport
+from model.report.generators import generate_html_file
+from model.repository.expense import ExpenseRepository
+from model.repository.sale import SaleRepository
+from model.repository.sales_grouped_by_product import SalesGroupedByProductRepository
+from model.util.monetary_types import CUPMoney
+
+DEFAULT_SALE_COUNT = 50_000
+PRODUCT_COUNT = 100
+REPORT_DATE = date(year=2000, month=1, day=1)
+
+
+def fill_database(engine, sale_count: int):
+    Base.metadata.create_all(engine)
+    price, cost = CUPMoney('10.50'), CUPMoney('5.00')
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {'id': an_id, 'name': f'producto {an_id}', 'description': '', 'price': price,
+             'cost': cost, 'quantity': 10}
+            for an_id in range(1, PRODUCT_COUNT + 1)])
+        connection.execute(insert(Sale), [
+            {'product_id': 1 + an_id % PRODUCT_COUNT, 'date': REPORT_DATE, 'price': price, 'cost': cost,
+             'quantity': 1}
+            for an_id in range(sale_count)])
+
+
+def create_report(session: Session) -> DaySaleReport:
+    return DaySaleReport(REPORT_DATE,
+                         sale_repo=SaleRepository(session),
+                         expense_repo=ExpenseRepository(session),
+                         grouped_sales_repo=SalesGroupedByProductRepository(session))
+
+
+def write_whole_document(file_path: Path, report: DaySaleReport):
+    report_statistics = report.get_snapshot().statistic
+    html = report.get_template().render(date=REPORT_DATE,
+                                        sale_quantity=report_statistics.sale_quantity(),
+                                        total_collected_money=report_statistics.paid_money().amount,
+                                        total_cost=report_statistics.cost_money().amount,
+                                        total_profit=report_statistics.profit_money().amount,
+                                        total_expense=report_statistics.total_expenses().amount,
+                                        net_profit=report_statistics.net_profit().amount,
+                                        sales=report.get_sale_rows())
+    with file_path.open(mode='w') as file:
+        file.write(html)
+
+
+def measure(engine, file_path: Path, export) -> tuple:
+    """
+    Devuelve el tiempo en segundos y el pico de memoria en bytes de exportar un
+    reporte nuevo, con una sesión nueva.
+    """
+    with Session(engine) as session:
+        report = create_report(session)
+        tracemalloc.start()
+        start = time.perf_counter()
+        export(file_path, report)
+        duration = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return duration, peak_memory
+
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_database_engine(f'sqlite:///{Path(directory, "report.db")}')
+        fill_database(engine, sale_count)
+        print(f'Reporte de un día con {sale_count} ventas')
+
+        for title, export in (('Documento completo', write_whole_document),
+                              ('generate_html_file por partes', generate_html_file)):
+            duration, peak_memory = measure(engine, Path(directory, 'report.html'), export)
+            print(f'{title:<30} {duration * 1000:9.1f} ms   pico de memoria {peak_memory / 2 ** 20:8.1f} MiB')
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
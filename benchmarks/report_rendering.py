@@ -0,0 +1,78 @@
+"""
+Compara el tiempo de renderizar repetidamente el reporte mensual creando un
+Environment de Jinja2 en cada renderizado, como se hacía antes, con el de usar el
+registro de plantillas y sus plantillas precompiladas.
+
+Uso, desde la raíz del proyecto:
+
+    python -m benchmarks.report_rendering [número de renderizados]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from jinja2 import Environment, PackageLoader, ModuleLoader, select_autoescape
+
+from model.entity.sales_grouped_by_product import SalesGroupedByProduct
+from model.report.template_registry import get_report_template, create_report_environment, \
+    compile_report_templates
+from model.util.monetary_types import CUPMoney
+
+DEFAULT_RENDER_COUNT = 200
+GROUP_COUNT = 50
+TEMPLATE_NAME = 'month_report.html'
+
+
+def create_context() -> dict:
+    sale_groups = [SalesGroupedByProduct(product_id=an_id, product_name=f'producto {an_id}', sale_quantity=3,
+                                         acquired_money=CUPMoney('30.00'), total_cost=CUPMoney('15.00'),
+                                         total_profit=CUPMoney('15.00'), initial_date=date(2022, 5, 1),
+                                         final_date=date(2022, 5, 31))
+                   for an_id in range(1, GROUP_COUNT + 1)]
+    return dict(month_date=date(2022, 5, 1), sale_quantity=3 * GROUP_COUNT, total_collected_money='1500.00',
+                total_cost='750.00', total_profit='750.00', total_expense='0.00', net_profit='750.00',
+                sale_groups=sale_groups)
+
+
+def measure_render_latencies(get_template, render_count: int) -> list:
+    context = create_context()
+    latencies = []
+    for _ in range(render_count):
+        start = time.perf_counter()
+        get_template().render(**context)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def get_template_from_new_environment():
+    environment = Environment(loader=PackageLoader('model.report'), autoescape=select_autoescape())
+    return environment.get_template(TEMPLATE_NAME)
+
+
+def print_latencies(title: str, latencies: list):
+    milliseconds = list(map(lambda latency: latency * 1000, latencies))
+    print(f'{title:<38} primero {milliseconds[0]:7.3f} ms   '
+          f'mediana {statistics.median(milliseconds):7.3f} ms   total {sum(milliseconds):9.1f} ms')
+
+
+def main():
+    render_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RENDER_COUNT
+    print(f'{render_count} renderizados de {TEMPLATE_NAME} con {GROUP_COUNT} productos')
+
+    print_latencies('Environment nuevo en cada renderizado',
+                    measure_render_latencies(get_template_from_new_environment, render_count))
+    print_latencies('Registro de plantillas',
+                    measure_render_latencies(lambda: get_report_template(TEMPLATE_NAME), render_count))
+
+    with tempfile.TemporaryDirectory() as directory:
+        compile_report_templates(directory)
+        compiled_environment = create_report_environment(ModuleLoader(directory))
+        print_latencies('Plantillas precompiladas',
+                        measure_render_latencies(lambda: compiled_environment.get_template(TEMPLATE_NAME),
+                                                 render_count))
+
+
+if __name__ == '__main__':
+    main()
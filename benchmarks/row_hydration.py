@@ -0,0 +1,97 @@
+"""
+Compara el tiempo y la memoria de leer productos, ventas y gastos como entidades
+del ORM y como filas de solo lectura.
+
+Uso, desde la raíz del proyecto:
+
+    python -m benchmarks.row_hydration [número de filas]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from model.connection import create_database_engine
+from model.entity.models import Base, Product, Sale, Expense
+from model.repository.expense import ExpenseRepository, ExpenseFilter
+from model.repository.product import ProductRepository
+from model.repository.sale import SaleRepository, SaleFilter
+from model.util.monetary_types import CUPMoney
+
+DEFAULT_ROW_COUNT = 100_000
+MEASUREMENT_COUNT = 3
+
+
+def fill_database(engine, row_count: int):
+    Base.metadata.create_all(engine)
+    first_date = date(year=2000, month=1, day=1)
+    price, cost, spent_money = CUPMoney('10.50'), CUPMoney('5.00'), CUPMoney('25.00')
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {'id': an_id, 'name': f'producto {an_id}', 'description': '', 'price': price,
+             'cost': cost, 'quantity': 10}
+            for an_id in range(1, row_count + 1)])
+        connection.execute(insert(Sale), [
+            {'product_id': 1 + an_id % row_count, 'date': first_date + timedelta(days=an_id % 365),
+             'price': price, 'cost': cost, 'quantity': 1 + an_id % 3}
+            for an_id in range(row_count)])
+        connection.execute(insert(Expense), [
+            {'name': f'gasto {an_id}', 'description': '', 'spent_money': spent_money,
+             'date': first_date + timedelta(days=an_id % 365)}
+            for an_id in range(row_count)])
+
+
+def measure(engine, read) -> tuple:
+    """
+    Devuelve el mejor tiempo en segundos de read y el pico de memoria en bytes que
+    usó una lectura. Cada lectura usa una sesión nueva, sin entidades cargadas.
+    """
+    durations = []
+    for _ in range(MEASUREMENT_COUNT):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            read(session)
+            durations.append(time.perf_counter() - start)
+
+    with Session(engine) as session:
+        tracemalloc.start()
+        read(session)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return min(durations), peak_memory
+
+
+def print_comparison(title: str, engine, read_entities, read_rows):
+    for kind, read in (('entidades', read_entities), ('filas', read_rows)):
+        duration, peak_memory = measure(engine, read)
+        print(f'{title:<10} {kind:<10} {duration * 1000:9.1f} ms   pico de memoria {peak_memory / 2 ** 20:8.1f} MiB')
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_database_engine(f'sqlite:///{Path(directory, "rows.db")}')
+        fill_database(engine, row_count)
+        print(f'{row_count} filas por tabla')
+
+        print_comparison('Productos', engine,
+                         lambda session: ProductRepository(session).get_all_products(),
+                         lambda session: ProductRepository(session).get_all_product_rows())
+        print_comparison('Ventas', engine,
+                         lambda session: SaleRepository(session).get_sales_by_filter(SaleFilter()),
+                         lambda session: SaleRepository(session).get_sale_rows_by_filter(SaleFilter()))
+        print_comparison('Gastos', engine,
+                         lambda session: ExpenseRepository(session).get_expenses_by_filter(ExpenseFilter()),
+                         lambda session: ExpenseRepository(session).get_expense_rows_by_filter(ExpenseFilter()))
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Mide la latencia de registrar una venta con SaleRepository.insert_sales usando el
+engine anterior (NullPool y PRAGMA por defecto) y el engine de model.connection.
+
+Uso, desde la raíz del proyecto:
+
+    python -m benchmarks.sale_insertion [número de ventas]
+"""
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from model.connection import create_database_engine
+from model.entity.models import Base, Product, Sale
+from model.repository.product import ProductRepository
+from model.repository.sale import SaleRepository
+from model.util.monetary_types import CUPMoney
+
+DEFAULT_SALE_COUNT = 500
+
+
+def measure_sale_insertion_latencies(engine, sale_count: int) -> list:
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    product = Product(name='chair', price=CUPMoney('10.00'), cost=CUPMoney('5.00'), quantity=sale_count)
+    ProductRepository(session).insert_product(product)
+    sale_repository = SaleRepository(session)
+
+    latencies = []
+    for _ in range(sale_count):
+        start = time.perf_counter()
+        sale_repository.insert_sales(Sale(product_id=product.id, price=product.price, cost=product.cost), 1)
+        latencies.append(time.perf_counter() - start)
+
+    session.close()
+    engine.dispose()
+    return latencies
+
+
+def print_latencies(title: str, latencies: list):
+    milliseconds = sorted(map(lambda a_latency: a_latency * 1000, latencies))
+    percentile_95 = milliseconds[int(len(milliseconds) * 0.95) - 1]
+    print(f'{title:<40} mediana {statistics.median(milliseconds):8.3f} ms   '
+          f'p95 {percentile_95:8.3f} ms   total {sum(milliseconds):9.1f} ms')
+
+
+def main():
+    sale_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SALE_COUNT
+
+    with tempfile.TemporaryDirectory() as directory:
+        old_url = f'sqlite:///{Path(directory, "null_pool.db")}'
+        new_url = f'sqlite:///{Path(directory, "pooled.db")}'
+
+        print_latencies('NullPool, PRAGMA por defecto',
+                        measure_sale_insertion_latencies(create_engine(old_url, poolclass=NullPool), sale_count))
+        print_latencies('Pool persistente, WAL y PRAGMA',
+                        measure_sale_insertion_latencies(create_database_engine(new_url), sale_count))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,15 @@
+import multiprocessing
+
 from easy_mvp.application_manager import ApplicationManager
 from easy_mvp.intent import Intent
 from presenter.main import MainPresenter
 from util.resources_path import resource_path
 
 
-app = ApplicationManager(app_name='Blue POS',
-                         window_icon_path=resource_path('view/ui/images/bluepos.png'))
-intent = Intent(MainPresenter)
-app.execute_app(intent)
+if __name__ == '__main__':
+    # Los procesos del servicio de PDF vuelven a importar este módulo.
+    multiprocessing.freeze_support()
+    app = ApplicationManager(app_name='Blue POS',
+                             window_icon_path=resource_path('view/ui/images/bluepos.png'))
+    intent = Intent(MainPresenter)
+    app.execute_app(intent)
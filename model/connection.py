@@ -0,0 +1,48 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# Se aplican a cada conexión nueva del pool. El modo WAL permite leer mientras se
+# escribe y, junto con synchronous=NORMAL, evita sincronizar el disco en cada
+# transacción. Un cache_size negativo se expresa en KiB.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,
+    'mmap_size': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+POOL_SIZE = 5
+
+# Límite de parámetros por sentencia de las versiones de SQLite anteriores a la 3.32.
+# Las sentencias con listas de ids largas se dividen para no superarlo.
+MAX_BOUND_PARAMETERS = 999
+
+
+def create_database_engine(url: str, pragmas: dict = None, **engine_arguments) -> Engine:
+    """
+    Crea un engine con un pool de conexiones persistentes a la base de datos SQLite
+    indicada por url. Cada conexión recibe los PRAGMA de pragmas, o DEFAULT_PRAGMAS
+    si no se indican.
+    """
+    if pragmas is None:
+        pragmas = DEFAULT_PRAGMAS
+
+    engine = create_engine(url, poolclass=QueuePool, pool_size=POOL_SIZE,
+                           connect_args={'check_same_thread': False}, **engine_arguments)
+    event.listen(engine, 'connect', lambda dbapi_connection, connection_record:
+                 apply_pragmas(dbapi_connection, pragmas))
+    return engine
+
+
+def apply_pragmas(dbapi_connection, pragmas: dict):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+
+def split_in_chunks(items: list, chunk_size: int = MAX_BOUND_PARAMETERS) -> list:
+    return [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
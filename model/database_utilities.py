@@ -1,6 +1,4 @@
 import sqlite3
-from pathlib import Path
-import shutil
 
 
 def backup_database(database_path: str, backup_path: str):
@@ -13,6 +11,6 @@ def backup_database(database_path: str, backup_path: str):
 
 
 def restore_database(database_path: str, backup_path: str):
-    working_database_path = Path(database_path)
-    backup_database_path = Path(backup_path)
-    shutil.copy(backup_database_path.absolute(), working_database_path.absolute())
+    # Copiar el archivo encima de una base de datos en modo WAL dejaría un archivo
+    # -wal que no le corresponde, por eso se restaura con la API de backup de SQLite.
+    backup_database(backup_path, database_path)
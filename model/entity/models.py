@@ -1,8 +1,10 @@
 from sqlalchemy.orm import declarative_base, relationship, backref
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, Index, DDL, event
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Date
+from sqlalchemy import DateTime
+from model.util.full_text_search import FullTextSearchIndex
 from model.util.money_colum import MoneyColumn
 from model.util.monetary_types import CUPMoney
 from datetime import date
@@ -42,11 +44,47 @@ class Product(Base):
         return self.price - self.cost
 
 
+products_search_index = FullTextSearchIndex('products', ('name', 'description'))
+
+
+class Ticket(Base):
+    """
+    Agrupa las líneas de venta que se cobraron juntas a un mismo cliente. El total
+    se guarda al cobrar y se actualiza al modificar o deshacer sus ventas, así los
+    tickets de un día se listan sin sumar sus líneas. Los tickets de días anteriores
+    que se registran sin indicar la hora tienen created_at en NULL.
+    """
+
+    def __repr__(self):
+        return 'Ticket(id: {}, date: {}, created_at: {}, total: {})'.format(self.id, self.date, self.created_at,
+                                                                            self.total)
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __eq__(self, other):
+        return self.id == other.id and self.date == other.date and self.created_at == other.created_at and \
+            self.total == other.total
+
+    __tablename__ = 'tickets'
+    __table_args__ = (
+        Index('ix_tickets_date', 'date', 'total'),
+        Index('ix_tickets_created_at', 'created_at', 'total'),
+    )
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+    created_at = Column(DateTime)
+    total = Column(MoneyColumn(), nullable=False)
+    sales = relationship('Sale', back_populates='ticket')
+
+
 class Sale(Base):
 
     def __repr__(self):
-        return 'Sale(id: {}, product_id: "{}", date: "{}", price: {}, cost: {}, profit: {})'\
-            .format(self.id, self.product_id, self.date, self.price, self.cost, self.profit)
+        return 'Sale(id: {}, product_id: "{}", date: "{}", price: {}, cost: {}, profit: {}, quantity: {}, ' \
+               'ticket_id: {}, sold_at: {})'\
+            .format(self.id, self.product_id, self.date, self.price, self.cost, self.profit, self.quantity,
+                    self.ticket_id, self.sold_at)
 
     def __str__(self):
         return self.__repr__()
@@ -54,15 +92,31 @@ class Sale(Base):
     def __eq__(self, other):
         return (self.id == other.id and self.product_id == other.product_id
                 and self.date == other.date and self.price == other.price
-                and self.cost == other.cost and self.profit == other.profit)
+                and self.cost == other.cost and self.profit == other.profit
+                and self.quantity == other.quantity and self.ticket_id == other.ticket_id
+                and self.sold_at == other.sold_at)
 
     __tablename__ = 'sales'
+    __table_args__ = (
+        Index('ix_sales_date_product_id', 'date', 'product_id'),
+        Index('ix_sales_product_id_date', 'product_id', 'date'),
+        Index('ix_sales_ticket_id', 'ticket_id'),
+        Index('ix_sales_sold_at', 'sold_at', 'quantity', 'price'),
+    )
     id = Column(Integer, primary_key=True)
     product_id = Column(Integer, ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
     date = Column(Date, nullable=False, default=date.today())
     price = Column(MoneyColumn(), nullable=False, default=CUPMoney('1.00'))
     cost = Column(MoneyColumn(), nullable=False, default=CUPMoney('1.00'))
-    product = relationship('Product', backref=backref('sales', cascade='all,delete'))
+    quantity = Column(Integer, nullable=False, default=1)
+    ticket_id = Column(Integer, ForeignKey('tickets.id'), nullable=True)
+    # Fecha y hora de la venta. Las ventas anteriores a esta columna solo tienen la
+    # fecha, así que no se usan en los análisis por hora.
+    sold_at = Column(DateTime, nullable=True)
+    # El producto se carga con las opciones de SaleRepository. Leerlo sin haberlo
+    # cargado lanza una excepción, así no se cuela una consulta por cada venta.
+    product = relationship('Product', backref=backref('sales', cascade='all,delete'), lazy='raise')
+    ticket = relationship('Ticket', back_populates='sales')
 
     @property
     def profit(self):
@@ -70,6 +124,46 @@ class Sale(Base):
             return None
         return self.price - self.cost
 
+    @property
+    def total_price(self):
+        if self.price is None or self.quantity is None:
+            return None
+        return self.price * self.quantity
+
+    @property
+    def total_cost(self):
+        if self.cost is None or self.quantity is None:
+            return None
+        return self.cost * self.quantity
+
+    @property
+    def total_profit(self):
+        if self.profit is None or self.quantity is None:
+            return None
+        return self.profit * self.quantity
+
+
+class DailyProductSales(Base):
+    """
+    Unidades vendidas, dinero obtenido y costo total de un producto en un día. La
+    tabla se mantiene al insertar, actualizar o eliminar ventas para que los reportes
+    de un rango de fechas no tengan que agrupar cada venta.
+    """
+
+    def __repr__(self):
+        return 'DailyProductSales(date: {}, product_id: {}, units: {}, revenue: {}, cost: {})'\
+            .format(self.date, self.product_id, self.units, self.revenue, self.cost)
+
+    def __str__(self):
+        return self.__repr__()
+
+    __tablename__ = 'daily_product_sales'
+    date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey('products.id', ondelete='CASCADE'), primary_key=True)
+    units = Column(Integer, nullable=False)
+    revenue = Column(MoneyColumn(), nullable=False)
+    cost = Column(MoneyColumn(), nullable=False)
+
 
 EXPENSE_NAME_MAX_LENGTH = 100
 EXPENSE_DESCRIPTION_MAX_LENGTH = 600
@@ -88,9 +182,37 @@ class Expense(Base):
                 and self.spent_money == other.spent_money and self.date == other.date)
 
     __tablename__ = 'expenses'
+    __table_args__ = (
+        Index('ix_expenses_date', 'date'),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String(length=EXPENSE_NAME_MAX_LENGTH), nullable=False)
     description = Column(String(length=EXPENSE_DESCRIPTION_MAX_LENGTH), nullable=True, default='')
     spent_money = Column(MoneyColumn(), nullable=False, default=CUPMoney('-1.00'))
     date = Column(Date, nullable=False, default=date.today())
 
+
+expenses_search_index = FullTextSearchIndex('expenses', ('name', 'description'))
+
+
+class DailyExpenseTotal(Base):
+    """
+    Dinero gastado en un día. La tabla se mantiene al insertar, actualizar o
+    eliminar gastos para que el total de un rango no tenga que leer cada gasto.
+    """
+
+    def __repr__(self):
+        return 'DailyExpenseTotal(date: {}, spent_money: {})'.format(self.date, self.spent_money)
+
+    def __str__(self):
+        return self.__repr__()
+
+    __tablename__ = 'daily_expense_totals'
+    date = Column(Date, primary_key=True)
+    spent_money = Column(MoneyColumn(), nullable=False)
+
+
+# Las tablas de búsqueda no son modelos, se crean junto con las tablas que indexan.
+for a_model, a_search_index in ((Product, products_search_index), (Expense, expenses_search_index)):
+    for a_statement in a_search_index.get_create_statements():
+        event.listen(a_model.__table__, 'after_create', DDL(a_statement))
@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class ProductRow(NamedTuple):
+    """
+    Producto de solo lectura para mostrar en tablas. Los montos de dinero son Decimal
+    en CUP en lugar de objetos Money.
+    """
+    id: int
+    name: str
+    price: Decimal
+    cost: Decimal
+    quantity: int
+
+    @property
+    def profit(self) -> Decimal:
+        return self.price - self.cost
+
+
+class SaleRow(NamedTuple):
+    """
+    Venta de solo lectura para mostrar en tablas, con el nombre de su producto. Los
+    montos de dinero son Decimal en CUP y son los de una unidad vendida.
+    """
+    id: int
+    product_id: int
+    product_name: str
+    date: date
+    quantity: int
+    price: Decimal
+    cost: Decimal
+
+    @property
+    def profit(self) -> Decimal:
+        return self.price - self.cost
+
+    @property
+    def total_price(self) -> Decimal:
+        return self.price * self.quantity
+
+    @property
+    def total_cost(self) -> Decimal:
+        return self.cost * self.quantity
+
+    @property
+    def total_profit(self) -> Decimal:
+        return self.profit * self.quantity
+
+
+class ExpenseRow(NamedTuple):
+    """
+    Gasto de solo lectura para mostrar en tablas. El dinero gastado es un Decimal en
+    CUP.
+    """
+    id: int
+    name: str
+    description: str
+    spent_money: Decimal
+    date: date
@@ -0,0 +1,53 @@
+from datetime import date
+from money import Money
+
+from model.util.monetary_types import CUPMoney
+
+WEEKDAY_QUANTITY = 7
+HOUR_QUANTITY = 24
+
+
+class SalesHeatmap:
+    """
+    Unidades vendidas y dinero obtenido en cada hora de cada día de la semana de un
+    rango de fechas. Los días de la semana van de 0 (lunes) a 6 (domingo), como en
+    date.weekday().
+    """
+
+    def __init__(self, initial_date: date, final_date: date):
+        self.__initial_date = initial_date
+        self.__final_date = final_date
+        self.__units = [[0] * HOUR_QUANTITY for _ in range(WEEKDAY_QUANTITY)]
+        self.__acquired_money = [[CUPMoney('0.00')] * HOUR_QUANTITY for _ in range(WEEKDAY_QUANTITY)]
+
+    def __eq__(self, other):
+        return (self.__initial_date == other.initial_date
+                and self.__final_date == other.final_date
+                and all(self.get_units(weekday, hour) == other.get_units(weekday, hour)
+                        and self.get_acquired_money(weekday, hour) == other.get_acquired_money(weekday, hour)
+                        for weekday in range(WEEKDAY_QUANTITY) for hour in range(HOUR_QUANTITY)))
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f'SalesHeatmap(initial_date: {self.__initial_date}, final_date: {self.__final_date}, ' \
+               f'units: {self.__units})'
+
+    @property
+    def initial_date(self) -> date:
+        return self.__initial_date
+
+    @property
+    def final_date(self) -> date:
+        return self.__final_date
+
+    def set_cell(self, weekday: int, hour: int, units: int, acquired_money: Money):
+        self.__units[weekday][hour] = units
+        self.__acquired_money[weekday][hour] = acquired_money
+
+    def get_units(self, weekday: int, hour: int) -> int:
+        return self.__units[weekday][hour]
+
+    def get_acquired_money(self, weekday: int, hour: int) -> Money:
+        return self.__acquired_money[weekday][hour]
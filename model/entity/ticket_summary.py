@@ -0,0 +1,54 @@
+from datetime import datetime
+from money import Money
+
+from model.util.monetary_types import CUPMoney, money_to_cents, cents_to_money
+
+
+class TicketSummary:
+
+    def __init__(self, initial_time: datetime, final_time: datetime, ticket_quantity: int, total: Money):
+        self.__initial_time = initial_time
+        self.__final_time = final_time
+        self.__ticket_quantity = ticket_quantity
+        self.__total = total
+
+    def __eq__(self, other):
+        return (self.__initial_time == other.initial_time
+                and self.__final_time == other.final_time
+                and self.__ticket_quantity == other.ticket_quantity
+                and self.__total == other.total)
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self) -> str:
+        return f'TicketSummary(initial_time: {self.__initial_time}, final_time: {self.__final_time}, ' \
+               f'ticket_quantity: {self.__ticket_quantity}, total: {self.__total})'
+
+    @property
+    def initial_time(self) -> datetime:
+        return self.__initial_time
+
+    @property
+    def final_time(self) -> datetime:
+        """
+        Primer instante que ya no pertenece al período.
+        """
+        return self.__final_time
+
+    @property
+    def ticket_quantity(self) -> int:
+        return self.__ticket_quantity
+
+    @property
+    def total(self) -> Money:
+        return self.__total
+
+    @property
+    def average_ticket(self) -> Money:
+        """
+        Total promedio de un ticket, redondeado al centavo.
+        """
+        if self.__ticket_quantity == 0:
+            return CUPMoney('0.00')
+        return cents_to_money(money_to_cents(self.__total / self.__ticket_quantity))
@@ -0,0 +1,225 @@
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine, Connection
+
+from model.entity.models import Base, products_search_index, expenses_search_index
+from model.util.monetary_types import CUPMoney, money_to_cents
+
+
+def __collapse_unit_sales_into_sale_lines(connection: Connection):
+    """
+    Las versiones anteriores guardaban una fila por cada unidad vendida. Las ventas
+    idénticas (mismo producto, fecha, precio y costo) se agrupan en una sola fila
+    con la cantidad de unidades vendidas.
+    """
+    connection.exec_driver_sql('ALTER TABLE sales ADD COLUMN quantity INTEGER NOT NULL DEFAULT 1')
+    connection.exec_driver_sql('CREATE TEMPORARY TABLE sale_lines (id INTEGER PRIMARY KEY, quantity INTEGER NOT NULL)')
+    connection.exec_driver_sql('INSERT INTO sale_lines (id, quantity) '
+                               'SELECT MIN(id), COUNT(id) FROM sales GROUP BY product_id, date, price, cost')
+    connection.exec_driver_sql('DELETE FROM sales WHERE id NOT IN (SELECT id FROM sale_lines)')
+    connection.exec_driver_sql('UPDATE sales SET quantity = '
+                               '(SELECT sale_lines.quantity FROM sale_lines WHERE sale_lines.id = sales.id)')
+    connection.exec_driver_sql('DROP TABLE sale_lines')
+
+
+def __store_money_as_integer_cents(connection: Connection):
+    """
+    Las columnas de dinero se guardaban como TEXT. SQLite no cambia la afinidad de
+    una columna, así que las tablas se reconstruyen con columnas INTEGER y los
+    textos se convierten a centavos de forma exacta usando Decimal.
+    """
+    connection.connection.create_function(
+        'money_text_to_cents', 1, lambda amount: money_to_cents(CUPMoney(amount)), deterministic=True)
+
+    connection.exec_driver_sql(
+        'CREATE TABLE new_products (id INTEGER NOT NULL, name VARCHAR(80) NOT NULL, description VARCHAR(300), '
+        'price INTEGER NOT NULL, cost INTEGER NOT NULL, quantity INTEGER NOT NULL, PRIMARY KEY (id), UNIQUE (name))')
+    connection.exec_driver_sql(
+        'INSERT INTO new_products (id, name, description, price, cost, quantity) '
+        'SELECT id, name, description, money_text_to_cents(price), money_text_to_cents(cost), quantity '
+        'FROM products')
+
+    connection.exec_driver_sql(
+        'CREATE TABLE new_sales (id INTEGER NOT NULL, product_id INTEGER NOT NULL, date DATE NOT NULL, '
+        'price INTEGER NOT NULL, cost INTEGER NOT NULL, quantity INTEGER NOT NULL, PRIMARY KEY (id), '
+        'FOREIGN KEY(product_id) REFERENCES products (id) ON DELETE CASCADE)')
+    connection.exec_driver_sql(
+        'INSERT INTO new_sales (id, product_id, date, price, cost, quantity) '
+        'SELECT id, product_id, date, money_text_to_cents(price), money_text_to_cents(cost), quantity '
+        'FROM sales')
+
+    connection.exec_driver_sql(
+        'CREATE TABLE new_expenses (id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, description VARCHAR(600), '
+        'spent_money INTEGER NOT NULL, date DATE NOT NULL, PRIMARY KEY (id))')
+    connection.exec_driver_sql(
+        'INSERT INTO new_expenses (id, name, description, spent_money, date) '
+        'SELECT id, name, description, money_text_to_cents(spent_money), date FROM expenses')
+
+    for a_table in ('sales', 'products', 'expenses'):
+        connection.exec_driver_sql(f'DROP TABLE {a_table}')
+        connection.exec_driver_sql(f'ALTER TABLE new_{a_table} RENAME TO {a_table}')
+
+
+def __create_date_and_product_indexes(connection: Connection):
+    """
+    Los reportes y filtros consultan las ventas por rango de fechas o por producto y
+    los gastos por fecha. Estos índices evitan recorrer las tablas completas.
+    """
+    connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_sales_date_product_id ON sales (date, product_id)')
+    connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_sales_product_id_date ON sales (product_id, date)')
+    connection.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_expenses_date ON expenses (date)')
+
+
+def __create_daily_product_sales(connection: Connection):
+    """
+    Crea la tabla de resumen diario de ventas por producto y la llena a partir de
+    las ventas existentes.
+    """
+    connection.exec_driver_sql(
+        'CREATE TABLE daily_product_sales (date DATE NOT NULL, product_id INTEGER NOT NULL, '
+        'units INTEGER NOT NULL, revenue INTEGER NOT NULL, cost INTEGER NOT NULL, '
+        'PRIMARY KEY (date, product_id), FOREIGN KEY(product_id) REFERENCES products (id) ON DELETE CASCADE)')
+    connection.exec_driver_sql(
+        'INSERT INTO daily_product_sales (date, product_id, units, revenue, cost) '
+        'SELECT date, product_id, SUM(quantity), SUM(price * quantity), SUM(cost * quantity) '
+        'FROM sales GROUP BY date, product_id')
+
+
+def __create_daily_expense_totals(connection: Connection):
+    """
+    Crea la tabla con el total gastado por día y la llena a partir de los gastos
+    existentes.
+    """
+    connection.exec_driver_sql(
+        'CREATE TABLE daily_expense_totals (date DATE NOT NULL, spent_money INTEGER NOT NULL, PRIMARY KEY (date))')
+    connection.exec_driver_sql(
+        'INSERT INTO daily_expense_totals (date, spent_money) '
+        'SELECT date, SUM(spent_money) FROM expenses GROUP BY date')
+
+
+def __create_full_text_search_indexes(connection: Connection):
+    """
+    Crea los índices de búsqueda de texto de los productos y los gastos, con sus
+    triggers, y los llena con las filas existentes.
+    """
+    for a_search_index in (products_search_index, expenses_search_index):
+        for a_statement in a_search_index.get_create_statements():
+            connection.exec_driver_sql(a_statement)
+        connection.exec_driver_sql(a_search_index.get_rebuild_statement())
+
+
+def __create_tickets(connection: Connection):
+    """
+    Crea la tabla de tickets, con la fecha en que se cobró cada uno, su hora si se
+    conoce y su total, y la columna que indica el ticket de cada venta. Las ventas anteriores no
+    pertenecen a ningún ticket.
+    """
+    connection.exec_driver_sql(
+        'CREATE TABLE tickets (id INTEGER NOT NULL, date DATE NOT NULL, created_at DATETIME, '
+        'total INTEGER NOT NULL, PRIMARY KEY (id))')
+    connection.exec_driver_sql('CREATE INDEX ix_tickets_date ON tickets (date, total)')
+    connection.exec_driver_sql('CREATE INDEX ix_tickets_created_at ON tickets (created_at, total)')
+    connection.exec_driver_sql('ALTER TABLE sales ADD COLUMN ticket_id INTEGER REFERENCES tickets (id)')
+    connection.exec_driver_sql('CREATE INDEX ix_sales_ticket_id ON sales (ticket_id)')
+
+
+def __add_time_to_sales(connection: Connection):
+    """
+    Agrega la fecha y hora de cada venta. La columna date no cambia y sigue siendo la
+    que usan los reportes; las ventas existentes no tienen hora y quedan en NULL.
+    """
+    connection.exec_driver_sql('ALTER TABLE sales ADD COLUMN sold_at DATETIME')
+    connection.exec_driver_sql('CREATE INDEX ix_sales_sold_at ON sales (sold_at, quantity, price)')
+
+
+# La migración en la posición i lleva el esquema de la versión i a la versión i + 1.
+__MIGRATIONS = (
+    __collapse_unit_sales_into_sale_lines,
+    __store_money_as_integer_cents,
+    __create_date_and_product_indexes,
+    __create_daily_product_sales,
+    __create_daily_expense_totals,
+    __create_full_text_search_indexes,
+    __create_tickets,
+    __add_time_to_sales,
+)
+
+SCHEMA_VERSION = len(__MIGRATIONS)
+
+
+class NewerSchemaVersionException(Exception):
+
+    MSG = 'The database schema version {} is newer than the supported version {}.'
+
+    def __init__(self, database_version: int):
+        self.__database_version = database_version
+        super().__init__(self.MSG.format(database_version, SCHEMA_VERSION))
+
+    def get_database_version(self) -> int:
+        return self.__database_version
+
+
+class ForeignKeyViolationException(Exception):
+
+    MSG = 'The migration to schema version {} left rows with invalid foreign keys.'
+
+    def __init__(self, version: int):
+        self.__version = version
+        super().__init__(self.MSG.format(version))
+
+    def get_version(self) -> int:
+        return self.__version
+
+
+def get_schema_version(connection: Connection) -> int:
+    return connection.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def __set_schema_version(connection: Connection, version: int):
+    connection.exec_driver_sql(f'PRAGMA user_version = {int(version)}')
+
+
+def upgrade_database(engine: Engine, target_version: int = SCHEMA_VERSION):
+    """
+    Lleva la base de datos a la versión target_version, que por defecto es la
+    última. Una base de datos nueva se crea directamente con el último esquema.
+    Cada paso pendiente se aplica en su propia transacción junto con el cambio de
+    versión, así que un paso fallido no deja la base de datos a medio migrar.
+    """
+    # pysqlite y SQLAlchemy confirman por su cuenta las sentencias DDL, por eso la
+    # conexión se usa en modo AUTOCOMMIT y las transacciones se abren explícitamente.
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT', autocommit=False) as connection:
+        current_version = get_schema_version(connection)
+        if current_version == target_version:
+            return
+        if current_version > SCHEMA_VERSION:
+            raise NewerSchemaVersionException(current_version)
+
+        # Las claves foráneas no se pueden activar o desactivar dentro de una
+        # transacción y los pasos que reconstruyen tablas necesitan desactivarlas.
+        foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+        connection.exec_driver_sql('PRAGMA foreign_keys = OFF')
+        try:
+            if not inspect(connection).has_table('sales'):
+                __run_in_transaction(connection, __create_last_schema)
+            else:
+                for version in range(current_version, target_version):
+                    __run_in_transaction(connection, __MIGRATIONS[version], version + 1)
+        finally:
+            connection.exec_driver_sql(f'PRAGMA foreign_keys = {int(foreign_keys)}')
+
+
+def __create_last_schema(connection: Connection):
+    Base.metadata.create_all(connection)
+
+
+def __run_in_transaction(connection: Connection, a_step, version: int = SCHEMA_VERSION):
+    connection.exec_driver_sql('BEGIN IMMEDIATE')
+    try:
+        a_step(connection)
+        if connection.exec_driver_sql('PRAGMA foreign_key_check').first() is not None:
+            raise ForeignKeyViolationException(version)
+        __set_schema_version(connection, version)
+    except BaseException:
+        connection.exec_driver_sql('ROLLBACK')
+        raise
+    connection.exec_driver_sql('COMMIT')
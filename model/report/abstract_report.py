@@ -1,12 +1,15 @@
 from datetime import date
+from decimal import Decimal
 from functools import reduce
-from typing import List
+from typing import List, Iterator
 
-from jinja2 import Template, Environment, PackageLoader, select_autoescape
+from jinja2 import Template
 
-from model.entity.models import Expense, Sale
+from model.entity.rows import SaleRow, ExpenseRow
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
+from model.report.snapshot import ReportSnapshot
 from model.report.statistics import ReportStatistic
+from model.report.template_registry import get_report_template
 from model.repository.expense import ExpenseRepository, ExpenseFilter
 from model.repository.sale import SaleRepository, SaleFilter
 from model.repository.sales_grouped_by_product import SalesGroupedByProductRepository
@@ -31,67 +34,93 @@ class AbstractSaleReport:
         self._grouped_sales_repo = grouped_sales_repo
         self._expense_repo = expense_repo
         self._product_id_list = product_id_list
+        self.__snapshot: ReportSnapshot = None
 
-    def get_sales(self) -> List[Sale]:
+    def iter_sale_rows(self) -> Iterator[SaleRow]:
+        """
+        Recorre las ventas del reporte sin cargarlas todas en memoria, como filas de
+        solo lectura con el nombre del producto de cada venta. Es lo que usan los
+        reportes que se exportan, que pueden abarcar muchas ventas.
+        """
+        return self._sale_repo.iter_sale_rows(self.__create_sale_filter())
+
+    def __create_sale_filter(self) -> SaleFilter:
         sale_filter = SaleFilter()
         sale_filter.minimum_date = self._initial_date
         sale_filter.maximum_date = self._final_date
-        return self._sale_repo.get_sales_by_filter(sale_filter)
+        return sale_filter
 
     def get_sales_grouped_by_product(self) -> List[SalesGroupedByProduct]:
         return self._grouped_sales_repo.get_groups_on_date_range(self._initial_date, self._final_date,
                                                                  product_id_list=self._product_id_list)
 
-    def get_expenses(self) -> List[Expense]:
+    def get_sale_rows(self) -> List[SaleRow]:
+        return self._sale_repo.get_sale_rows_by_filter(self.__create_sale_filter())
+
+    def get_expense_rows(self) -> List[ExpenseRow]:
+        return self._expense_repo.get_expense_rows_by_filter(self.__create_expense_filter())
+
+    def __create_expense_filter(self) -> ExpenseFilter:
         expense_filter = ExpenseFilter()
         expense_filter.minimum_date = self._initial_date
         expense_filter.maximum_date = self._final_date
-        return self._expense_repo.get_expenses_by_filter(expense_filter)
+        return expense_filter
 
     def get_report_as_html(self) -> str:
-        raise NotImplementedError()
+        return ''.join(self.iter_report_as_html())
 
-    def _construct_sales_grouped_report_as_html(self, template_name: str, **kwargs) -> str:
-        report_statistics = self.get_report_statistics()
-        total_collected_money = report_statistics.paid_money()
-        total_cost = report_statistics.cost_money()
-        total_profit = report_statistics.profit_money()
-        total_expense = report_statistics.total_expenses()
-        net_profit = report_statistics.net_profit()
+    def iter_report_as_html(self) -> Iterator[str]:
+        """
+        Genera el HTML del reporte por partes, a medida que se recorren sus datos, sin
+        construir el documento completo en memoria.
+        """
+        raise NotImplementedError()
 
-        sales_grouped = self.get_sales_grouped_by_product()
-        sale_quantity = reduce(lambda quantity, group: quantity + group.sale_quantity, sales_grouped, 0)
+    def _generate_sales_grouped_report_html(self, template_name: str, **kwargs) -> Iterator[str]:
+        snapshot = self.get_snapshot()
+        report_statistics = snapshot.statistic
 
         template = self.get_template(template_name)
-        return template.render(sale_quantity=sale_quantity,
-                               total_collected_money=total_collected_money.amount,
-                               total_cost=total_cost.amount,
-                               total_profit=total_profit.amount,
-                               total_expense=total_expense.amount,
-                               net_profit=net_profit.amount,
-                               sale_groups=sales_grouped,
-                               **kwargs)
-
-    def get_report_statistics(self) -> ReportStatistic:
-        sales_grouped = self.get_sales_grouped_by_product()
-
+        return template.generate(sale_quantity=report_statistics.sale_quantity(),
+                                 total_collected_money=report_statistics.paid_money().amount,
+                                 total_cost=report_statistics.cost_money().amount,
+                                 total_profit=report_statistics.profit_money().amount,
+                                 total_expense=report_statistics.total_expenses().amount,
+                                 net_profit=report_statistics.net_profit().amount,
+                                 sale_groups=snapshot.sale_groups,
+                                 **kwargs)
+
+    def get_snapshot(self) -> ReportSnapshot:
+        """
+        Devuelve los datos del reporte. Se leen de la base de datos la primera vez y
+        las siguientes se devuelven los mismos, así que la tabla, las estadísticas y
+        el reporte exportado siempre coinciden.
+        """
+        if self.__snapshot is None:
+            self.__snapshot = self._create_snapshot()
+        return self.__snapshot
+
+    def _create_snapshot(self) -> ReportSnapshot:
+        sale_groups = tuple(self.get_sales_grouped_by_product())
+        expenses = tuple(self.get_expense_rows())
+        return ReportSnapshot(statistic=self.__create_report_statistic(sale_groups, expenses),
+                              sale_groups=sale_groups,
+                              expenses=expenses)
+
+    def __create_report_statistic(self, sales_grouped, expenses) -> ReportStatistic:
         sale_quantity = reduce(lambda quantity, group: quantity + group.sale_quantity, sales_grouped, 0)
         collected_money = reduce(lambda collected, group: collected + group.acquired_money,
                                  sales_grouped, CUPMoney('0'))
         cost_money = reduce(lambda cost, group: cost + group.total_cost, sales_grouped, CUPMoney('0'))
-
-        expense_list = self.get_expenses()
-        total_expense = reduce(lambda expense_money, expense: expense_money + expense.spent_money,
-                               expense_list, CUPMoney('0'))
+        total_expense = CUPMoney(sum(map(lambda an_expense: an_expense.spent_money, expenses), Decimal('0.00')))
 
         return ReportStatistic(sale_quantity=sale_quantity, paid_money=collected_money,
                                cost_money=cost_money, total_expenses=total_expense,
                                initial_date=self._initial_date,
                                final_date=self._final_date)
 
+    def get_report_statistics(self) -> ReportStatistic:
+        return self.get_snapshot().statistic
+
     def get_template(self, template_name: str) -> Template:
-        env = Environment(
-            loader=PackageLoader('model.report'),
-            autoescape=select_autoescape()
-        )
-        return env.get_template(template_name)
\ No newline at end of file
+        return get_report_template(template_name)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List
+from typing import List, Iterator
 from model.report.abstract_report import AbstractSaleReport
 from model.repository.expense import ExpenseRepository
 from model.repository.sale import SaleRepository
@@ -28,9 +28,9 @@ class CustomSaleReport(AbstractSaleReport):
         self.__name = name
         self.__description = description
 
-    def get_report_as_html(self) -> str:
-        return self._construct_sales_grouped_report_as_html('custom_report.html',
-                                                            report_name=self.__name,
-                                                            description=self.__description,
-                                                            initial_date=self._initial_date,
-                                                            final_date=self._final_date)
\ No newline at end of file
+    def iter_report_as_html(self) -> Iterator[str]:
+        return self._generate_sales_grouped_report_html('custom_report.html',
+                                                        report_name=self.__name,
+                                                        description=self.__description,
+                                                        initial_date=self._initial_date,
+                                                        final_date=self._final_date)
\ No newline at end of file
@@ -1,11 +1,14 @@
 from datetime import date
+from typing import Iterator, List, Tuple
 from functools import reduce
 
 from model.economy import calculate_total_profit, calculate_collected_money
+from model.entity.rows import SaleRow
 from model.report.abstract_report import AbstractSaleReport
+from model.report.snapshot import ReportSnapshot
 from model.repository.expense import ExpenseRepository
 from model.repository.sale import SaleRepository
-from jinja2 import Environment, PackageLoader, select_autoescape, Template
+from jinja2 import Template
 from model.repository.sales_grouped_by_product import SalesGroupedByProductRepository
 from model.util.monetary_types import CUPMoney
 
@@ -21,30 +24,40 @@ class DaySaleReport(AbstractSaleReport):
                          sale_repository=sale_repo,
                          expense_repo=expense_repo,
                          grouped_sales_repo=grouped_sales_repo)
+        self.__sale_rows: List[SaleRow] = None
 
-    def get_report_as_html(self) -> str:
-        sales = self.get_sales()
-        report_statistics = self.get_report_statistics()
-
-        total_collected_money = report_statistics.paid_money()
-        total_cost = report_statistics.cost_money()
-        total_profit = report_statistics.profit_money()
-        total_expense = report_statistics.total_expenses()
-        net_profit = report_statistics.net_profit()
+    def iter_report_as_html(self) -> Iterator[str]:
+        """
+        Genera el HTML con el snapshot del reporte y las ventas que se leyeron junto
+        con él, así que el archivo exportado coincide con lo que muestra la pantalla
+        aunque se registren ventas después de crear el reporte o mientras se genera.
+        """
+        snapshot, sale_rows = self.read_snapshot_and_sale_rows()
+        report_statistics = snapshot.statistic
 
         template = self.get_template()
-        return template.render(date=self._initial_date,
-                               sale_quantity=len(sales),
-                               total_collected_money=total_collected_money.amount,
-                               total_cost=total_cost.amount,
-                               total_profit=total_profit.amount,
-                               total_expense=total_expense.amount,
-                               net_profit=net_profit.amount,
-                               sales=sales)
+        return template.generate(date=self._initial_date,
+                                 sale_quantity=report_statistics.sale_quantity(),
+                                 total_collected_money=report_statistics.paid_money().amount,
+                                 total_cost=report_statistics.cost_money().amount,
+                                 total_profit=report_statistics.profit_money().amount,
+                                 total_expense=report_statistics.total_expenses().amount,
+                                 net_profit=report_statistics.net_profit().amount,
+                                 sales=sale_rows)
+
+    def read_snapshot_and_sale_rows(self) -> Tuple[ReportSnapshot, List[SaleRow]]:
+        """
+        Devuelve el snapshot del reporte y las ventas del día. Se leen la primera vez
+        en la misma transacción de lectura, así que las filas siempre suman las
+        estadísticas, y las siguientes se devuelven los mismos.
+        """
+        return self.get_snapshot(), self.__sale_rows
+
+    def _create_snapshot(self) -> ReportSnapshot:
+        with self._sale_repo.read_transaction():
+            snapshot = super()._create_snapshot()
+            self.__sale_rows = self.get_sale_rows()
+        return snapshot
 
     def get_template(self) -> Template:
-        env = Environment(
-            loader=PackageLoader('model.report'),
-            autoescape=select_autoescape()
-        )
-        return env.get_template('day_report.html')
+        return super().get_template('day_report.html')
@@ -1,8 +1,10 @@
 from pathlib import Path
 from model.report.abstract_report import AbstractSaleReport
-from xhtml2pdf import pisa
+from model.report.pdf_rendering import get_pdf_rendering_service
 import os
 
+HTML_WRITE_BUFFER_SIZE = 64 * 1024
+
 class DirectoryPermissionError(Exception):
 
     def __init__(self, path: str):
@@ -22,12 +24,26 @@ def __user_has_access_to_write_file(path: Path):
     return True
 
 def generate_html_file(file_path: Path, report: AbstractSaleReport):
+    """
+    Escribe el HTML del reporte a medida que se genera, así que el documento completo
+    nunca está en memoria.
+    """
     if __user_has_access_to_write_file(file_path):
-        with file_path.open(mode='w') as file:
-            file.write(report.get_report_as_html())
+        with file_path.open(mode='w', buffering=HTML_WRITE_BUFFER_SIZE) as file:
+            file.writelines(report.iter_report_as_html())
 
 
 def generate_pdf_file(file_path: Path, report: AbstractSaleReport):
-    if __user_has_access_to_write_file(file_path):
-        with file_path.open('w+b') as pdf_file:
-            pisa.CreatePDF(report.get_report_as_html(), dest=pdf_file)
+    """
+    Convierte el reporte a PDF y espera a que termine.
+    """
+    get_pdf_rendering_service().wait(start_pdf_file_generation(file_path, report))
+
+
+def start_pdf_file_generation(file_path: Path, report: AbstractSaleReport, on_progress=None) -> int:
+    """
+    Empieza a convertir el reporte a PDF en un proceso del servicio de PDF y
+    devuelve el id del trabajo sin esperar a que termine.
+    """
+    __user_has_access_to_write_file(file_path)
+    return get_pdf_rendering_service().submit(report.get_report_as_html(), file_path, on_progress)
@@ -1,8 +1,7 @@
 from datetime import date, timedelta
+from typing import Iterator
 from functools import reduce
 
-from jinja2 import Environment, PackageLoader, select_autoescape
-from jinja2.nodes import Template
 from model.economy import calculate_total_profit, calculate_collected_money
 from model.report.abstract_report import AbstractSaleReport
 from model.repository.expense import ExpenseRepository
@@ -27,10 +26,10 @@ class MonthSaleReport(AbstractSaleReport):
             grouped_sales_repo=grouped_sales_repo
         )
 
-    def get_report_as_html(self) -> str:
+    def iter_report_as_html(self) -> Iterator[str]:
 
-        return self._construct_sales_grouped_report_as_html('month_report.html',
-                                                            month_date=self._initial_date)
+        return self._generate_sales_grouped_report_html('month_report.html',
+                                                        month_date=self._initial_date)
 
     @staticmethod
     def __get_last_date_of_month(month_date: date):
@@ -0,0 +1,213 @@
+"""
+Servicio que convierte reportes HTML en PDF en procesos aparte. xhtml2pdf está escrito
+en Python y usa la CPU todo el tiempo, así que en un hilo de la aplicación retiene el
+GIL y la interfaz deja de responder mientras se exporta un reporte grande. Los
+procesos del servicio también permiten exportar varios reportes a la vez.
+
+Los procesos se crean con el método spawn, así que el módulo principal de cualquier
+programa que use el servicio debe proteger su código con if __name__ == '__main__'.
+"""
+import atexit
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from itertools import count
+from pathlib import Path
+from threading import Lock, Event, Thread
+
+from xhtml2pdf import pisa
+
+_progress_queue = None
+
+
+def _set_progress_queue(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _render_pdf_file(job_id: int, html: str, file_path: str):
+    """
+    Se ejecuta en un proceso del servicio.
+    """
+    _progress_queue.put((job_id, PdfRenderingService.RENDERING))
+    with open(file_path, 'w+b') as pdf_file:
+        pisa.CreatePDF(html, dest=pdf_file)
+
+
+class PdfRenderingJob:
+
+    def __init__(self, job_id: int, file_path: Path, temporary_file_path: str, on_progress):
+        self.id = job_id
+        self.file_path = file_path
+        self.temporary_file_path = temporary_file_path
+        self.on_progress = on_progress
+        self.state = PdfRenderingService.QUEUED
+        self.error: BaseException = None
+        self.is_cancelled = False
+        self.future: Future = None
+        self.done = Event()
+
+
+class PdfRenderingService:
+    """
+    Cada PDF que se pide es un trabajo con un id. El PDF se escribe primero en un
+    archivo temporal en la misma carpeta y se mueve a su ruta al terminar, así que un
+    trabajo cancelado o con error no deja un archivo a medias.
+
+    on_progress(job_id, state) se llama, desde un hilo del servicio, con cada estado
+    por el que pasa el trabajo: QUEUED, RENDERING y al final FINISHED, FAILED o
+    CANCELLED.
+
+    El servicio solo recuerda los últimos KEPT_FINISHED_JOBS trabajos terminados;
+    los anteriores se olvidan y ya no se pueden consultar.
+    """
+
+    QUEUED = 'queued'
+    RENDERING = 'rendering'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    KEPT_FINISHED_JOBS = 32
+
+    __STATE_ORDER = (QUEUED, RENDERING, FINISHED, FAILED, CANCELLED)
+
+    def __init__(self, max_workers: int = None):
+        self.__max_workers = max_workers
+        self.__executor: ProcessPoolExecutor = None
+        self.__progress_queue = None
+        self.__progress_thread: Thread = None
+        self.__jobs = {}
+        self.__finished_job_ids = deque()
+        self.__job_ids = count(1)
+        self.__lock = Lock()
+
+    def submit(self, html: str, file_path: Path, on_progress=None) -> int:
+        file_descriptor, temporary_file_path = tempfile.mkstemp(suffix='.part', prefix=f'.{file_path.name}.',
+                                                                dir=str(file_path.absolute().parent))
+        os.close(file_descriptor)
+
+        with self.__lock:
+            job = PdfRenderingJob(next(self.__job_ids), file_path, temporary_file_path, on_progress)
+            self.__jobs[job.id] = job
+            executor = self.__get_executor()
+
+        job.future = executor.submit(_render_pdf_file, job.id, html, temporary_file_path)
+        self.__notify_progress(job, self.QUEUED)
+        job.future.add_done_callback(lambda future: self.__finish_job(job, future))
+        return job.id
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            context = multiprocessing.get_context('spawn')
+            self.__progress_queue = context.Queue()
+            self.__executor = ProcessPoolExecutor(max_workers=self.__max_workers, mp_context=context,
+                                                  initializer=_set_progress_queue,
+                                                  initargs=(self.__progress_queue,))
+            self.__progress_thread = Thread(target=self.__receive_progress, args=(self.__progress_queue,),
+                                            daemon=True)
+            self.__progress_thread.start()
+        return self.__executor
+
+    def __receive_progress(self, progress_queue):
+        for job_id, state in iter(progress_queue.get, None):
+            job = self.__jobs.get(job_id)
+            if job is not None:
+                self.__notify_progress(job, state)
+
+    def __finish_job(self, job: PdfRenderingJob, future: Future):
+        if job.is_cancelled or future.cancelled():
+            state = self.CANCELLED
+        elif future.exception() is not None:
+            state = self.FAILED
+            job.error = future.exception()
+        else:
+            state = self.FINISHED
+
+        if state == self.FINISHED:
+            os.replace(job.temporary_file_path, str(job.file_path))
+        elif os.path.exists(job.temporary_file_path):
+            os.remove(job.temporary_file_path)
+
+        self.__notify_progress(job, state)
+        self.__forget_old_finished_jobs(job)
+        job.done.set()
+
+    def __forget_old_finished_jobs(self, finished_job: PdfRenderingJob):
+        with self.__lock:
+            self.__finished_job_ids.append(finished_job.id)
+            while len(self.__finished_job_ids) > self.KEPT_FINISHED_JOBS:
+                del self.__jobs[self.__finished_job_ids.popleft()]
+
+    def __notify_progress(self, job: PdfRenderingJob, state: str):
+        with self.__lock:
+            # El aviso de RENDERING llega por otra vía y puede llegar antes que el de QUEUED
+            # o después del final, así que un trabajo nunca vuelve a un estado anterior.
+            if self.__is_finished(job) or self.__STATE_ORDER.index(state) < self.__STATE_ORDER.index(job.state):
+                return
+            job.state = state
+
+        if job.on_progress is not None:
+            job.on_progress(job.id, state)
+
+    def __is_finished(self, job: PdfRenderingJob) -> bool:
+        return job.state in (self.FINISHED, self.FAILED, self.CANCELLED)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancela el trabajo si todavía no terminó. Un trabajo que ya se está
+        convirtiendo termina en su proceso, pero su PDF se descarta.
+        """
+        with self.__lock:
+            job = self.__jobs.get(job_id)
+            if job is None or self.__is_finished(job):
+                return False
+            job.is_cancelled = True
+
+        job.future.cancel()
+        return True
+
+    def wait(self, job_id: int, timeout: float = None) -> str:
+        """
+        Espera a que el trabajo termine y devuelve su estado. Si falló, lanza el error
+        con el que falló.
+        """
+        job = self.__jobs[job_id]
+        if not job.done.wait(timeout):
+            raise TimeoutError(f'The PDF rendering job {job_id} did not finish in {timeout} seconds.')
+
+        if job.error is not None:
+            raise job.error
+        return job.state
+
+    def get_state(self, job_id: int) -> str:
+        return self.__jobs[job_id].state
+
+    def shutdown(self):
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            # El hilo que recibe los avisos termina antes de que se cierre su cola.
+            self.__progress_queue.put(None)
+            self.__progress_thread.join()
+
+
+__service: PdfRenderingService = None
+__service_lock = Lock()
+
+
+def get_pdf_rendering_service() -> PdfRenderingService:
+    """
+    Devuelve el servicio que comparte todo el proceso, que usa un proceso por núcleo.
+    Sus procesos se cierran al salir del programa.
+    """
+    global __service
+
+    with __service_lock:
+        if __service is None:
+            __service = PdfRenderingService()
+            atexit.register(__service.shutdown)
+        return __service
@@ -0,0 +1,19 @@
+from typing import NamedTuple, Tuple
+
+from model.entity.rows import ExpenseRow
+from model.entity.sales_grouped_by_product import SalesGroupedByProduct
+from model.report.statistics import ReportStatistic
+
+
+class ReportSnapshot(NamedTuple):
+    """
+    Datos de un reporte leídos una sola vez: las ventas agrupadas por producto, los
+    gastos y las estadísticas calculadas con ellos. La tabla, el panel de estadísticas
+    y los archivos exportados se construyen con el mismo snapshot sin volver a
+    consultar la base de datos. Las ventas una por una no forman parte del snapshot,
+    porque pueden ser muchas; los reportes que las muestran las leen junto con sus
+    estadísticas en una misma transacción de lectura.
+    """
+    statistic: ReportStatistic
+    sale_groups: Tuple[SalesGroupedByProduct, ...]
+    expenses: Tuple[ExpenseRow, ...]
@@ -0,0 +1,79 @@
+"""
+Registro de las plantillas de los reportes para todo el proceso. El Environment se
+crea una sola vez y guarda en memoria las plantillas ya compiladas, así que renderizar
+el mismo reporte otra vez no vuelve a leer ni a compilar su plantilla. El bytecode de
+las plantillas se guarda además en disco para que el próximo inicio de la aplicación
+no tenga que compilarlas.
+
+En un ejecutable congelado con PyInstaller las plantillas se pueden precompilar a
+módulos de Python con:
+
+    python -m model.report.template_registry
+
+que los escribe en model/report/compiled_templates. Si esa carpeta se incluye en el
+ejecutable, las plantillas se cargan desde ella en lugar de desde model/report/templates.
+"""
+import sys
+from pathlib import Path
+from threading import Lock
+
+from jinja2 import Environment, PackageLoader, ModuleLoader, FileSystemBytecodeCache, Template, \
+    select_autoescape, BaseLoader
+
+from util.resources_path import resource_path
+
+COMPILED_TEMPLATES_PATH = 'model/report/compiled_templates'
+
+__environment: Environment = None
+__environment_lock = Lock()
+
+
+def get_report_template(template_name: str) -> Template:
+    return get_report_environment().get_template(template_name)
+
+
+def get_report_environment() -> Environment:
+    global __environment
+
+    with __environment_lock:
+        if __environment is None:
+            __environment = create_report_environment()
+        return __environment
+
+
+def create_report_environment(loader: BaseLoader = None) -> Environment:
+    """
+    Crea un Environment para las plantillas de los reportes. Sin loader, usa las
+    plantillas precompiladas si la aplicación está congelada y las incluye, y si no
+    las de model/report/templates con el bytecode guardado en disco.
+    """
+    if loader is None:
+        loader = __create_default_loader()
+
+    bytecode_cache = None
+    if not isinstance(loader, ModuleLoader):
+        bytecode_cache = FileSystemBytecodeCache()
+
+    return Environment(loader=loader,
+                       autoescape=select_autoescape(),
+                       bytecode_cache=bytecode_cache)
+
+
+def __create_default_loader() -> BaseLoader:
+    compiled_templates_path = Path(resource_path(COMPILED_TEMPLATES_PATH))
+    if getattr(sys, 'frozen', False) and compiled_templates_path.is_dir():
+        return ModuleLoader(str(compiled_templates_path))
+    return PackageLoader('model.report')
+
+
+def compile_report_templates(target_path: str = COMPILED_TEMPLATES_PATH):
+    """
+    Compila todas las plantillas de model/report/templates a módulos de Python en
+    target_path, que se pueden cargar con un ModuleLoader.
+    """
+    environment = Environment(loader=PackageLoader('model.report'), autoescape=select_autoescape())
+    environment.compile_templates(target_path, zip=None, ignore_errors=False)
+
+
+if __name__ == '__main__':
+    compile_report_templates(sys.argv[1] if len(sys.argv) > 1 else COMPILED_TEMPLATES_PATH)
@@ -1,7 +1,7 @@
 from datetime import date, timedelta
-from functools import reduce
+from typing import Iterator
 
-from jinja2 import Template, Environment, PackageLoader, select_autoescape
+from jinja2 import Template
 
 from model.economy import calculate_total_profit, calculate_collected_money
 from model.report.abstract_report import AbstractSaleReport
@@ -34,33 +34,22 @@ class WeekSaleReport(AbstractSaleReport):
     def __get_sunday_date(week_day_date: date):
         return week_day_date + timedelta(days=6 - week_day_date.weekday())
 
-    def get_report_as_html(self) -> str:
+    def iter_report_as_html(self) -> Iterator[str]:
         final_date = date.today() if self._final_date > date.today() else self._final_date
 
-        report_statistics = self.get_report_statistics()
-        total_collected_money = report_statistics.paid_money()
-        total_cost = report_statistics.cost_money()
-        total_profit = report_statistics.profit_money()
-        total_expense = report_statistics.total_expenses()
-        net_profit = report_statistics.net_profit()
-
-        sales_grouped = self.get_sales_grouped_by_product()
-        sale_quantity = reduce(lambda quantity, group: quantity + group.sale_quantity, sales_grouped, 0)
+        snapshot = self.get_snapshot()
+        report_statistics = snapshot.statistic
 
         template = self.get_template()
-        return template.render(initial_date=self._initial_date,
-                               final_date=self._final_date,
-                               sale_quantity=sale_quantity,
-                               total_collected_money=total_collected_money.amount,
-                               total_cost=total_cost.amount,
-                               total_profit=total_profit.amount,
-                               total_expense=total_expense.amount,
-                               net_profit=net_profit.amount,
-                               sale_groups=sales_grouped)
+        return template.generate(initial_date=self._initial_date,
+                                 final_date=self._final_date,
+                                 sale_quantity=report_statistics.sale_quantity(),
+                                 total_collected_money=report_statistics.paid_money().amount,
+                                 total_cost=report_statistics.cost_money().amount,
+                                 total_profit=report_statistics.profit_money().amount,
+                                 total_expense=report_statistics.total_expenses().amount,
+                                 net_profit=report_statistics.net_profit().amount,
+                                 sale_groups=snapshot.sale_groups)
 
     def get_template(self) -> Template:
-        env = Environment(
-            loader=PackageLoader('model.report'),
-            autoescape=select_autoescape()
-        )
-        return env.get_template('week_report.html')
+        return super().get_template('week_report.html')
@@ -1,7 +1,6 @@
 from datetime import date
+from typing import Iterator
 
-from jinja2 import Environment, PackageLoader, select_autoescape
-from jinja2.nodes import Template
 
 from model.economy import calculate_total_profit, calculate_collected_money
 from model.report.abstract_report import AbstractSaleReport
@@ -26,7 +25,7 @@ class YearSaleReport(AbstractSaleReport):
                          grouped_sales_repo=sale_group_repo,
                          expense_repo=expense_repo)
 
-    def get_report_as_html(self) -> str:
-        return self._construct_sales_grouped_report_as_html('year_report.html',
-                                                            year_date=self._initial_date)
+    def iter_report_as_html(self) -> Iterator[str]:
+        return self._generate_sales_grouped_report_html('year_report.html',
+                                                        year_date=self._initial_date)
 
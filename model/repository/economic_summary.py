@@ -1,16 +1,28 @@
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
 from model.entity.economic_summary import EconomicSummary
-from sqlalchemy import func, cast, FLOAT, select
+from sqlalchemy import func, select
 
-from model.entity.models import Sale, Expense
+from model.entity.models import DailyProductSales, DailyExpenseTotal
+from model.repository.query_cache import QueryCache
 from model.util.monetary_types import CUPMoney
+from model.util.money_colum import as_money
 
 
 class EconomicSummaryRepository:
 
-    def __init__(self, session: Session):
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+    # Los resúmenes se leen de los totales diarios de ventas y gastos. Borrar un
+    # producto también borra sus ventas.
+    __READ_TABLES = (QueryCache.SALES, QueryCache.PRODUCTS, QueryCache.EXPENSES)
+
+    def __init__(self, session: Session, query_cache: QueryCache = None):
         self.__session = session
+        self.__query_cache = query_cache if query_cache is not None else QueryCache(maximum_size=0)
 
     def get_economic_summary_on_month(self, month_date: date) -> EconomicSummary:
         first_date_of_month = date(day=1, month=month_date.month, year=month_date.year)
@@ -33,24 +45,37 @@ class EconomicSummaryRepository:
         return first_date_next_month - timedelta(days=1)
 
     def __construct_economic_summary(self, initial_date: date, final_date: date) -> EconomicSummary:
+        return self.__query_cache.get_or_load(('economic_summary', initial_date, final_date), self.__READ_TABLES,
+                                              lambda: self.__read_economic_summary(initial_date, final_date))
+
+    def __read_economic_summary(self, initial_date: date, final_date: date) -> EconomicSummary:
         row_derived_from_sales = self.__get_row_with_values_derived_from_sales(initial_date, final_date)
         total_expense_row = self.__get_total_expense_row(initial_date, final_date)
 
-        acquired_money = row_derived_from_sales['acquired_money']
-        acquired_money = CUPMoney(str(acquired_money)) if acquired_money is not None else CUPMoney('0.00')
-
-        total_cost = row_derived_from_sales['total_cost']
-        total_cost = CUPMoney(str(total_cost)) if total_cost is not None else CUPMoney('0.00')
+        return self.__construct_economic_summary_from_rows(initial_date, final_date,
+                                                           row_derived_from_sales, total_expense_row)
 
-        total_expense = total_expense_row['total_expense']
-        total_expense = CUPMoney(str(total_expense)) if total_expense is not None else CUPMoney('0.00')
+    @staticmethod
+    def __construct_economic_summary_from_rows(initial_date: date, final_date: date,
+                                               row_derived_from_sales, total_expense_row) -> EconomicSummary:
+        acquired_money = CUPMoney('0.00')
+        total_cost = CUPMoney('0.00')
+        sale_quantity = 0
+        total_expense = CUPMoney('0.00')
+
+        if row_derived_from_sales is not None:
+            acquired_money = row_derived_from_sales['acquired_money'] or acquired_money
+            total_cost = row_derived_from_sales['total_cost'] or total_cost
+            sale_quantity = row_derived_from_sales['sale_quantity']
+        if total_expense_row is not None:
+            total_expense = total_expense_row['total_expense'] or total_expense
 
         total_profit = acquired_money - total_cost
 
         return EconomicSummary(
             initial_date=initial_date,
             final_date=final_date,
-            sale_quantity=row_derived_from_sales['sale_quantity'],
+            sale_quantity=sale_quantity,
             acquired_money=acquired_money,
             total_cost=total_cost,
             total_profit=total_profit,
@@ -64,20 +89,113 @@ class EconomicSummaryRepository:
 
     @staticmethod
     def __construct_query_for_values_derived_from_sales(initial_date: date, final_date: date):
-        acquired_money = func.sum(cast(Sale.price, FLOAT)).label('acquired_money')
-        total_cost = func.sum(cast(Sale.cost, FLOAT)).label('total_cost')
-        sale_quantity = func.count(Sale.id).label('sale_quantity')
+        acquired_money = as_money(func.sum(DailyProductSales.revenue)).label('acquired_money')
+        total_cost = as_money(func.sum(DailyProductSales.cost)).label('total_cost')
+        sale_quantity = func.coalesce(func.sum(DailyProductSales.units), 0).label('sale_quantity')
 
         query = select(acquired_money, total_cost, sale_quantity) \
-            .where(Sale.date >= initial_date) \
-            .where(Sale.date <= final_date)
+            .where(DailyProductSales.date >= initial_date) \
+            .where(DailyProductSales.date <= final_date)
         return query
 
     def __get_total_expense_row(self, initial_date: date, final_date: date):
-        total_expense = func.sum(cast(Expense.spent_money, FLOAT)).label('total_expense')
+        total_expense = as_money(func.sum(DailyExpenseTotal.spent_money)).label('total_expense')
         return self.__session.execute(select(total_expense)
-                                      .where(Expense.date >= initial_date)
-                                      .where(Expense.date <= final_date)).first()
+                                      .where(DailyExpenseTotal.date >= initial_date)
+                                      .where(DailyExpenseTotal.date <= final_date)).first()
 
     def get_economic_summary_on_day(self, day_date: date) -> EconomicSummary:
         return self.__construct_economic_summary(day_date, day_date)
+
+    def get_economic_summaries_on_date_range(self, initial_date: date, final_date: date, bucket: str) -> list:
+        """
+        Devuelve un EconomicSummary por cada día, semana ISO, mes o año (según bucket)
+        entre initial_date y final_date, ordenados por fecha. Los resúmenes de los
+        extremos se recortan al rango pedido y los períodos sin ventas ni gastos se
+        devuelven con valores en cero. Se usa una sola consulta agrupada para las
+        ventas y otra para los gastos.
+        """
+        self.__check_bucket_is_valid(bucket)
+        summaries = self.__query_cache.get_or_load(
+            ('economic_summaries', initial_date, final_date, bucket), self.__READ_TABLES,
+            lambda: self.__read_economic_summaries(initial_date, final_date, bucket))
+        return list(summaries)
+
+    def __read_economic_summaries(self, initial_date: date, final_date: date, bucket: str) -> list:
+        sale_rows = self.__get_rows_derived_from_sales_by_bucket(initial_date, final_date, bucket)
+        expense_rows = self.__get_total_expense_rows_by_bucket(initial_date, final_date, bucket)
+
+        summaries = []
+        bucket_initial_date = self.__get_bucket_initial_date(initial_date, bucket)
+        while bucket_initial_date <= final_date:
+            next_bucket_initial_date = self.__get_next_bucket_initial_date(bucket_initial_date, bucket)
+            summaries.append(self.__construct_economic_summary_from_rows(
+                max(bucket_initial_date, initial_date),
+                min(next_bucket_initial_date - timedelta(days=1), final_date),
+                sale_rows.get(bucket_initial_date),
+                expense_rows.get(bucket_initial_date)
+            ))
+            bucket_initial_date = next_bucket_initial_date
+
+        return summaries
+
+    @staticmethod
+    def __check_bucket_is_valid(bucket: str):
+        valid_buckets = (EconomicSummaryRepository.DAY, EconomicSummaryRepository.WEEK,
+                         EconomicSummaryRepository.MONTH, EconomicSummaryRepository.YEAR)
+        if bucket not in valid_buckets:
+            raise ValueError(f'The bucket "{bucket}" is not one of {valid_buckets}.')
+
+    @staticmethod
+    def __get_bucket_initial_date(a_date: date, bucket: str) -> date:
+        if bucket == EconomicSummaryRepository.WEEK:
+            return a_date - timedelta(days=a_date.weekday())
+        if bucket == EconomicSummaryRepository.MONTH:
+            return date(day=1, month=a_date.month, year=a_date.year)
+        if bucket == EconomicSummaryRepository.YEAR:
+            return date(day=1, month=1, year=a_date.year)
+        return a_date
+
+    @staticmethod
+    def __get_next_bucket_initial_date(bucket_initial_date: date, bucket: str) -> date:
+        if bucket == EconomicSummaryRepository.WEEK:
+            return bucket_initial_date + timedelta(days=7)
+        if bucket == EconomicSummaryRepository.MONTH:
+            return EconomicSummaryRepository.__get_last_date_of_month(bucket_initial_date) + timedelta(days=1)
+        if bucket == EconomicSummaryRepository.YEAR:
+            return date(day=1, month=1, year=bucket_initial_date.year + 1)
+        return bucket_initial_date + timedelta(days=1)
+
+    @staticmethod
+    def __get_bucket_initial_date_expression(date_column, bucket: str):
+        # Las fechas se guardan como texto ISO (AAAA-MM-DD).
+        if bucket == EconomicSummaryRepository.WEEK:
+            # 'weekday 0' avanza hasta el domingo de la semana; seis días antes es su lunes.
+            return func.date(date_column, 'weekday 0', '-6 days')
+        if bucket == EconomicSummaryRepository.MONTH:
+            return func.strftime('%Y-%m-01', date_column)
+        if bucket == EconomicSummaryRepository.YEAR:
+            return func.strftime('%Y-01-01', date_column)
+        return func.date(date_column)
+
+    def __get_rows_derived_from_sales_by_bucket(self, initial_date: date, final_date: date, bucket: str) -> dict:
+        bucket_initial_date = self.__get_bucket_initial_date_expression(DailyProductSales.date, bucket).label('bucket')
+        query = self.__construct_query_for_values_derived_from_sales(initial_date, final_date) \
+            .add_columns(bucket_initial_date) \
+            .group_by(bucket_initial_date)
+
+        return self.__map_rows_by_bucket(self.__session.execute(query))
+
+    def __get_total_expense_rows_by_bucket(self, initial_date: date, final_date: date, bucket: str) -> dict:
+        bucket_initial_date = self.__get_bucket_initial_date_expression(DailyExpenseTotal.date, bucket).label('bucket')
+        total_expense = as_money(func.sum(DailyExpenseTotal.spent_money)).label('total_expense')
+        query = select(total_expense, bucket_initial_date) \
+            .where(DailyExpenseTotal.date >= initial_date) \
+            .where(DailyExpenseTotal.date <= final_date) \
+            .group_by(bucket_initial_date)
+
+        return self.__map_rows_by_bucket(self.__session.execute(query))
+
+    @staticmethod
+    def __map_rows_by_bucket(rows) -> dict:
+        return {date.fromisoformat(a_row['bucket']): a_row for a_row in rows}
@@ -4,13 +4,17 @@ class NoEnoughProductQuantityException(Exception):
 
     MSG = 'No enough products. Remaining: {}.'
 
-    def __init__(self, remaining_quantity):
+    def __init__(self, remaining_quantity, product_id: int = None):
         self.__remaining_quantity = remaining_quantity
+        self.__product_id = product_id
         super().__init__(NoEnoughProductQuantityException.MSG.format(remaining_quantity))
 
     def get_remaining_quantity(self) -> int:
         return self.__remaining_quantity
 
+    def get_product_id(self) -> int:
+        return self.__product_id
+
 
 class NonExistentSaleException(Exception):
 
@@ -30,3 +34,15 @@ class ChangeProductIdInSaleException(Exception):
 
     def __init__(self):
         super().__init__(ChangeProductIdInSaleException.MSG)
+
+
+class NoEnoughSaleUnitsException(Exception):
+
+    MSG = 'The sale only has {} units.'
+
+    def __init__(self, sale_units: int):
+        self.__sale_units = sale_units
+        super().__init__(NoEnoughSaleUnitsException.MSG.format(sale_units))
+
+    def get_sale_units(self) -> int:
+        return self.__sale_units
@@ -1,11 +1,18 @@
+from datetime import date
+
 from money import Money
-from sqlalchemy import select, delete, or_
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
-from model.entity.models import Expense
+from model.entity.models import Expense, DailyExpenseTotal, expenses_search_index
+from model.entity.rows import ExpenseRow
 from model.repository.exc.expense import UniqueExpenseNameException, EmptyExpenseNameException, \
     NonPositiveExpenseMoneyException, NonExistentExpenseException
+from model.repository.observer import RepositoryObserver, DataChangedEvent
+from model.repository.query_cache import QueryCache
+from model.util.full_text_search import create_prefix_query, match_prefix_query, is_blank_phrase
 from model.util.monetary_types import CUPMoney
-import re
+from model.util.money_colum import as_money, as_amount
 
 
 class ExpenseFilter:
@@ -63,21 +70,43 @@ class ExpenseFilter:
         return is_it_match
 
     def __match_phrase(self, expense: Expense):
-        return (re.search(self.__phrase, expense.name) is not None
-                or re.search(self.__phrase, expense.description) is not None)
+        return match_prefix_query(self.__phrase, expense.name, expense.description)
 
 
-class ExpenseRepository:
+class ExpenseRepository(RepositoryObserver):
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, query_cache: QueryCache = None):
         super().__init__()
         self.__session = session
+        self.__query_cache = query_cache if query_cache is not None else QueryCache(maximum_size=0)
 
     def insert_expense(self, new_expense: Expense):
         self.__check_money_is_positive(new_expense.spent_money)
         self.__check_name_is_not_empty_or_whitespaces(new_expense.name)
         self.__session.add(new_expense)
+        self.__session.flush()
+        self.__add_money_to_daily_expense_total(new_expense.date, new_expense.spent_money)
         self.__session.commit()
+        self._notify_on_data_changed_listeners(DataChangedEvent().add_change(
+            DataChangedEvent.EXPENSE, DataChangedEvent.INSERTED, [new_expense.id], [new_expense.date]))
+
+    def __add_money_to_daily_expense_total(self, expense_date: date, money: Money):
+        """
+        Suma al total del día el dinero indicado, que es negativo cuando se quitan
+        gastos. Los días que se quedan sin dinero gastado se eliminan.
+        """
+        statement = insert(DailyExpenseTotal).values(date=expense_date, spent_money=money)
+        self.__session.execute(statement.on_conflict_do_update(
+            index_elements=[DailyExpenseTotal.date],
+            set_={DailyExpenseTotal.spent_money: DailyExpenseTotal.spent_money + statement.excluded.spent_money}
+        ))
+
+        if money < CUPMoney('0.00'):
+            self.__session.execute(
+                delete(DailyExpenseTotal)
+                .where(DailyExpenseTotal.date == expense_date)
+                .where(DailyExpenseTotal.spent_money == CUPMoney('0.00'))
+            )
 
     @staticmethod
     def __check_money_is_positive(money: Money):
@@ -91,8 +120,22 @@ class ExpenseRepository:
 
     def delete_expenses(self, expense_ids: list):
         self.__check_expense_ids_are_assigned_in_database(expense_ids)
+        expense_dates = self.__subtract_expenses_from_daily_expense_totals(expense_ids)
         self.__execute_delete_statement(expense_ids)
         self.__session.commit()
+        self._notify_on_data_changed_listeners(DataChangedEvent().add_change(
+            DataChangedEvent.EXPENSE, DataChangedEvent.DELETED, expense_ids, expense_dates))
+
+    def __subtract_expenses_from_daily_expense_totals(self, expense_ids: list) -> list:
+        spent_money = as_money(func.sum(Expense.spent_money))
+        rows = self.__session.execute(
+            select(Expense.date, spent_money)
+            .where(Expense.id.in_(expense_ids))
+            .group_by(Expense.date)
+        ).all()
+        for expense_date, money in rows:
+            self.__add_money_to_daily_expense_total(expense_date, -money)
+        return list(map(lambda a_row: a_row[0], rows))
 
     def __check_expense_ids_are_assigned_in_database(self, expenses_ids: list):
         found_expenses_rows = self.__session.execute(
@@ -116,7 +159,11 @@ class ExpenseRepository:
     def update_expense(self, updated_expense: Expense):
         self.__check_name_is_not_empty_or_whitespaces(updated_expense.name)
         self.__check_money_is_positive(updated_expense.spent_money)
-        self.__check_expense_ids_are_assigned_in_database([updated_expense.id])
+        # updated_expense puede ser el mismo objeto que está en la sesión, así que sus
+        # cambios no se envían a la base de datos antes de leer los valores guardados.
+        with self.__session.no_autoflush:
+            self.__check_expense_ids_are_assigned_in_database([updated_expense.id])
+            old_date = self.__move_expense_in_daily_expense_totals(updated_expense)
 
         old_expense = self.__get_expense_from_database(updated_expense)
         old_expense.name = updated_expense.name
@@ -126,23 +173,61 @@ class ExpenseRepository:
 
         self.__session.flush()
         self.__session.commit()
+        self._notify_on_data_changed_listeners(DataChangedEvent().add_change(
+            DataChangedEvent.EXPENSE, DataChangedEvent.UPDATED, [updated_expense.id],
+            [old_date, updated_expense.date]))
+
+    def __move_expense_in_daily_expense_totals(self, updated_expense: Expense) -> date:
+        """
+        Pasa el dinero del gasto del total de su fecha guardada al de su nueva fecha y
+        devuelve la fecha guardada.
+        """
+        old_date, old_spent_money = self.__session.execute(
+            select(Expense.date, Expense.spent_money).where(Expense.id == updated_expense.id)
+        ).one()
+
+        self.__add_money_to_daily_expense_total(old_date, -old_spent_money)
+        self.__add_money_to_daily_expense_total(updated_expense.date, updated_expense.spent_money)
+        return old_date
 
     def __get_expense_from_database(self, updated_expense: Expense) -> Expense:
         return self.__session.scalars(
-            select(Expense).where(Expense.id == updated_expense.id)
+            select(Expense).where(Expense.id == updated_expense.id).execution_options(populate_existing=True)
         ).first()
 
+    def get_total_expense_on_date_range(self, initial_date: date, final_date: date) -> Money:
+        return self.__query_cache.get_or_load(
+            ('total_expense', initial_date, final_date), (QueryCache.EXPENSES,),
+            lambda: self.__read_total_expense_on_date_range(initial_date, final_date))
+
+    def __read_total_expense_on_date_range(self, initial_date: date, final_date: date) -> Money:
+        total_expense = self.__session.scalar(
+            select(as_money(func.sum(DailyExpenseTotal.spent_money)))
+            .where(DailyExpenseTotal.date >= initial_date)
+            .where(DailyExpenseTotal.date <= final_date)
+        )
+        return total_expense or CUPMoney('0.00')
+
     def get_all_expenses(self) -> list:
-        return self.__session.scalars(select(Expense)).all()
+        return self.__session.scalars(select(Expense).execution_options(populate_existing=True)).all()
 
     def get_expenses_by_filter(self, the_filter: ExpenseFilter):
-        filter_query = self.__create_filter_query(the_filter)
+        filter_query = self.__create_filter_query(select(Expense).execution_options(populate_existing=True),
+                                                  the_filter)
         return self.__session.scalars(filter_query).all()
 
-    @staticmethod
-    def __create_filter_query(the_filter: ExpenseFilter):
-        query = select(Expense)
+    def get_expense_rows_by_filter(self, the_filter: ExpenseFilter) -> list:
+        """
+        Igual que get_expenses_by_filter, pero devuelve filas de solo lectura, que se
+        crean mucho más rápido que las entidades del ORM.
+        """
+        filter_query = self.__create_filter_query(
+            select(Expense.id, Expense.name, Expense.description, as_amount(Expense.spent_money), Expense.date),
+            the_filter)
+        return list(map(ExpenseRow._make, self.__session.execute(filter_query)))
 
+    @staticmethod
+    def __create_filter_query(query, the_filter: ExpenseFilter):
         if the_filter.minimum_date is not None:
             query = query.where(Expense.date >= the_filter.minimum_date)
         if the_filter.maximum_date is not None:
@@ -151,11 +236,7 @@ class ExpenseRepository:
         if the_filter.id_list is not None:
             query = query.where(Expense.id.in_(the_filter.id_list))
 
-        if the_filter.phrase is not None:
-            query = query.filter(
-                or_(
-                    Expense.name.ilike('%{}%'.format(the_filter.phrase)),
-                    Expense.description.ilike('%{}%'.format(the_filter.phrase))
-                ))
+        if not is_blank_phrase(the_filter.phrase):
+            query = expenses_search_index.search(query, Expense.id, create_prefix_query(the_filter.phrase))
 
         return query
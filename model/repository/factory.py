@@ -1,13 +1,14 @@
 from model.repository.economic_summary import EconomicSummaryRepository
 from model.repository.expense import ExpenseRepository
 from model.repository.product import ProductRepository
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from sqlalchemy.pool import NullPool
+from model.repository.query_cache import QueryCache
+from sqlalchemy.orm import scoped_session, sessionmaker
 import os
 from pathlib import Path
+from model.connection import create_database_engine
 from model.repository.sale import SaleRepository
 from model.repository.sales_grouped_by_product import SalesGroupedByProductRepository
+from model.repository.ticket import TicketRepository
 
 
 __BLUE_POS_FOLDER_PATH = Path(os.path.join(str(Path.home()), '.blue-pos/'))
@@ -22,12 +23,14 @@ DB_URL = f'sqlite:///{__BLUE_POS_DB_PATH}?check_same_thread=False'
 
 class RepositoryFactory:
     __url = None
-    __session: Session = None
+    __session: scoped_session = None
     __product_repository = None
     __sale_repository = None
     __sales_grouped_by_product_repository = None
     __expense_repository = None
     __economic_summary_repository = None
+    __ticket_repository = None
+    __query_cache: QueryCache = None
     __engine = None
 
     @staticmethod
@@ -36,6 +39,7 @@ class RepositoryFactory:
 
         if RepositoryFactory.__product_repository is None:
             RepositoryFactory.__product_repository = ProductRepository(RepositoryFactory.__session)
+            RepositoryFactory.__product_repository.add_on_data_changed_listener(RepositoryFactory.__query_cache)
 
         return RepositoryFactory.__product_repository
 
@@ -43,17 +47,44 @@ class RepositoryFactory:
     def __create_session_if_necessary(db_url):
 
         if RepositoryFactory.__url != db_url:
+            RepositoryFactory.close_session()
+            RepositoryFactory.__forget_repositories()
             RepositoryFactory.__url = db_url
-            RepositoryFactory.__engine = create_engine(db_url, poolclass=NullPool)
-            RepositoryFactory.__session = Session(RepositoryFactory.__engine)
+            RepositoryFactory.__engine = create_database_engine(db_url)
+            RepositoryFactory.__session = RepositoryFactory.__create_session_registry(RepositoryFactory.__engine)
+            RepositoryFactory.__query_cache = QueryCache()
         return RepositoryFactory.__session
 
+    @staticmethod
+    def __forget_repositories():
+        RepositoryFactory.__product_repository = None
+        RepositoryFactory.__sale_repository = None
+        RepositoryFactory.__sales_grouped_by_product_repository = None
+        RepositoryFactory.__expense_repository = None
+        RepositoryFactory.__economic_summary_repository = None
+        RepositoryFactory.__ticket_repository = None
+
+    @staticmethod
+    def __create_session_registry(engine) -> scoped_session:
+        """
+        Los repositorios reciben un registro de sesiones en lugar de una sesión. Cada
+        hilo trabaja con su propia sesión, que se elimina con remove_session() al
+        terminar la tarea, así varios PresenterThreadWorker pueden usar los mismos
+        repositorios a la vez sin compartir el mapa de identidad ni la transacción.
+        Las consultas que devuelven entidades usan populate_existing, porque otro hilo
+        pudo modificar los objetos que la sesión de este hilo ya tiene cargados.
+        """
+        session_factory = sessionmaker(engine, expire_on_commit=False)
+        return scoped_session(session_factory)
+
     @staticmethod
     def get_sale_repository(url: str = DB_URL) -> SaleRepository:
         RepositoryFactory.__create_session_if_necessary(url)
 
         if RepositoryFactory.__sale_repository is None:
-            RepositoryFactory.__sale_repository = SaleRepository(RepositoryFactory.__session)
+            RepositoryFactory.__sale_repository = SaleRepository(RepositoryFactory.__session,
+                                                                 RepositoryFactory.__query_cache)
+            RepositoryFactory.__sale_repository.add_on_data_changed_listener(RepositoryFactory.__query_cache)
 
         return RepositoryFactory.__sale_repository
 
@@ -62,7 +93,9 @@ class RepositoryFactory:
         RepositoryFactory.__create_session_if_necessary(url)
 
         if RepositoryFactory.__expense_repository is None:
-            RepositoryFactory.__expense_repository = ExpenseRepository(RepositoryFactory.__session)
+            RepositoryFactory.__expense_repository = ExpenseRepository(RepositoryFactory.__session,
+                                                                       RepositoryFactory.__query_cache)
+            RepositoryFactory.__expense_repository.add_on_data_changed_listener(RepositoryFactory.__query_cache)
 
         return RepositoryFactory.__expense_repository
 
@@ -72,7 +105,7 @@ class RepositoryFactory:
 
         if RepositoryFactory.__sales_grouped_by_product_repository is None:
             RepositoryFactory.__sales_grouped_by_product_repository = SalesGroupedByProductRepository(
-                RepositoryFactory.__session)
+                RepositoryFactory.__session, RepositoryFactory.__query_cache)
 
         return RepositoryFactory.__sales_grouped_by_product_repository
 
@@ -82,13 +115,41 @@ class RepositoryFactory:
 
         if RepositoryFactory.__economic_summary_repository is None:
             RepositoryFactory.__economic_summary_repository = EconomicSummaryRepository(
-                RepositoryFactory.__session)
+                RepositoryFactory.__session, RepositoryFactory.__query_cache)
 
         return RepositoryFactory.__economic_summary_repository
 
+    @staticmethod
+    def get_ticket_repository(url: str = DB_URL) -> TicketRepository:
+        RepositoryFactory.__create_session_if_necessary(url)
+
+        if RepositoryFactory.__ticket_repository is None:
+            RepositoryFactory.__ticket_repository = TicketRepository(RepositoryFactory.__session)
+
+        return RepositoryFactory.__ticket_repository
+
+    @staticmethod
+    def get_query_cache(url: str = DB_URL) -> QueryCache:
+        """
+        Devuelve la caché de las consultas de resumen y agrupadas que comparten los
+        repositorios. Los repositorios que escriben la invalidan al notificar cambios.
+        """
+        RepositoryFactory.__create_session_if_necessary(url)
+        return RepositoryFactory.__query_cache
+
+    @staticmethod
+    def remove_session():
+        """
+        Cierra la sesión del hilo actual. La siguiente llamada a un repositorio desde
+        este hilo usará una sesión nueva.
+        """
+        if RepositoryFactory.__session is not None:
+            RepositoryFactory.__session.remove()
+
     @staticmethod
     def close_session():
         if RepositoryFactory.__session is not None:
-            RepositoryFactory.__session.close()
-            RepositoryFactory.__session.bind.dispose()
+            RepositoryFactory.__session.remove()
             RepositoryFactory.__engine.dispose()
+            # La base de datos pudo cambiar sin pasar por los repositorios.
+            RepositoryFactory.__query_cache.clear()
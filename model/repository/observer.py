@@ -1,3 +1,75 @@
+from datetime import date
+
+
+class DataChangedEvent:
+    """
+    Cambios que confirmó una transacción de un repositorio. Cada cambio tiene el tipo
+    de entidad, la operación y los ids afectados; los de ventas y gastos también
+    tienen sus fechas. Los cambios de la misma entidad y operación se juntan, así que
+    un evento dice qué filas cambiaron sin importar cuántas sentencias se usaron.
+    """
+
+    PRODUCT = 'product'
+    SALE = 'sale'
+    EXPENSE = 'expense'
+
+    INSERTED = 'inserted'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+
+    def __init__(self):
+        self.__ids_by_change = {}
+        self.__dates_by_entity = {}
+
+    def add_change(self, entity: str, operation: str, ids, dates=()) -> 'DataChangedEvent':
+        """
+        Agrega los ids de entity afectados por operation y las fechas en que estaban o
+        quedaron. Un id insertado o modificado deja de contarse como eliminado, y uno
+        eliminado deja de contarse como insertado o modificado.
+        """
+        ids = set(ids)
+        if operation == self.DELETED:
+            self.__discard_ids(entity, self.INSERTED, ids)
+            self.__discard_ids(entity, self.UPDATED, ids)
+        else:
+            self.__discard_ids(entity, self.DELETED, ids)
+
+        self.__ids_by_change.setdefault((entity, operation), set()).update(ids)
+        self.__dates_by_entity.setdefault(entity, set()).update(dates)
+        return self
+
+    def __discard_ids(self, entity: str, operation: str, ids: set):
+        if (entity, operation) in self.__ids_by_change:
+            self.__ids_by_change[(entity, operation)] -= ids
+
+    def merge(self, later_event: 'DataChangedEvent') -> 'DataChangedEvent':
+        """
+        Devuelve un evento nuevo con los cambios de este evento seguidos por los de
+        later_event.
+        """
+        merged_event = DataChangedEvent()
+        for an_event in (self, later_event):
+            for (entity, operation), ids in an_event.__ids_by_change.items():
+                merged_event.add_change(entity, operation, ids, an_event.get_dates(entity))
+        return merged_event
+
+    def get_entities(self) -> set:
+        return set(self.__dates_by_entity.keys())
+
+    def has_changes_of(self, entity: str) -> bool:
+        return entity in self.__dates_by_entity
+
+    def get_ids(self, entity: str, operation: str) -> set:
+        return set(self.__ids_by_change.get((entity, operation), ()))
+
+    def get_inserted_or_updated_ids(self, entity: str) -> set:
+        return self.get_ids(entity, self.INSERTED) | self.get_ids(entity, self.UPDATED)
+
+    def get_dates(self, entity: str) -> set:
+        return set(self.__dates_by_entity.get(entity, ()))
+
+    def has_dates_between(self, entity: str, initial_date: date, final_date: date) -> bool:
+        return any(map(lambda a_date: initial_date <= a_date <= final_date, self.get_dates(entity)))
 
 
 class RepositoryObserver:
@@ -16,6 +88,10 @@ class RepositoryObserver:
         while listener in self.__listeners:
             self.__listeners.remove(listener)
 
-    def _notify_on_data_changed_listeners(self):
-        for a_listener in self.__listeners:
-            a_listener.on_data_changed()
+    def _notify_on_data_changed_listeners(self, event: DataChangedEvent):
+        """
+        Entrega a cada listener, en el hilo que hizo el cambio, el evento con todo lo
+        que se confirmó. Se llama una sola vez después de cada commit.
+        """
+        for a_listener in list(self.__listeners):
+            a_listener.on_data_changed(event)
@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
-from model.entity.models import Product, Sale
-from sqlalchemy import select, delete, cast, Float
+from model.connection import split_in_chunks
+from model.entity.models import Product, Sale, DailyProductSales, Ticket, products_search_index
+from model.entity.rows import ProductRow
+from sqlalchemy import select, delete, update, func, exists
 
 from model.repository.exc.product import UniqueProductNameException, NonExistentProductException, \
     InvalidProductQuantityException, NoPositivePriceException, EmptyProductNameException, NegativeCostException
-from model.repository.observer import RepositoryObserver
+from model.repository.observer import RepositoryObserver, DataChangedEvent
+from model.util.full_text_search import create_prefix_query, is_blank_phrase
 from model.util.monetary_types import CUPMoney
+from model.util.money_colum import as_money, as_amount
 
 
 class ProductFilter:
@@ -97,7 +101,8 @@ class ProductRepository(RepositoryObserver):
 
         self.__session.add(product)
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(
+            DataChangedEvent().add_change(DataChangedEvent.PRODUCT, DataChangedEvent.INSERTED, [product.id]))
 
     @staticmethod
     def __check_name_is_not_empty_or_whitespaces(name: str):
@@ -132,10 +137,30 @@ class ProductRepository(RepositoryObserver):
 
     def delete_product(self, product: Product):
         found_product = self.__check_product_exists(product)
+        event = self.__create_product_deletion_event([found_product.id])
 
+        self.__execute_daily_product_sales_deletion_by_product_ids([found_product.id])
+        ticket_ids = self.__subtract_sales_from_ticket_totals_by_product_ids([found_product.id])
         self.__session.delete(found_product)
+        self.__session.flush()
+        self.__delete_tickets_without_sales(ticket_ids)
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(event)
+
+    def __create_product_deletion_event(self, product_id_list: list) -> DataChangedEvent:
+        """
+        Las ventas de los productos se eliminan con ellos. El evento no lleva sus ids,
+        que pueden ser muchísimos, sino los días en que los productos tenían ventas,
+        que se leen de la tabla de resumen.
+        """
+        sale_dates = set()
+        for a_chunk in split_in_chunks(product_id_list):
+            sale_dates.update(self.__session.scalars(
+                select(DailyProductSales.date).distinct().where(DailyProductSales.product_id.in_(a_chunk))
+            ))
+        return DataChangedEvent()\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED, product_id_list)\
+            .add_change(DataChangedEvent.SALE, DataChangedEvent.DELETED, (), sale_dates)
 
     def __check_product_exists(self, product) -> Product:
         found_product = self.__find_product_by_id(product.id)
@@ -145,16 +170,24 @@ class ProductRepository(RepositoryObserver):
 
     def __find_product_by_id(self, product_id: int) -> Product:
         return self.__session.scalars(
-            select(Product).where(Product.id == product_id)
+            select(Product).where(Product.id == product_id).execution_options(populate_existing=True)
         ).first()
 
     def delete_products(self, product_id_list: list):
         self.__check_product_ids_exist(product_id_list)
-
-        self.__execute_sale_deletion_by_product_ids(product_id_list)
-        self.__execute_product_deletion_by_id(product_id_list)
+        event = self.__create_product_deletion_event(product_id_list)
+
+        ticket_ids = []
+        for a_chunk in split_in_chunks(product_id_list):
+            ticket_ids.extend(self.__subtract_sales_from_ticket_totals_by_product_ids(a_chunk))
+            self.__execute_sale_deletion_by_product_ids(a_chunk)
+            self.__execute_daily_product_sales_deletion_by_product_ids(a_chunk)
+        for a_chunk in split_in_chunks(ticket_ids):
+            self.__delete_tickets_without_sales(a_chunk)
+        for a_chunk in split_in_chunks(product_id_list):
+            self.__execute_product_deletion_by_id(a_chunk)
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(event)
 
     def __check_product_ids_exist(self, product_id_list: list):
         for product_id in product_id_list:
@@ -168,6 +201,40 @@ class ProductRepository(RepositoryObserver):
             .where(Sale.product_id.in_(product_id_list))
         )
 
+    def __subtract_sales_from_ticket_totals_by_product_ids(self, product_id_list: list) -> list:
+        """
+        Resta de cada ticket el dinero de sus ventas de los productos indicados y
+        devuelve los ids de los tickets modificados.
+        """
+        rows = self.__session.execute(
+            select(Sale.ticket_id, as_money(func.sum(Sale.price * Sale.quantity)))
+            .where(Sale.product_id.in_(product_id_list))
+            .where(Sale.ticket_id.isnot(None))
+            .group_by(Sale.ticket_id)
+        ).all()
+
+        for ticket_id, money in rows:
+            self.__session.execute(
+                update(Ticket)
+                .where(Ticket.id == ticket_id)
+                .values(total=Ticket.total - money)
+            )
+        return list(map(lambda a_row: a_row[0], rows))
+
+    def __delete_tickets_without_sales(self, ticket_ids: list):
+        self.__session.execute(
+            delete(Ticket)
+            .where(Ticket.id.in_(ticket_ids))
+            .where(~exists().where(Sale.ticket_id == Ticket.id))
+            .execution_options(synchronize_session=False)
+        )
+
+    def __execute_daily_product_sales_deletion_by_product_ids(self, product_id_list: list):
+        self.__session.execute(
+            delete(DailyProductSales)
+            .where(DailyProductSales.product_id.in_(product_id_list))
+        )
+
     def __execute_product_deletion_by_id(self, product_id_list: list):
         self.__session.execute(delete(Product)
                                .where(Product.id.in_(product_id_list)))
@@ -188,7 +255,8 @@ class ProductRepository(RepositoryObserver):
 
         self.__session.flush()
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(
+            DataChangedEvent().add_change(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED, [old.id]))
 
     def __check_name_can_be_used(self, old: Product, new: Product):
         found_product = self.__find_product_by_name(new.name)
@@ -196,22 +264,48 @@ class ProductRepository(RepositoryObserver):
             raise UniqueProductNameException(new.name)
 
     def get_all_products(self) -> list:
-        return self.__session.scalars(select(Product)).all()
+        return self.__session.scalars(select(Product).execution_options(populate_existing=True)).all()
+
+    def get_all_product_rows(self) -> list:
+        """
+        Devuelve todos los productos como filas de solo lectura, que se crean mucho más
+        rápido que las entidades del ORM.
+        """
+        return list(map(ProductRow._make, self.__session.execute(self.__create_row_query())))
+
+    def get_product_rows_by_ids(self, product_id_list: list) -> list:
+        """
+        Devuelve como filas de solo lectura los productos indicados que existen.
+        """
+        rows = []
+        for a_chunk in split_in_chunks(list(product_id_list)):
+            rows.extend(map(ProductRow._make,
+                            self.__session.execute(self.__create_row_query().where(Product.id.in_(a_chunk)))))
+        return rows
+
+    @staticmethod
+    def __create_row_query():
+        return select(Product.id, Product.name, as_amount(Product.price), as_amount(Product.cost), Product.quantity)
 
     def get_products_by_filter(self, the_filter: ProductFilter) -> list:
         filter_query = self.__create_filter_query(the_filter)
         return self.__session.scalars(filter_query).all()
 
     def __create_filter_query(self, the_filter: ProductFilter):
-        query = select(Product)
+        query = select(Product).execution_options(populate_existing=True)
         if the_filter.id is not None:
             query = query.where(Product.id == the_filter.id)
 
-        if the_filter.name is not None:
-            query = query.where(Product.name.ilike('%{}%'.format(the_filter.name)))
-
-        if the_filter.description is not None:
-            query = query.where(Product.description.ilike('%{}%'.format(the_filter.description)))
+        # FTS5 usa un solo MATCH por tabla, así que las dos columnas van en la misma consulta.
+        # Si alguna frase no tiene palabras, la consulta queda vacía y no coincide con nada.
+        search_queries = []
+        if not is_blank_phrase(the_filter.name):
+            search_queries.append(create_prefix_query(the_filter.name, 'name'))
+        if not is_blank_phrase(the_filter.description):
+            search_queries.append(create_prefix_query(the_filter.description, 'description'))
+        if len(search_queries) > 0:
+            query = products_search_index.search(query, Product.id,
+                                                 ' '.join(search_queries) if all(search_queries) else '')
 
         if the_filter.more_than_price is not None:
             query = query.where(Product.price >= the_filter.more_than_price)
@@ -219,11 +313,9 @@ class ProductRepository(RepositoryObserver):
             query = query.where(Product.price <= the_filter.less_than_price)
 
         if the_filter.more_than_profit is not None:
-            more_than_profit = float(the_filter.more_than_profit.amount)
-            query = query.where(cast(Product.price, Float) - cast(Product.cost, Float) >= more_than_profit)
+            query = query.where(as_money(Product.price - Product.cost) >= the_filter.more_than_profit)
         if the_filter.less_than_profit is not None:
-            less_than_profit = float(the_filter.less_than_profit.amount)
-            query = query.where(cast(Product.price, Float) - cast(Product.cost, Float) <= less_than_profit)
+            query = query.where(as_money(Product.price - Product.cost) <= the_filter.less_than_profit)
 
         if the_filter.more_than_quantity is not None:
             query = query.where(Product.quantity >= the_filter.more_than_quantity)
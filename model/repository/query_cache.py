@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from threading import Lock
+
+from model.repository.observer import DataChangedEvent
+
+
+class QueryCache:
+    """
+    Caché LRU acotada de los resultados de las consultas de resumen y agrupadas. Cada
+    resultado se guarda con las tablas que leyó su consulta, y cuando un repositorio
+    notifica que cambió una tabla se descartan solo los resultados que dependen de
+    ella. Con maximum_size igual a 0 no se guarda ningún resultado.
+    """
+
+    SALES = DataChangedEvent.SALE
+    PRODUCTS = DataChangedEvent.PRODUCT
+    EXPENSES = DataChangedEvent.EXPENSE
+
+    DEFAULT_MAXIMUM_SIZE = 128
+
+    def __init__(self, maximum_size: int = DEFAULT_MAXIMUM_SIZE):
+        if maximum_size < 0:
+            raise ValueError('The maximum size of the query cache can not be negative.')
+
+        self.__maximum_size = maximum_size
+        # Cada clave tiene las tablas que leyó su consulta y el resultado.
+        self.__entries = OrderedDict()
+        # Cambia con cada modificación de la tabla. Una consulta que empezó antes de una
+        # modificación no guarda su resultado, que puede estar desactualizado.
+        self.__table_versions = {self.SALES: 0, self.PRODUCTS: 0, self.EXPENSES: 0}
+        # Los repositorios se usan desde varios hilos a la vez.
+        self.__lock = Lock()
+        self.__hit_count = 0
+        self.__miss_count = 0
+
+    def get_or_load(self, key: tuple, tables: tuple, load):
+        """
+        Devuelve el resultado guardado con key o, si no está, el que devuelve load(),
+        que es la consulta que lee las tablas indicadas. La clave debe tener el tipo
+        de consulta y todos sus parámetros.
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.__hit_count += 1
+                return self.__entries[key][1]
+
+            self.__miss_count += 1
+            table_versions = self.__get_table_versions(tables)
+
+        result = load()
+
+        with self.__lock:
+            if self.__maximum_size > 0 and table_versions == self.__get_table_versions(tables):
+                self.__entries[key] = (tables, result)
+                self.__entries.move_to_end(key)
+                if len(self.__entries) > self.__maximum_size:
+                    self.__entries.popitem(last=False)
+
+        return result
+
+    def __get_table_versions(self, tables: tuple) -> tuple:
+        return tuple(map(lambda a_table: self.__table_versions[a_table], tables))
+
+    def invalidate(self, table: str):
+        with self.__lock:
+            self.__table_versions[table] += 1
+            for a_key, (tables, _) in list(self.__entries.items()):
+                if table in tables:
+                    del self.__entries[a_key]
+
+    def clear(self):
+        with self.__lock:
+            for a_table in self.__table_versions:
+                self.__table_versions[a_table] += 1
+            self.__entries.clear()
+
+    def on_data_changed(self, event: DataChangedEvent):
+        for an_entity in event.get_entities():
+            self.invalidate(an_entity)
+
+    def get_hit_count(self) -> int:
+        return self.__hit_count
+
+    def get_miss_count(self) -> int:
+        return self.__miss_count
+
+    def get_size(self) -> int:
+        return len(self.__entries)
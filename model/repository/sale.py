@@ -1,15 +1,25 @@
-from datetime import date
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional
 
-from sqlalchemy import insert, update, select, delete, cast, Numeric, type_coerce, asc, desc, Float
+from money import Money
+from sqlalchemy import update, select, delete, func, exists, tuple_
+from sqlalchemy.dialects.sqlite import insert
 
-from model.entity.models import Product, Sale
-from sqlalchemy.orm import Session, aliased
+from model.connection import split_in_chunks
+from model.entity.models import Product, Sale, DailyProductSales, Ticket
+from model.entity.rows import SaleRow
+from model.entity.sales_heatmap import SalesHeatmap
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload, raiseload
 
 from model.repository.exc.product import NonExistentProductException, NoPositivePriceException, NegativeCostException
 from model.repository.exc.sale import NoEnoughProductQuantityException, NonExistentSaleException, \
-    ChangeProductIdInSaleException
-from model.repository.observer import RepositoryObserver
+    ChangeProductIdInSaleException, NoEnoughSaleUnitsException
+from model.repository.observer import RepositoryObserver, DataChangedEvent
+from model.repository.query_cache import QueryCache
 from model.util.monetary_types import CUPMoney
+from model.util.money_colum import as_money, as_amount, MoneyColumn
 
 
 class SaleFilter:
@@ -20,11 +30,14 @@ class SaleFilter:
     PRICE = 'price'
     COST = 'cost'
     PROFIT = 'profit'
+    QUANTITY = 'quantity'
 
     def __init__(self):
         self.__product_id_list = None
         self.__minimum_date = None
         self.__maximum_date = None
+        self.__minimum_quantity = None
+        self.__maximum_quantity = None
         self.__sale_id_list = None
         self.__sorted_by = None
         self.__ascending_order = True
@@ -61,6 +74,22 @@ class SaleFilter:
     def maximum_date(self, value: date):
         self.__maximum_date = value
 
+    @property
+    def minimum_quantity(self) -> int:
+        return self.__minimum_quantity
+
+    @minimum_quantity.setter
+    def minimum_quantity(self, value: int):
+        self.__minimum_quantity = value
+
+    @property
+    def maximum_quantity(self) -> int:
+        return self.__maximum_quantity
+
+    @maximum_quantity.setter
+    def maximum_quantity(self, value: int):
+        self.__maximum_quantity = value
+
     @property
     def sorted_by(self) -> str:
         return self.__sorted_by
@@ -77,26 +106,180 @@ class SaleFilter:
     def ascending_order(self, value: bool):
         self.__ascending_order = value
 
+    def is_it_match(self, sale: Sale) -> bool:
+        is_it_match = True
+
+        if self.__product_id_list is not None:
+            is_it_match = is_it_match and sale.product_id in self.__product_id_list
+
+        if self.__sale_id_list is not None:
+            is_it_match = is_it_match and sale.id in self.__sale_id_list
+
+        if self.__minimum_date is not None:
+            is_it_match = is_it_match and (self.__minimum_date <= sale.date)
+
+        if self.__maximum_date is not None:
+            is_it_match = is_it_match and (sale.date <= self.__maximum_date)
+
+        if self.__minimum_quantity is not None:
+            is_it_match = is_it_match and (self.__minimum_quantity <= sale.quantity)
+
+        if self.__maximum_quantity is not None:
+            is_it_match = is_it_match and (sale.quantity <= self.__maximum_quantity)
+
+        return is_it_match
+
+    def get_sort_key(self, sale: Sale):
+        """
+        Devuelve el valor de sale por el que se ordenan las ventas de este filtro, que es
+        el que necesita SaleRepository.get_sales_page_by_filter para continuar después
+        de esa venta.
+        """
+        if self.__sorted_by == SaleFilter.PRODUCT_ID:
+            return sale.product_id
+        elif self.__sorted_by == SaleFilter.SALE_DATE:
+            return sale.date
+        elif self.__sorted_by == SaleFilter.QUANTITY:
+            return sale.quantity
+        elif self.__sorted_by == SaleFilter.PRICE:
+            return sale.price
+        elif self.__sorted_by == SaleFilter.COST:
+            return sale.cost
+        elif self.__sorted_by == SaleFilter.PROFIT:
+            return sale.profit
+        return sale.id
+
 
 class SaleRepository(RepositoryObserver):
 
-    def __init__(self, session: Session):
+    SALE_BATCH_SIZE = 500
+
+    # Formas de cargar el producto de las ventas que se leen. Si el producto no se
+    # carga, leer sale.product lanza una excepción en lugar de hacer una consulta.
+    JOINED_PRODUCT = 'joined_product'
+    SELECTIN_PRODUCT = 'selectin_product'
+    WITHOUT_PRODUCT = 'without_product'
+
+    def __init__(self, session: Session, query_cache: QueryCache = None):
         super().__init__()
         self.__session = session
+        self.__query_cache = query_cache if query_cache is not None else QueryCache(maximum_size=0)
+
+    @contextmanager
+    def read_transaction(self):
+        """
+        Las consultas que hacen los repositorios de este hilo dentro del bloque leen la
+        base de datos tal como estaba en la primera de ellas, aunque otras conexiones
+        escriban mientras tanto. Dentro del bloque no se debe escribir.
+        """
+        # SQLite no abre una transacción antes de un SELECT, así que se abre a mano.
+        self.__session.commit()
+        self.__session.connection().exec_driver_sql('BEGIN')
+        try:
+            yield
+        finally:
+            self.__session.commit()
 
     def insert_sales(self, sale: Sale, quantity: int) -> list:
         self.__check_quantity_is_positive(quantity)
         self.__check_price_is_positive(sale)
         self.__check_cost_is_not_negative(sale)
-        self.__check_product_exists(sale)
-        self.__check_there_are_enough_products(sale, quantity)
 
+        self.__take_units_from_product_stock(sale.product_id, quantity)
         sales = self.__execute_insertion_and_return_sales(sale, quantity)
-        self.__execute_product_quantity_update(sale, quantity)
+        self.__add_units_to_daily_product_sales(sale, quantity)
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(self.__create_sale_event(DataChangedEvent.INSERTED, sales))
         return sales
 
+    def checkout(self, lines: list, created_at: datetime = None) -> Ticket:
+        """
+        Cobra en una sola transacción las líneas de venta de un cliente y las agrupa
+        en un ticket. Cada línea es una venta con el producto, la fecha, el precio, el
+        costo y la cantidad de unidades. Las existencias de todos los productos se
+        validan con una sola consulta antes de escribir. Si no se indica created_at,
+        el ticket se cobra en la fecha de la primera línea a la hora actual, o sin hora
+        si esa fecha no es la de hoy.
+        """
+        self.__check_lines_are_valid(lines)
+        units_by_product_id = Counter()
+        for a_line in lines:
+            units_by_product_id[a_line.product_id] += a_line.quantity
+        self.__check_products_have_enough_units(units_by_product_id)
+
+        for product_id, units in units_by_product_id.items():
+            self.__take_units_from_product_stock(product_id, units)
+        created_at = created_at or self.__get_time_of_sale(lines[0])
+        sales = list(map(lambda a_line: self.__create_sale_from_line(a_line, created_at), lines))
+        ticket = Ticket(
+            date=created_at.date() if created_at is not None else lines[0].date,
+            created_at=created_at,
+            total=sum(map(lambda a_sale: a_sale.total_price, sales), CUPMoney('0.00')),
+            sales=sales
+        )
+        self.__session.add(ticket)
+        for a_sale in ticket.sales:
+            self.__add_units_to_daily_product_sales(a_sale, a_sale.quantity)
+        self.__session.commit()
+        self._notify_on_data_changed_listeners(self.__create_sale_event(DataChangedEvent.INSERTED, ticket.sales))
+        return ticket
+
+    @staticmethod
+    def __create_sale_event(operation: str, sales: list) -> DataChangedEvent:
+        """
+        Crea el evento de las ventas indicadas, que también cambiaron las existencias
+        de sus productos. Las ventas pueden ser Sale o filas con id, fecha y producto.
+        """
+        return DataChangedEvent()\
+            .add_change(DataChangedEvent.SALE, operation,
+                        map(lambda a_sale: a_sale.id, sales), map(lambda a_sale: a_sale.date, sales))\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED,
+                        map(lambda a_sale: a_sale.product_id, sales))
+
+    def __check_lines_are_valid(self, lines: list):
+        if len(lines) == 0:
+            raise ValueError('A checkout needs at least one sale line.')
+
+        for a_line in lines:
+            self.__check_quantity_is_positive(a_line.quantity)
+            self.__check_price_is_positive(a_line)
+            self.__check_cost_is_not_negative(a_line)
+
+    def __check_products_have_enough_units(self, units_by_product_id: Counter):
+        available_units_by_product_id = dict(self.__session.execute(
+            select(Product.id, Product.quantity).where(Product.id.in_(units_by_product_id.keys()))
+        ).all())
+
+        for product_id, units in units_by_product_id.items():
+            if product_id not in available_units_by_product_id:
+                raise NonExistentProductException(Product(id=product_id))
+            if available_units_by_product_id[product_id] < units:
+                raise NoEnoughProductQuantityException(available_units_by_product_id[product_id], product_id)
+
+    @staticmethod
+    def __create_sale_from_line(line: Sale, sold_at: datetime) -> Sale:
+        return Sale(
+            product_id=line.product_id,
+            date=line.date,
+            price=line.price,
+            cost=line.cost,
+            quantity=line.quantity,
+            sold_at=line.sold_at or sold_at
+        )
+
+    @staticmethod
+    def __get_time_of_sale(sale: Sale) -> Optional[datetime]:
+        """
+        Devuelve sale.sold_at o, si no se indicó, la fecha de la venta a la hora actual.
+        La hora de una venta de otro día que se registra después no se conoce, así que
+        en ese caso devuelve None y la venta no cuenta en los resúmenes por hora.
+        """
+        if sale.sold_at is not None:
+            return sale.sold_at
+        if sale.date != date.today():
+            return None
+        return datetime.combine(sale.date, datetime.now().time())
+
     def __check_quantity_is_positive(self, quantity: int):
         if quantity <= 0:
             raise ValueError('The quantity of sales must be positive.')
@@ -111,7 +294,8 @@ class SaleRepository(RepositoryObserver):
             raise NegativeCostException(sale.cost)
 
     def __get_product_by_id(self, product_id: int) -> Product:
-        return self.__session.scalar(select(Product).where(Product.id == product_id))
+        return self.__session.scalar(
+            select(Product).where(Product.id == product_id).execution_options(populate_existing=True))
 
     def __check_product_exists(self, sale: Sale):
         read_product = self.__get_product_by_id(sale.product_id)
@@ -120,124 +304,445 @@ class SaleRepository(RepositoryObserver):
             nonexistent_product.id = sale.product_id
             raise NonExistentProductException(nonexistent_product)
 
-    def __check_there_are_enough_products(self, sale: Sale, quantity_of_sales):
-        read_product = self.__get_product_by_id(sale.product_id)
-        if read_product.quantity - quantity_of_sales < 0:
-            raise NoEnoughProductQuantityException(read_product.quantity)
+    def __take_units_from_product_stock(self, product_id: int, units: int):
+        """
+        Descuenta las unidades de las existencias del producto con una sola sentencia
+        que solo se aplica si quedan unidades suficientes, así dos ventas simultáneas
+        no pueden dejar existencias negativas. Las unidades son negativas cuando se
+        devuelven al producto. Si la sentencia no se aplica, la transacción se deshace.
+        """
+        result = self.__session.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .where(Product.quantity >= units)
+            .values(quantity=Product.quantity - units)
+        )
+        if result.rowcount == 0:
+            self.__session.rollback()
+            read_product = self.__get_product_by_id(product_id)
+            if read_product is None:
+                raise NonExistentProductException(Product(id=product_id))
+            raise NoEnoughProductQuantityException(read_product.quantity, product_id)
 
     def __execute_insertion_and_return_sales(self, sale: Sale, quantity: int) -> list:
-        sales = []
-        for i in range(quantity):
-            a_sale = Sale(
-                product_id=sale.product_id,
-                date=sale.date,
-                price=sale.price,
-                cost=sale.cost
+        a_sale = Sale(
+            product_id=sale.product_id,
+            date=sale.date,
+            price=sale.price,
+            cost=sale.cost,
+            quantity=quantity,
+            sold_at=self.__get_time_of_sale(sale)
+        )
+        self.__session.add(a_sale)
+        return [a_sale]
+
+    def __add_units_to_daily_product_sales(self, sale: Sale, units: int):
+        """
+        Suma a la fila del producto y el día de la venta las unidades indicadas, que
+        son negativas cuando se deshacen unidades vendidas.
+        """
+        self.__add_to_daily_product_sales(sale.date, sale.product_id, units, sale.price * units, sale.cost * units)
+
+    def __add_to_daily_product_sales(self, sale_date: date, product_id: int, units: int, revenue: Money, cost: Money):
+        """
+        Suma las unidades, el dinero obtenido y el costo a la fila del producto y el
+        día indicados. Las filas que se quedan sin unidades se eliminan.
+        """
+        statement = insert(DailyProductSales).values(
+            date=sale_date,
+            product_id=product_id,
+            units=units,
+            revenue=revenue,
+            cost=cost
+        )
+        self.__session.execute(statement.on_conflict_do_update(
+            index_elements=[DailyProductSales.date, DailyProductSales.product_id],
+            set_={
+                DailyProductSales.units: DailyProductSales.units + statement.excluded.units,
+                DailyProductSales.revenue: DailyProductSales.revenue + statement.excluded.revenue,
+                DailyProductSales.cost: DailyProductSales.cost + statement.excluded.cost
+            }
+        ))
+
+        if units < 0:
+            self.__session.execute(
+                delete(DailyProductSales)
+                .where(DailyProductSales.date == sale_date)
+                .where(DailyProductSales.product_id == product_id)
+                .where(DailyProductSales.units == 0)
             )
-            sales.append(a_sale)
-        self.__session.add_all(sales)
-        return sales
 
-    def __execute_product_quantity_update(self, sale: Sale, sale_quantity: int):
-        product = self.__session.scalar(select(Product).where(Product.id == sale.product_id))
+    def __add_money_to_ticket_total(self, ticket_id: int, money: Money):
+        """
+        Suma al total del ticket el dinero indicado, que es negativo cuando se deshacen
+        ventas. Las ventas anteriores a los tickets no tienen ticket y se ignoran.
+        """
+        if ticket_id is None:
+            return
 
         self.__session.execute(
-            update(Product)
-            .where(Product.id == sale.product_id)
-            .values(quantity=product.quantity - sale_quantity)
+            update(Ticket)
+            .where(Ticket.id == ticket_id)
+            .values(total=Ticket.total + money)
+        )
+
+    def __delete_tickets_without_sales(self, ticket_ids: list):
+        self.__session.execute(
+            delete(Ticket)
+            .where(Ticket.id.in_(ticket_ids))
+            .where(~exists().where(Sale.ticket_id == Ticket.id))
+            .execution_options(synchronize_session=False)
         )
 
     def delete_sale(self, sale_to_delete: Sale):
-        self.__check_sale_exists(sale_to_delete)
+        read_sale = self.__check_sale_exists(sale_to_delete)
         self.__check_product_exists(sale_to_delete)
-        self.__increase_product_quantity(sale_to_delete)
+        self.__increase_product_quantity(sale_to_delete, read_sale.quantity)
+        self.__add_units_to_daily_product_sales(read_sale, -read_sale.quantity)
+        self.__add_money_to_ticket_total(read_sale.ticket_id, -read_sale.total_price)
 
         self.__session.execute(
             delete(Sale)
             .where(Sale.id == sale_to_delete.id)
         )
+        self.__delete_tickets_without_sales([read_sale.ticket_id])
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        self._notify_on_data_changed_listeners(self.__create_sale_event(DataChangedEvent.DELETED, [read_sale]))
 
     def delete_sales(self, sale_id_list: list):
-        self.__check_sales_exists(sale_id_list)
-        self.__increase_quantity_of_associated_products(sale_id_list)
-
-        self.__execute_sale_deletion(sale_id_list)
+        """
+        Deshace las ventas indicadas. Los ids se validan y se eliminan en grupos que
+        no superan el límite de parámetros de SQLite, y las existencias de cada
+        producto se restauran con una sola sentencia.
+        """
+        sale_id_chunks = split_in_chunks(list(dict.fromkeys(sale_id_list)))
+        deleted_sale_ids = []
+        for a_chunk in sale_id_chunks:
+            deleted_sale_ids.extend(self.__check_sales_exists(a_chunk))
+        self.__increase_quantity_of_associated_products(sale_id_chunks)
+        sale_days_and_products = self.__subtract_sales_from_daily_product_sales(sale_id_chunks)
+        ticket_ids = self.__subtract_sales_from_ticket_totals(sale_id_chunks)
+
+        for a_chunk in sale_id_chunks:
+            self.__execute_sale_deletion(a_chunk)
+        for a_chunk in split_in_chunks(ticket_ids):
+            self.__delete_tickets_without_sales(a_chunk)
         self.__session.commit()
+        self._notify_on_data_changed_listeners(
+            DataChangedEvent()
+            .add_change(DataChangedEvent.SALE, DataChangedEvent.DELETED,
+                        deleted_sale_ids, map(lambda a_key: a_key[0], sale_days_and_products))
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED,
+                        map(lambda a_key: a_key[1], sale_days_and_products))
+        )
 
-    def __check_sales_exists(self, sale_id_list: list):
+    def __check_sales_exists(self, sale_id_list: list) -> list:
+        """
+        Devuelve los ids de las ventas que se encontraron, que son los que se eliminan.
+        """
+        found_ids = self.__session.scalars(select(Sale.id).where(Sale.id.in_(sale_id_list))).all()
+        found_id_set = set(found_ids)
         for sale_id in sale_id_list:
-            sale = self.__get_sale_by_id(sale_id)
-            if sale is None:
+            if sale_id not in found_id_set:
                 raise NonExistentSaleException(Sale(id=sale_id))
-
-    def __increase_quantity_of_associated_products(self, sale_id_list: list):
-        for sale_id in sale_id_list:
-            sale = self.__get_sale_by_id(sale_id)
-            product = sale.product
+        return found_ids
+
+    def __increase_quantity_of_associated_products(self, sale_id_chunks: list):
+        sold_units_by_product_id = Counter()
+        for a_chunk in sale_id_chunks:
+            sold_units_by_product_id.update(dict(self.__session.execute(
+                select(Sale.product_id, func.sum(Sale.quantity))
+                .where(Sale.id.in_(a_chunk))
+                .group_by(Sale.product_id)
+            ).all()))
+
+        for product_id, units in sold_units_by_product_id.items():
             self.__session.execute(update(Product)
-                                   .where(Product.id == product.id)
-                                   .values(quantity=product.quantity + 1))
+                                   .where(Product.id == product_id)
+                                   .values(quantity=Product.quantity + units))
+
+    def __subtract_sales_from_daily_product_sales(self, sale_id_chunks: list) -> list:
+        """
+        Resta de los totales diarios las ventas que se van a deshacer y devuelve los
+        pares (fecha, id del producto) modificados.
+        """
+        sold_by_day_and_product = {}
+        for a_chunk in sale_id_chunks:
+            rows = self.__session.execute(
+                select(Sale.date, Sale.product_id, func.sum(Sale.quantity),
+                       as_money(func.sum(Sale.price * Sale.quantity)), as_money(func.sum(Sale.cost * Sale.quantity)))
+                .where(Sale.id.in_(a_chunk))
+                .group_by(Sale.date, Sale.product_id)
+            ).all()
+            for sale_date, product_id, units, revenue, cost in rows:
+                previous_units, previous_revenue, previous_cost = sold_by_day_and_product.get(
+                    (sale_date, product_id), (0, CUPMoney('0.00'), CUPMoney('0.00')))
+                sold_by_day_and_product[(sale_date, product_id)] = \
+                    (previous_units + units, previous_revenue + revenue, previous_cost + cost)
+
+        for (sale_date, product_id), (units, revenue, cost) in sold_by_day_and_product.items():
+            self.__add_to_daily_product_sales(sale_date, product_id, -units, -revenue, -cost)
+        return list(sold_by_day_and_product.keys())
+
+    def __subtract_sales_from_ticket_totals(self, sale_id_chunks: list) -> list:
+        """
+        Resta de cada ticket el dinero de sus ventas que se van a deshacer y devuelve
+        los ids de los tickets modificados.
+        """
+        money_by_ticket_id = {}
+        for a_chunk in sale_id_chunks:
+            rows = self.__session.execute(
+                select(Sale.ticket_id, as_money(func.sum(Sale.price * Sale.quantity)))
+                .where(Sale.id.in_(a_chunk))
+                .where(Sale.ticket_id.isnot(None))
+                .group_by(Sale.ticket_id)
+            ).all()
+            for ticket_id, money in rows:
+                money_by_ticket_id[ticket_id] = money_by_ticket_id.get(ticket_id, CUPMoney('0.00')) + money
+
+        for ticket_id, money in money_by_ticket_id.items():
+            self.__add_money_to_ticket_total(ticket_id, -money)
+        return list(money_by_ticket_id.keys())
 
     def __execute_sale_deletion(self, sale_id_list: list):
         self.__session.execute(delete(Sale)
                                .where(Sale.id.in_(sale_id_list)))
 
     def __get_sale_by_id(self, sale_id: int):
-        return self.__session.scalar(select(Sale).where(Sale.id == sale_id))
+        return self.__session.scalar(
+            select(Sale).where(Sale.id == sale_id).execution_options(populate_existing=True))
 
-    def __check_sale_exists(self, a_sale):
+    def __check_sale_exists(self, a_sale) -> Sale:
         read_sale = self.__get_sale_by_id(a_sale.id)
         if read_sale is None:
             raise NonExistentSaleException(a_sale)
+        return read_sale
 
-    def __increase_product_quantity(self, sale: Sale):
-        product = self.__get_product_by_id(sale.product_id)
-
+    def __increase_product_quantity(self, sale: Sale, units: int):
         self.__session.execute(
             update(Product)
             .where(Product.id == sale.product_id)
-            .values(quantity=product.quantity + 1)
+            .values(quantity=Product.quantity + units)
         )
 
+    def undo_sale_units(self, sale: Sale, units: int):
+        self.__check_quantity_is_positive(units)
+        read_sale = self.__check_sale_exists(sale)
+        self.__check_sale_has_enough_units(read_sale, units)
+        self.__increase_product_quantity(read_sale, units)
+        self.__add_units_to_daily_product_sales(read_sale, -units)
+        self.__add_money_to_ticket_total(read_sale.ticket_id, -(read_sale.price * units))
+
+        if units == read_sale.quantity:
+            self.__session.execute(delete(Sale).where(Sale.id == read_sale.id))
+            self.__delete_tickets_without_sales([read_sale.ticket_id])
+            operation = DataChangedEvent.DELETED
+        else:
+            self.__session.execute(
+                update(Sale)
+                .where(Sale.id == read_sale.id)
+                .values(quantity=read_sale.quantity - units)
+            )
+            operation = DataChangedEvent.UPDATED
+        self.__session.commit()
+        self._notify_on_data_changed_listeners(self.__create_sale_event(operation, [read_sale]))
+
+    @staticmethod
+    def __check_sale_has_enough_units(sale: Sale, units: int):
+        if sale.quantity < units:
+            raise NoEnoughSaleUnitsException(sale.quantity)
+
     def update_sale(self, sale: Sale):
         self.__check_price_is_positive(sale)
         self.__check_cost_is_not_negative(sale)
-        self.__check_sale_exists(sale)
-        self.__check_product_id_is_not_changed_in_sale(sale)
-
-        self.__execute_update_operation(sale)
+        self.__check_quantity_is_positive(sale.quantity)
+        stored_sale = self.__get_stored_sale_values(sale)
+        self.__check_product_id_is_not_changed_in_sale(sale, stored_sale)
+        sold_units_difference = sale.quantity - stored_sale.quantity
+        total_price_difference = sale.total_price - stored_sale.price * stored_sale.quantity
+
+        self.__take_units_from_product_stock(sale.product_id, sold_units_difference)
+        self.__add_units_to_daily_product_sales(stored_sale, -stored_sale.quantity)
+        self.__add_units_to_daily_product_sales(sale, sale.quantity)
+        self.__add_money_to_ticket_total(stored_sale.ticket_id, total_price_difference)
+        self.__execute_update_operation(sale, stored_sale.sold_at)
         self.__session.commit()
-        self._notify_on_data_changed_listeners()
+        # La venta puede haber cambiado de fecha.
+        self._notify_on_data_changed_listeners(
+            self.__create_sale_event(DataChangedEvent.UPDATED, [sale]).add_change(
+                DataChangedEvent.SALE, DataChangedEvent.UPDATED, [sale.id], [stored_sale.date]))
+
+    def __get_stored_sale_values(self, sale: Sale):
+        # sale puede ser el mismo objeto que está en la sesión. Los valores guardados se
+        # leen como columnas y sin autoflush para no enviar ni sobrescribir sus cambios.
+        with self.__session.no_autoflush:
+            stored_sale = self.__session.execute(
+                select(Sale.product_id, Sale.date, Sale.price, Sale.cost, Sale.quantity, Sale.ticket_id, Sale.sold_at)
+                .where(Sale.id == sale.id)
+            ).first()
+        if stored_sale is None:
+            raise NonExistentSaleException(sale)
+        return stored_sale
 
-    def __check_product_id_is_not_changed_in_sale(self, sale: Sale):
-        read_sale = self.__get_sale_by_id(sale.id)
-        if read_sale.product_id != sale.product_id:
+    @staticmethod
+    def __check_product_id_is_not_changed_in_sale(sale: Sale, stored_sale):
+        if stored_sale.product_id != sale.product_id:
             raise ChangeProductIdInSaleException()
 
-    def __execute_update_operation(self, sale: Sale):
+    def __execute_update_operation(self, sale: Sale, stored_sold_at: datetime):
+        # Si cambia la fecha de la venta, se conserva la hora a la que se hizo.
+        sold_at = None if stored_sold_at is None else datetime.combine(sale.date, stored_sold_at.time())
         self.__session.execute(
             update(Sale)
                 .where(Sale.id == sale.id)
                 .values(
                 date=sale.date,
                 price=sale.price,
-                cost=sale.cost
+                cost=sale.cost,
+                quantity=sale.quantity,
+                sold_at=sold_at
             )
         )
 
-    def get_all_sales(self) -> list:
-        return self.__session.scalars(select(Sale)).all()
-
-    def get_sales_by_filter(self, the_filter: SaleFilter) -> list:
-        filter_query = SaleRepository.__create_filter_query(the_filter)
+    def get_all_sales(self, product_loading: str = JOINED_PRODUCT) -> list:
+        query = select(Sale).options(SaleRepository.__get_product_loader_option(product_loading))\
+            .execution_options(populate_existing=True)
+        return self.__session.scalars(query).all()
+
+    def get_sales_heatmap(self, initial_date: date, final_date: date) -> SalesHeatmap:
+        """
+        Devuelve las unidades vendidas y el dinero obtenido en cada hora de cada día de
+        la semana entre initial_date y final_date con una sola consulta agrupada, que
+        solo lee el índice ix_sales_sold_at. Las ventas sin hora no se cuentan.
+        """
+        # Borrar un producto también borra sus ventas.
+        return self.__query_cache.get_or_load(
+            ('sales_heatmap', initial_date, final_date), (QueryCache.SALES, QueryCache.PRODUCTS),
+            lambda: self.__read_sales_heatmap(initial_date, final_date))
+
+    def __read_sales_heatmap(self, initial_date: date, final_date: date) -> SalesHeatmap:
+        weekday = func.strftime('%w', Sale.sold_at)
+        hour = func.strftime('%H', Sale.sold_at)
+        rows = self.__session.execute(
+            select(weekday, hour, func.sum(Sale.quantity), as_money(func.sum(Sale.price * Sale.quantity)))
+            .where(Sale.sold_at >= datetime.combine(initial_date, time()))
+            .where(Sale.sold_at < datetime.combine(final_date + timedelta(days=1), time()))
+            .group_by(weekday, hour)
+        ).all()
+
+        heatmap = SalesHeatmap(initial_date, final_date)
+        for sqlite_weekday, an_hour, units, acquired_money in rows:
+            # strftime('%w') cuenta los días desde el domingo y date.weekday() desde el lunes.
+            heatmap.set_cell((int(sqlite_weekday) + 6) % 7, int(an_hour), units, acquired_money)
+        return heatmap
+
+    def get_sales_by_filter(self, the_filter: SaleFilter, product_loading: str = JOINED_PRODUCT) -> list:
+        filter_query = SaleRepository.__create_filter_query(the_filter, product_loading)
+        filter_query = SaleRepository.__add_order_by_clause(filter_query, the_filter)
         return self.__session.scalars(filter_query).all()
 
+    def iter_sale_rows(self, the_filter: SaleFilter, batch_size: int = SALE_BATCH_SIZE) -> Iterator[SaleRow]:
+        """
+        Recorre las ventas de the_filter en su orden sin cargarlas todas en memoria, como
+        filas de solo lectura que ya traen el nombre del producto de cada venta. Las
+        filas se leen del cursor de batch_size en batch_size.
+        """
+        self.__check_quantity_is_positive(batch_size)
+        query = SaleRepository.__add_row_order_by_clause(SaleRepository.__create_row_query(the_filter), the_filter)
+        result = self.__session.execute(query.execution_options(yield_per=batch_size))
+        return self.__iter_result(result, map(SaleRow._make, result))
+
+    @staticmethod
+    def __iter_result(result, rows) -> Iterator:
+        # El cursor se cierra aunque no se terminen de recorrer las filas.
+        try:
+            yield from rows
+        finally:
+            result.close()
+
+    def get_sales_page_by_filter(self, the_filter: SaleFilter, limit: int, after_id: int = None,
+                                 after_sort_key=None, product_loading: str = JOINED_PRODUCT) -> list:
+        """
+        Devuelve hasta limit ventas de the_filter en su orden, que se completa con el id
+        para que no haya empates. Si se indica after_id, la página empieza después de esa
+        venta, y after_sort_key debe ser su valor en la columna de orden, el que devuelve
+        the_filter.get_sort_key. Las ventas se buscan desde esa posición, así que pedir
+        una página no depende de cuántas ventas hay antes.
+        """
+        self.__check_quantity_is_positive(limit)
+        query = SaleRepository.__add_page_clauses(SaleRepository.__create_filter_query(the_filter, product_loading),
+                                                  the_filter,
+                                                  SaleRepository.__get_sort_column(the_filter),
+                                                  limit, after_id, after_sort_key)
+        return self.__session.scalars(query).all()
+
+    def get_sale_rows_by_filter(self, the_filter: SaleFilter) -> list:
+        """
+        Igual que get_sales_by_filter, pero devuelve filas de solo lectura, que se
+        crean mucho más rápido que las entidades del ORM.
+        """
+        query = SaleRepository.__add_row_order_by_clause(SaleRepository.__create_row_query(the_filter), the_filter)
+        return list(map(SaleRow._make, self.__session.execute(query)))
+
+    def get_sale_rows_page_by_filter(self, the_filter: SaleFilter, limit: int, after_id: int = None,
+                                     after_sort_key=None) -> list:
+        """
+        Igual que get_sales_page_by_filter, pero devuelve filas de solo lectura. El
+        valor de after_sort_key es el que devuelve the_filter.get_sort_key para una fila.
+        """
+        self.__check_quantity_is_positive(limit)
+        query = SaleRepository.__add_page_clauses(SaleRepository.__create_row_query(the_filter), the_filter,
+                                                  SaleRepository.__get_row_sort_column(the_filter),
+                                                  limit, after_id, after_sort_key)
+        return list(map(SaleRow._make, self.__session.execute(query)))
+
+    @staticmethod
+    def __add_page_clauses(query, the_filter: SaleFilter, sort_column, limit: int, after_id: int, after_sort_key):
+        if sort_column is Sale.id:
+            order_columns = (Sale.id,)
+            sort_key, after_key = Sale.id, after_id
+        else:
+            order_columns = (sort_column, Sale.id)
+            sort_key, after_key = tuple_(sort_column, Sale.id), (after_sort_key, after_id)
+
+        if after_id is not None:
+            query = query.where(sort_key > after_key if the_filter.ascending_order else sort_key < after_key)
+
+        if the_filter.ascending_order:
+            query = query.order_by(*map(lambda a_column: a_column.asc(), order_columns))
+        else:
+            query = query.order_by(*map(lambda a_column: a_column.desc(), order_columns))
+
+        return query.limit(limit)
+
+    @staticmethod
+    def __create_filter_query(the_filter: SaleFilter, product_loading: str):
+        query = select(Sale).options(SaleRepository.__get_product_loader_option(product_loading))\
+            .execution_options(populate_existing=True)
+        return SaleRepository.__add_filter_conditions(query, the_filter)
+
+    @staticmethod
+    def __get_product_loader_option(product_loading: str):
+        # Las ventas se usan fuera de la sesión que las cargó, así que el producto se
+        # carga junto con ellas: en la misma consulta o en una sola consulta aparte
+        # para todos los productos de la página.
+        if product_loading == SaleRepository.JOINED_PRODUCT:
+            return joinedload(Sale.product)
+        if product_loading == SaleRepository.SELECTIN_PRODUCT:
+            return selectinload(Sale.product)
+        if product_loading == SaleRepository.WITHOUT_PRODUCT:
+            return raiseload(Sale.product)
+        raise ValueError(f'Unknown product loading {product_loading}.')
+
     @staticmethod
-    def __create_filter_query(the_filter: SaleFilter):
-        query = select(Sale, )
+    def __create_row_query(the_filter: SaleFilter):
+        query = select(Sale.id, Sale.product_id, Product.name, Sale.date, Sale.quantity,
+                       as_amount(Sale.price), as_amount(Sale.cost))\
+            .join(Product, Product.id == Sale.product_id)
+        return SaleRepository.__add_filter_conditions(query, the_filter)
 
+    @staticmethod
+    def __add_filter_conditions(query, the_filter: SaleFilter):
         if the_filter.minimum_date is not None:
             query = query.where(Sale.date >= the_filter.minimum_date)
         if the_filter.maximum_date is not None:
@@ -249,7 +754,10 @@ class SaleRepository(RepositoryObserver):
         if the_filter.sale_id_list is not None:
             query = query.where(Sale.id.in_(the_filter.sale_id_list))
 
-        query = SaleRepository.__add_order_by_clause(query, the_filter)
+        if the_filter.minimum_quantity is not None:
+            query = query.where(Sale.quantity >= the_filter.minimum_quantity)
+        if the_filter.maximum_quantity is not None:
+            query = query.where(Sale.quantity <= the_filter.maximum_quantity)
 
         return query
 
@@ -258,35 +766,47 @@ class SaleRepository(RepositoryObserver):
         if the_filter.sorted_by is None:
             return query
 
-        column = None
-        is_money_column = False
+        column = SaleRepository.__get_sort_column(the_filter)
+
+        if the_filter.ascending_order:
+            column = column.asc()
+        else:
+            column = column.desc()
+
+        return query.order_by(column)
+
+    @staticmethod
+    def __add_row_order_by_clause(query, the_filter: SaleFilter):
+        if the_filter.sorted_by is None:
+            return query
 
-        if the_filter.sorted_by == SaleFilter.ID:
-            column = Sale.id
-        elif the_filter.sorted_by == SaleFilter.PRODUCT_ID:
+        column = SaleRepository.__get_row_sort_column(the_filter)
+        return query.order_by(column.asc() if the_filter.ascending_order else column.desc())
+
+    @staticmethod
+    def __get_sort_column(the_filter: SaleFilter):
+        column = Sale.id
+
+        if the_filter.sorted_by == SaleFilter.PRODUCT_ID:
             column = Sale.product_id
         elif the_filter.sorted_by == SaleFilter.SALE_DATE:
             column = Sale.date
-        elif the_filter.sorted_by == SaleFilter.PRODUCT_ID:
-            column = Sale.product_id
+        elif the_filter.sorted_by == SaleFilter.QUANTITY:
+            column = Sale.quantity
         elif the_filter.sorted_by == SaleFilter.PRICE:
             column = Sale.price
-            is_money_column = True
         elif the_filter.sorted_by == SaleFilter.COST:
             column = Sale.cost
-            is_money_column = True
         elif the_filter.sorted_by == SaleFilter.PROFIT:
-            column = cast(Sale.price, Float) - cast(Sale.cost, Float)
-            query = query.add_columns(column)
+            column = as_money(Sale.price - Sale.cost)
 
-        if is_money_column:
-            if the_filter.ascending_order:
-                return query.order_by(asc(cast(column, Numeric)))
-            return query.order_by(desc(cast(column, Numeric)))
+        return column
 
-        if the_filter.ascending_order:
-            column = column.asc()
-        else:
-            column = column.desc()
-
-        return query.order_by(column)
+    @staticmethod
+    def __get_row_sort_column(the_filter: SaleFilter):
+        # Las filas tienen los montos como Decimal, así que las columnas de dinero se
+        # comparan con el monto de la fila y no con Money.
+        column = SaleRepository.__get_sort_column(the_filter)
+        if isinstance(column.type, MoneyColumn):
+            return as_amount(column)
+        return column
@@ -1,44 +1,64 @@
 from datetime import date, timedelta
-from sqlalchemy import select, cast, FLOAT
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
-from model.entity.models import Product, Sale
+from model.entity.models import Product, DailyProductSales
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
+from model.repository.query_cache import QueryCache
 from sqlalchemy import func
 
-from model.util.monetary_types import CUPMoney
+from model.util.money_colum import as_money
 
 
 class SalesGroupedByProductRepository:
 
-    def __init__(self, session: Session):
+    # Los grupos tienen el nombre de cada producto.
+    __READ_TABLES = (QueryCache.SALES, QueryCache.PRODUCTS)
+
+    def __init__(self, session: Session, query_cache: QueryCache = None):
         self.__session: Session = session
+        self.__query_cache = query_cache if query_cache is not None else QueryCache(maximum_size=0)
 
     def get_groups_on_week(self, week_date: date) -> List[SalesGroupedByProduct]:
         monday_date = week_date - timedelta(days=week_date.weekday())
         sunday_date = week_date + timedelta(days=6 - week_date.weekday())
-        query = self.__construct_query_using_date_limits(monday_date, sunday_date)
-        rows = self.__session.execute(query).all()
-        return self.__construct_sale_groups_from_rows(rows, monday_date, sunday_date)
+        return self.__get_groups(monday_date, sunday_date)
+
+    def __get_groups(self, initial_date: date, final_date: date, product_id_list: List[int] = None) \
+            -> List[SalesGroupedByProduct]:
+        product_ids = tuple(product_id_list) if product_id_list is not None else None
+        groups = self.__query_cache.get_or_load(
+            ('sales_grouped_by_product', initial_date, final_date, product_ids), self.__READ_TABLES,
+            lambda: self.__read_groups(initial_date, final_date, product_id_list))
+        return list(groups)
+
+    def __read_groups(self, initial_date: date, final_date: date, product_id_list: List[int]) \
+            -> List[SalesGroupedByProduct]:
+        query = self.__construct_query_using_date_limits(initial_date, final_date)
+        if product_id_list is not None:
+            query = query.where(Product.id.in_(product_id_list))
+        rows = self.__session.execute(query)
+        return self.__construct_sale_groups_from_rows(rows, initial_date, final_date)
 
     @staticmethod
     def __construct_query_using_date_limits(initial_date: date, final_date: date):
-        acquired_money = func.sum(cast(Sale.price, FLOAT)).label('acquired_money')
-        total_cost = func.sum(cast(Sale.cost, FLOAT)).label('total_cost')
-        sale_quantity = func.count(Sale.id).label('sale_quantity')
+        # Se lee a lo sumo una fila por producto y día en lugar de una por venta.
+        acquired_money = as_money(func.sum(DailyProductSales.revenue)).label('acquired_money')
+        total_cost = as_money(func.sum(DailyProductSales.cost)).label('total_cost')
+        sale_quantity = func.sum(DailyProductSales.units).label('sale_quantity')
         query = select(Product.id, Product.name, acquired_money, total_cost, sale_quantity)\
-            .join(Sale, Product.id == Sale.product_id)\
-            .where(Sale.date >= initial_date)\
-            .where(Sale.date <= final_date)\
-            .group_by(Sale.product_id)
+            .join(DailyProductSales, Product.id == DailyProductSales.product_id)\
+            .where(DailyProductSales.date >= initial_date)\
+            .where(DailyProductSales.date <= final_date)\
+            .group_by(DailyProductSales.product_id)
         return query
 
     @staticmethod
     def __construct_sale_groups_from_rows(rows, initial_date: date, final_date: date) -> List[SalesGroupedByProduct]:
         groups = []
         for a_row in rows:
-            acquired_money = CUPMoney(str(a_row['acquired_money']))
-            total_cost = CUPMoney(str(a_row['total_cost']))
+            acquired_money = a_row['acquired_money']
+            total_cost = a_row['total_cost']
             total_profit = acquired_money - total_cost
             groups.append(SalesGroupedByProduct(
                 product_id=a_row[0],
@@ -55,9 +75,7 @@ class SalesGroupedByProductRepository:
     def get_groups_on_month(self, month_date: date) -> List[SalesGroupedByProduct]:
         month_first_date = date(year=month_date.year, month=month_date.month, day=1)
         month_last_date = self.__get_last_date_of_month(month_date)
-        query = self.__construct_query_using_date_limits(month_first_date, month_last_date)
-        rows = self.__session.execute(query)
-        return self.__construct_sale_groups_from_rows(rows, month_first_date, month_last_date)
+        return self.__get_groups(month_first_date, month_last_date)
 
     @staticmethod
     def __get_last_date_of_month(month_date: date):
@@ -74,13 +92,7 @@ class SalesGroupedByProductRepository:
     def get_groups_on_year(self, year_date: date) -> List[SalesGroupedByProduct]:
         year_first_date = date(year=year_date.year, month=1, day=1)
         year_last_date = date(year=year_date.year, month=12, day=31)
-        query = self.__construct_query_using_date_limits(year_first_date, year_last_date)
-        rows = self.__session.execute(query)
-        return self.__construct_sale_groups_from_rows(rows, year_first_date, year_last_date)
+        return self.__get_groups(year_first_date, year_last_date)
 
     def get_groups_on_date_range(self, initial_date: date, final_date: date, product_id_list: List[int] = None):
-        query = self.__construct_query_using_date_limits(initial_date, final_date)
-        if product_id_list is not None:
-            query = query.where(Product.id.in_(product_id_list))
-        rows = self.__session.execute(query)
-        return self.__construct_sale_groups_from_rows(rows, initial_date, final_date)
+        return self.__get_groups(initial_date, final_date, product_id_list)
@@ -0,0 +1,77 @@
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from model.entity.models import Ticket
+from model.entity.ticket_summary import TicketSummary
+from model.util.monetary_types import CUPMoney
+from model.util.money_colum import as_money
+
+
+class TicketRepository:
+
+    def __init__(self, session: Session):
+        self.__session = session
+
+    def get_tickets_on_date(self, a_date: date) -> list:
+        """
+        Devuelve los tickets de a_date ordenados por hora. Los que no tienen hora van
+        primero.
+        """
+        return self.__session.scalars(
+            select(Ticket)
+            .where(Ticket.date == a_date)
+            .order_by(Ticket.created_at, Ticket.id)
+            .execution_options(populate_existing=True)
+        ).all()
+
+    def get_ticket_summaries_by_day(self, initial_date: date, final_date: date) -> list:
+        """
+        Devuelve un TicketSummary por cada día entre initial_date y final_date,
+        ordenados por fecha. Los días sin tickets se devuelven con valores en cero.
+        """
+        rows = self.__get_rows_grouped_by(Ticket.date, Ticket.date >= initial_date, Ticket.date <= final_date)
+        rows_by_day = {a_row[0]: a_row for a_row in rows}
+
+        summaries = []
+        a_date = initial_date
+        while a_date <= final_date:
+            initial_time, final_time = self.__get_day_limits(a_date, a_date)
+            summaries.append(self.__construct_ticket_summary(initial_time, final_time, rows_by_day.get(a_date)))
+            a_date += timedelta(days=1)
+        return summaries
+
+    def get_ticket_summaries_by_hour(self, a_date: date) -> list:
+        """
+        Devuelve los 24 TicketSummary de las horas de a_date, ordenados por hora. Los
+        tickets sin hora no cuentan en ninguna.
+        """
+        hour = func.strftime('%H', Ticket.created_at)
+        initial_time, final_time = self.__get_day_limits(a_date, a_date)
+        rows = self.__get_rows_grouped_by(hour, Ticket.created_at >= initial_time, Ticket.created_at < final_time)
+        rows_by_hour = {int(a_row[0]): a_row for a_row in rows}
+
+        return [self.__construct_ticket_summary(initial_time + timedelta(hours=an_hour),
+                                                initial_time + timedelta(hours=an_hour + 1),
+                                                rows_by_hour.get(an_hour))
+                for an_hour in range(24)]
+
+    @staticmethod
+    def __get_day_limits(initial_date: date, final_date: date) -> tuple:
+        return datetime.combine(initial_date, time()), datetime.combine(final_date + timedelta(days=1), time())
+
+    def __get_rows_grouped_by(self, period, *conditions) -> list:
+        # Los índices ix_tickets_date e ix_tickets_created_at incluyen el total, así que la
+        # consulta no lee la tabla.
+        return self.__session.execute(
+            select(period, func.count(Ticket.id), as_money(func.sum(Ticket.total)))
+            .where(*conditions)
+            .group_by(period)
+        ).all()
+
+    @staticmethod
+    def __construct_ticket_summary(initial_time: datetime, final_time: datetime, row) -> TicketSummary:
+        if row is None:
+            return TicketSummary(initial_time, final_time, 0, CUPMoney('0.00'))
+        return TicketSummary(initial_time, final_time, row[1], row[2])
@@ -0,0 +1,155 @@
+"""
+Reconstruye y verifica las tablas de resumen y los totales de los tickets que los
+repositorios mantienen al modificar las ventas y los gastos.
+
+Uso, desde la raíz del proyecto:
+
+    python -m model.rollup verify [--database RUTA]
+    python -m model.rollup rebuild [--database RUTA]
+"""
+import argparse
+import sys
+
+from sqlalchemy import select, func, delete, insert, update, exists
+from sqlalchemy.engine import Connection
+
+from model.connection import create_database_engine
+from model.entity.models import Sale, DailyProductSales, Expense, DailyExpenseTotal, Ticket
+from model.migration import upgrade_database
+from model.util.money_colum import as_money
+
+
+def __select_daily_product_sales_from_sales():
+    return select(
+        Sale.date,
+        Sale.product_id,
+        func.sum(Sale.quantity),
+        as_money(func.sum(Sale.price * Sale.quantity)),
+        as_money(func.sum(Sale.cost * Sale.quantity))
+    ).group_by(Sale.date, Sale.product_id)
+
+
+def rebuild_daily_product_sales(connection: Connection):
+    connection.execute(delete(DailyProductSales))
+    connection.execute(
+        insert(DailyProductSales).from_select(
+            ['date', 'product_id', 'units', 'revenue', 'cost'],
+            __select_daily_product_sales_from_sales()
+        )
+    )
+
+
+def verify_daily_product_sales(connection: Connection) -> list:
+    """
+    Devuelve, ordenados, los pares (fecha, id de producto) cuyos valores en
+    daily_product_sales no coinciden con los calculados desde la tabla sales.
+    """
+    expected_rows = __map_rows_by_key(connection.execute(__select_daily_product_sales_from_sales()))
+    stored_rows = __map_rows_by_key(connection.execute(
+        select(DailyProductSales.date, DailyProductSales.product_id, DailyProductSales.units,
+               DailyProductSales.revenue, DailyProductSales.cost)
+    ))
+
+    return sorted(filter(lambda a_key: expected_rows.get(a_key) != stored_rows.get(a_key),
+                         expected_rows.keys() | stored_rows.keys()))
+
+
+def __map_rows_by_key(rows) -> dict:
+    return {(a_row[0], a_row[1]): tuple(a_row[2:]) for a_row in rows}
+
+
+def __select_daily_expense_totals_from_expenses():
+    return select(Expense.date, as_money(func.sum(Expense.spent_money))).group_by(Expense.date)
+
+
+def rebuild_daily_expense_totals(connection: Connection):
+    connection.execute(delete(DailyExpenseTotal))
+    connection.execute(
+        insert(DailyExpenseTotal).from_select(['date', 'spent_money'], __select_daily_expense_totals_from_expenses())
+    )
+
+
+def verify_daily_expense_totals(connection: Connection) -> list:
+    """
+    Devuelve, ordenadas, las fechas cuyo total en daily_expense_totals no coincide
+    con la suma de los gastos de ese día.
+    """
+    expected_totals = dict(connection.execute(__select_daily_expense_totals_from_expenses()).all())
+    stored_totals = dict(connection.execute(select(DailyExpenseTotal.date, DailyExpenseTotal.spent_money)).all())
+
+    return sorted(filter(lambda a_date: expected_totals.get(a_date) != stored_totals.get(a_date),
+                         expected_totals.keys() | stored_totals.keys()))
+
+
+def __select_ticket_totals_from_sales():
+    return select(Sale.ticket_id, as_money(func.sum(Sale.price * Sale.quantity)))\
+        .where(Sale.ticket_id.isnot(None))\
+        .group_by(Sale.ticket_id)
+
+
+def rebuild_ticket_totals(connection: Connection):
+    connection.execute(delete(Ticket).where(~exists().where(Sale.ticket_id == Ticket.id)))
+    connection.execute(update(Ticket).values(
+        total=select(func.sum(Sale.price * Sale.quantity)).where(Sale.ticket_id == Ticket.id).scalar_subquery()
+    ))
+
+
+def verify_ticket_totals(connection: Connection) -> list:
+    """
+    Devuelve, ordenados, los ids de los tickets cuyo total no coincide con la suma
+    de sus ventas, incluidos los tickets que se quedaron sin ventas.
+    """
+    expected_totals = dict(connection.execute(__select_ticket_totals_from_sales()).all())
+    stored_totals = dict(connection.execute(select(Ticket.id, Ticket.total)).all())
+
+    return sorted(filter(lambda a_ticket_id: expected_totals.get(a_ticket_id) != stored_totals.get(a_ticket_id),
+                         expected_totals.keys() | stored_totals.keys()))
+
+
+def rebuild_rollups(connection: Connection):
+    rebuild_daily_product_sales(connection)
+    rebuild_daily_expense_totals(connection)
+    rebuild_ticket_totals(connection)
+
+
+def verify_rollups(connection: Connection) -> dict:
+    """
+    Devuelve un diccionario con el nombre de cada tabla de resumen y la lista de
+    claves inconsistentes encontradas en ella.
+    """
+    return {
+        DailyProductSales.__tablename__: verify_daily_product_sales(connection),
+        DailyExpenseTotal.__tablename__: verify_daily_expense_totals(connection),
+        Ticket.__tablename__: verify_ticket_totals(connection),
+    }
+
+
+def main(arguments: list = None) -> int:
+    # La fábrica crea la carpeta de la aplicación al importarse.
+    from model.repository.factory import DB_URL
+
+    parser = argparse.ArgumentParser(prog='python -m model.rollup',
+                                     description='Reconstruye o verifica las tablas de resumen de ventas y gastos.')
+    parser.add_argument('command', choices=('verify', 'rebuild'))
+    parser.add_argument('--database', help='ruta del archivo de la base de datos')
+    parsed_arguments = parser.parse_args(arguments)
+
+    url = DB_URL if parsed_arguments.database is None else f'sqlite:///{parsed_arguments.database}'
+    engine = create_database_engine(url)
+    upgrade_database(engine)
+    with engine.begin() as connection:
+        if parsed_arguments.command == 'rebuild':
+            rebuild_rollups(connection)
+        inconsistencies = verify_rollups(connection)
+    engine.dispose()
+
+    for table_name, keys in inconsistencies.items():
+        print(f'{table_name}: {len(keys)} filas inconsistentes')
+        for a_key in keys:
+            print('    ' + ', '.join(map(str, a_key if isinstance(a_key, tuple) else (a_key,))))
+
+    return 1 if any(inconsistencies.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
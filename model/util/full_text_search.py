@@ -0,0 +1,107 @@
+import re
+import unicodedata
+
+from sqlalchemy import table, column, Integer, false
+
+# Igual que el tokenizador unicode61 de SQLite: las palabras son secuencias de
+# letras y números, y el guion bajo separa palabras.
+__WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+class FullTextSearchIndex:
+    """
+    Tabla virtual FTS5 que indexa columnas de texto de otra tabla sin copiar su
+    contenido. Los triggers que crea get_create_statements la mantienen al día al
+    insertar, actualizar o eliminar filas de la tabla indexada.
+    """
+
+    def __init__(self, content_table_name: str, column_names: tuple):
+        self.__content_table_name = content_table_name
+        self.__column_names = column_names
+        self.__name = '{}_fts'.format(content_table_name)
+        self.__table = table(self.__name, column('rowid', Integer), column('rank'), column(self.__name))
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def search(self, statement, id_column, query: str):
+        """
+        Limita statement a las filas cuyo id_column coincide con la consulta FTS5
+        query y las ordena de la más a la menos relevante. Una consulta vacía, como la
+        de una frase sin palabras, no coincide con ninguna fila.
+        """
+        if query == '':
+            return statement.where(false())
+
+        return statement\
+            .join(self.__table, self.__table.c.rowid == id_column)\
+            .where(self.__table.c[self.__name].match(query))\
+            .order_by(self.__table.c.rank, id_column)
+
+    def get_create_statements(self) -> list:
+        columns = ', '.join(self.__column_names)
+        new_values = ', '.join(map('new.{}'.format, self.__column_names))
+        old_values = ', '.join(map('old.{}'.format, self.__column_names))
+        insert_new_values = 'INSERT INTO {0} (rowid, {1}) VALUES (new.id, {2});'\
+            .format(self.__name, columns, new_values)
+        delete_old_values = "INSERT INTO {0} ({0}, rowid, {1}) VALUES ('delete', old.id, {2});"\
+            .format(self.__name, columns, old_values)
+
+        return [
+            "CREATE VIRTUAL TABLE {} USING fts5({}, content='{}', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')".format(self.__name, columns, self.__content_table_name),
+            'CREATE TRIGGER {0}_after_insert AFTER INSERT ON {1} BEGIN {2} END'
+            .format(self.__name, self.__content_table_name, insert_new_values),
+            'CREATE TRIGGER {0}_after_delete AFTER DELETE ON {1} BEGIN {2} END'
+            .format(self.__name, self.__content_table_name, delete_old_values),
+            'CREATE TRIGGER {0}_after_update AFTER UPDATE OF {1} ON {2} BEGIN {3} {4} END'
+            .format(self.__name, columns, self.__content_table_name, delete_old_values, insert_new_values),
+        ]
+
+    def get_rebuild_statement(self) -> str:
+        return "INSERT INTO {0} ({0}) VALUES ('rebuild')".format(self.__name)
+
+
+def get_words(text: str) -> list:
+    """
+    Devuelve las palabras de text en minúsculas y sin tildes, como las guarda el
+    índice de búsqueda.
+    """
+    if text is None:
+        return []
+    decomposed_text = unicodedata.normalize('NFKD', text)
+    text_without_marks = ''.join(filter(lambda char: not unicodedata.combining(char), decomposed_text))
+    return __WORD_PATTERN.findall(text_without_marks.casefold())
+
+
+def is_blank_phrase(phrase: str) -> bool:
+    """
+    Indica si phrase no tiene ningún carácter aparte de espacios. Una frase así no
+    limita la búsqueda, a diferencia de una que solo tiene signos de puntuación.
+    """
+    return phrase is None or phrase.strip() == ''
+
+
+def create_prefix_query(phrase: str, column_name: str = None) -> str:
+    """
+    Crea una consulta FTS5 que encuentra las filas que tienen, para cada palabra de
+    phrase, alguna palabra que empiece por ella. Si se indica column_name, solo se
+    busca en esa columna. Devuelve una cadena vacía si phrase no tiene palabras.
+    """
+    column_filter = '' if column_name is None else '{} : '.format(column_name)
+    return ' '.join(map(lambda word: '{}"{}"*'.format(column_filter, word), get_words(phrase)))
+
+
+def match_prefix_query(phrase: str, *texts: str) -> bool:
+    """
+    Hace en Python la misma comprobación que la consulta de create_prefix_query
+    sobre las columnas con los textos indicados.
+    """
+    phrase_words = get_words(phrase)
+    if len(phrase_words) == 0:
+        return is_blank_phrase(phrase)
+
+    text_words = [a_word for a_text in texts for a_word in get_words(a_text)]
+    return all(any(map(lambda text_word: text_word.startswith(a_word), text_words))
+               for a_word in phrase_words)
@@ -1,5 +1,29 @@
+from decimal import Decimal, ROUND_HALF_UP
 from money import Money
 
 
 def CUPMoney(amount: str) -> Money:
     return Money(amount=amount, currency='CUP')
+
+
+def money_to_cents(money: Money) -> int:
+    return amount_to_cents(money.amount)
+
+
+def amount_to_cents(amount: Decimal) -> int:
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def cents_to_money(cents: int) -> Money:
+    return Money(amount=cents_to_amount(cents), currency='CUP')
+
+
+def cents_to_amount(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def format_amount(amount: Decimal) -> str:
+    """
+    Escribe el monto como lo hace Money, con dos decimales y comas entre los miles.
+    """
+    return '{:,.2f}'.format(amount)
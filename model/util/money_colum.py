@@ -1,22 +1,73 @@
-from sqlalchemy import TypeDecorator, Text
+from decimal import Decimal
+
+from sqlalchemy import TypeDecorator, Integer, type_coerce
 from money import Money
 
+from model.util.monetary_types import money_to_cents, cents_to_money, amount_to_cents, cents_to_amount
+
 
 class MoneyColumn(TypeDecorator):
+    """
+    Guarda el dinero como un número entero de centavos. Así las sumas, los rangos y
+    los ordenamientos se hacen en SQL de forma nativa y exacta.
+    """
 
-    impl = Text
+    impl = Integer
 
     cache_ok = True
 
     def process_bind_param(self, money: Money, dialect):
-        return '{}'.format(money.amount)
+        if money is None:
+            return None
 
-    def process_result_value(self, money_as_str: str, dialect) -> Money:
-        if money_as_str is None:
+        return money_to_cents(money)
+
+    def process_result_value(self, cents: int, dialect) -> Money:
+        if cents is None:
             return None
 
-        return Money(money_as_str, 'CUP')
+        return cents_to_money(cents)
 
     def copy(self, **kw):
         return MoneyColumn()
 
+
+def as_money(expression):
+    """
+    Hace que una expresión SQL calculada a partir de columnas de dinero, como
+    una suma o una resta, se lea y se compare como dinero.
+    """
+    return type_coerce(expression, MoneyColumn())
+
+
+class MoneyAmountColumn(TypeDecorator):
+    """
+    Lee una columna de dinero como el monto Decimal, sin crear un objeto Money. Lo
+    usan las consultas de solo lectura que devuelven muchas filas.
+    """
+
+    impl = Integer
+
+    cache_ok = True
+
+    def process_bind_param(self, amount: Decimal, dialect):
+        if amount is None:
+            return None
+
+        return amount_to_cents(amount)
+
+    def process_result_value(self, cents: int, dialect) -> Decimal:
+        if cents is None:
+            return None
+
+        return cents_to_amount(cents)
+
+    def copy(self, **kw):
+        return MoneyAmountColumn()
+
+
+def as_amount(expression):
+    """
+    Hace que una expresión SQL de dinero se lea y se compare como un monto Decimal.
+    """
+    return type_coerce(expression, MoneyAmountColumn())
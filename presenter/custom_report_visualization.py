@@ -3,19 +3,19 @@ from typing import List
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
-from model.entity.models import Expense
+from model.entity.rows import ExpenseRow
 from model.report.custom import CustomSaleReport
-from model.report.generators import generate_pdf_file, generate_html_file
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
 from model.report.statistics import ReportStatistic
 from model.repository.factory import RepositoryFactory
 from presenter.expenses_visualization import ExpensesVisualizationPresenter
+from presenter.util.report_exporter import ReportExporter, ReportExportingPresenter
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.custom_report_visualization import CustomReportVisualizationView
 from model.report.generators import DirectoryPermissionError
 
 
-class CustomReportVisualizationPresenter(AbstractPresenter):
+class CustomReportVisualizationPresenter(ReportExportingPresenter, AbstractPresenter):
 
     INITIAL_DATE_DATA = 'initial_date_data'
     FINAL_DATE_DATA = 'final_date_data'
@@ -36,8 +36,20 @@ class CustomReportVisualizationPresenter(AbstractPresenter):
         self.__description = self._get_intent_data()[self.REPORT_DESCRIPTION_DATA]
         self.__custom_report: CustomSaleReport = None
         self.__sale_groups: List[SalesGroupedByProduct] = []
-        self.__expenses: List[Expense] = []
+        self.__expenses: List[ExpenseRow] = []
         self.__report_statistic: ReportStatistic = None
+        self.thread: PresenterThreadWorker = None
+        self.__initialize_report_exporter()
+
+    def __initialize_report_exporter(self):
+        self.report_exporter = ReportExporter()
+        self.report_exporter.when_started.connect(self.__disable_gui_and_show_exporting_message)
+        self.report_exporter.when_finished.connect(lambda: self.get_view().set_state_bar_hidden(True))
+        self.report_exporter.when_finished.connect(lambda: self.get_view().disable_all_gui(False))
+        self.report_exporter.finished_without_error.connect(
+            lambda: self.get_view().show_success_toast_message('Reporte exportado')
+        )
+        self.report_exporter.error_found.connect(self.__handle_export_report_errors)
 
     def close_presenter(self):
         self._close_this_presenter()
@@ -73,9 +85,10 @@ class CustomReportVisualizationPresenter(AbstractPresenter):
                                         sale_repository=self.__sale_repo,
                                         expense_repo=self.__expense_repo,
                                         grouped_sales_repo=self.__sale_group_repo)
-        self.__sale_groups = self.__custom_report.get_sales_grouped_by_product()
-        self.__expenses = self.__custom_report.get_expenses()
-        self.__report_statistic = self.__custom_report.get_report_statistics()
+        snapshot = self.__custom_report.get_snapshot()
+        self.__sale_groups = snapshot.sale_groups
+        self.__expenses = snapshot.expenses
+        self.__report_statistic = snapshot.statistic
 
     def __disable_gui_and_show_creating_report_message(self):
         self.get_view().disable_all_gui(True)
@@ -119,11 +132,11 @@ class CustomReportVisualizationPresenter(AbstractPresenter):
         self.__path, self.__file_type = self.get_view().ask_user_to_save_report_as(suggested_filename)
         
         if self.__path or self.__file_type:
-            self.__execute_thread_to_generate_report_file()
+            self.__export_report_file()
 
     def __suggested_report_filename_using_date(self) -> str:
-        initial_date = self.__custom_report.get_report_statistics().initial_date()
-        final_date = self.__custom_report.get_report_statistics().final_date()
+        initial_date = self.__report_statistic.initial_date()
+        final_date = self.__report_statistic.final_date()
         if self.__name == '':
             return 'Reporte ventas {}-{}-{}  {}-{}-{}'.format(
                 initial_date.year,
@@ -136,27 +149,8 @@ class CustomReportVisualizationPresenter(AbstractPresenter):
         else:
             return 'Reporte {}'.format(self.__name)
 
-    def __execute_thread_to_generate_report_file(self):
-        self.thread = PresenterThreadWorker(self.__export_report_to_specified_path)
-        self.thread.when_started.connect(self.__disable_gui_and_show_exporting_message)
-        self.thread.when_finished.connect(lambda: self.get_view().set_state_bar_hidden(True))
-        self.thread.when_finished.connect(lambda: self.get_view().disable_all_gui(False))
-        self.thread.finished_without_error.connect(
-            lambda: self.get_view().show_success_toast_message('Reporte exportado')
-        )
-        self.thread.error_found.connect(self.__handle_export_report_errors)
-        self.thread.start()
-
-    def __export_report_to_specified_path(self, thread: PresenterThreadWorker):
-        try:
-            if 'pdf' in self.__file_type:
-                generate_pdf_file(Path(self.__path), self.__custom_report)
-            elif 'html' in self.__file_type:
-                generate_html_file(Path(self.__path), self.__custom_report)
-
-            thread.finished_without_error.emit()
-        except DirectoryPermissionError as error:
-            thread.error_found.emit(error)
+    def __export_report_file(self):
+        self.report_exporter.export(self.__custom_report, Path(self.__path), self.__file_type)
 
     def __disable_gui_and_show_exporting_message(self):
         self.get_view().disable_all_gui(True)
@@ -4,18 +4,18 @@ from typing import List
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
-from model.entity.models import Sale
+from model.entity.rows import SaleRow
 from model.report.day import DaySaleReport
-from model.report.generators import generate_pdf_file, generate_html_file
 from model.report.statistics import ReportStatistic
 from model.repository.factory import RepositoryFactory
 from presenter.expenses_visualization import ExpensesVisualizationPresenter
+from presenter.util.report_exporter import ReportExporter, ReportExportingPresenter
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.day_report import DaySaleReportView
 from model.report.generators import DirectoryPermissionError
 
 
-class DaySaleReportPresenter(AbstractPresenter):
+class DaySaleReportPresenter(ReportExportingPresenter, AbstractPresenter):
 
     def _on_initialize(self):
         self.__initialize_view()
@@ -23,13 +23,24 @@ class DaySaleReportPresenter(AbstractPresenter):
         self.__expense_repo = RepositoryFactory.get_expense_repository()
         self.__grouped_sales_repo = RepositoryFactory.get_sales_grouped_by_product_repository()
         self.__day_report:DaySaleReport = None
-        self.__sales: List[Sale] = None
+        self.__sales: List[SaleRow] = None
         self.__report_statistic: ReportStatistic = None
+        self.thread: PresenterThreadWorker = None
+        self.__initialize_report_exporter()
 
     def __initialize_view(self):
         view = DaySaleReportView(self)
         self._set_view(view)
 
+    def __initialize_report_exporter(self):
+        self.report_exporter = ReportExporter()
+        self.report_exporter.when_started.connect(self.__disable_gui_and_show_exporting_message)
+        self.report_exporter.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
+        self.report_exporter.error_found.connect(self.__handle_errors)
+        self.report_exporter.finished_without_error.connect(
+            lambda: self.get_view().show_success_toast_message('Reporte exportado')
+        )
+
     def close_presenter(self):
         self._close_this_presenter()
 
@@ -56,9 +67,9 @@ class DaySaleReportPresenter(AbstractPresenter):
                                           expense_repo=self.__expense_repo,
                                           grouped_sales_repo=self.__grouped_sales_repo
                                           )
-        self.__sales = self.__day_report.get_sales()
-        self.__expenses = self.__day_report.get_expenses()
-        self.__report_statistic = self.__day_report.get_report_statistics()
+        snapshot, self.__sales = self.__day_report.read_snapshot_and_sale_rows()
+        self.__expenses = snapshot.expenses
+        self.__report_statistic = snapshot.statistic
 
     def __disable_gui_and_show_processing_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -70,17 +81,18 @@ class DaySaleReportPresenter(AbstractPresenter):
             self.__insert_sale_on_table(a_sale)
         self.get_view().resize_table_columns_to_contents()
 
-    def __insert_sale_on_table(self, sale: Sale):
+    def __insert_sale_on_table(self, sale: SaleRow):
         view = self.get_view()
         view.add_empty_row_at_the_end_of_table()
         row = view.get_last_table_row_index()
 
         view.set_cell_on_table(row, DaySaleReportView.SALE_ID_COLUMN, str(sale.id))
-        view.set_cell_on_table(row, DaySaleReportView.PRODUCT_NAME_COLUMN, str(sale.product.name))
-        view.set_cell_on_table(row, DaySaleReportView.PRODUCT_ID_COLUMN, str(sale.product.id))
-        view.set_cell_on_table(row, DaySaleReportView.SALE_PRICE_COLUMN, str(sale.price))
-        view.set_cell_on_table(row, DaySaleReportView.SALE_COST_COLUMN, str(sale.cost))
-        view.set_cell_on_table(row, DaySaleReportView.SALE_PROFIT_COLUMN, str(sale.profit))
+        view.set_cell_on_table(row, DaySaleReportView.PRODUCT_NAME_COLUMN, str(sale.product_name))
+        view.set_cell_on_table(row, DaySaleReportView.PRODUCT_ID_COLUMN, str(sale.product_id))
+        view.set_cell_on_table(row, DaySaleReportView.SALE_QUANTITY_COLUMN, str(sale.quantity))
+        view.set_cell_on_table(row, DaySaleReportView.SALE_PRICE_COLUMN, str(sale.total_price))
+        view.set_cell_on_table(row, DaySaleReportView.SALE_COST_COLUMN, str(sale.total_cost))
+        view.set_cell_on_table(row, DaySaleReportView.SALE_PROFIT_COLUMN, str(sale.total_profit))
 
     def __set_report_statistics(self):
         self.get_view().set_report_day(self.__report_statistic.initial_date())
@@ -100,7 +112,7 @@ class DaySaleReportPresenter(AbstractPresenter):
         self.__path, self.__file_type = self.get_view().ask_user_to_save_report_as(suggested_filename)
         
         if self.__path or self.__file_type:
-            self.__execute_thread_to_generate_report_file()
+            self.__export_report_file()
 
     def __suggested_report_filename_using_date(self) -> str:
         report_date = self.get_view().get_date()
@@ -110,27 +122,8 @@ class DaySaleReportPresenter(AbstractPresenter):
             report_date.day
         )
 
-    def __execute_thread_to_generate_report_file(self):
-        self.thread = PresenterThreadWorker(self.__export_report_to_specified_path)
-        self.thread.when_started.connect(self.__disable_gui_and_show_exporting_message)
-        self.thread.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
-        self.thread.error_found.connect(self.__handle_errors)
-        self.thread.finished_without_error.connect(
-            lambda: self.get_view().show_success_toast_message('Reporte exportado')
-        )
-        self.thread.start()
-
-    def __export_report_to_specified_path(self, thread: PresenterThreadWorker):
-        try:
-            if 'pdf' in self.__file_type:
-                generate_pdf_file(Path(self.__path), self.__day_report)
-            elif 'html' in self.__file_type:
-                generate_html_file(Path(self.__path), self.__day_report)
-
-            thread.finished_without_error.emit()
-        
-        except DirectoryPermissionError as error:
-            thread.error_found.emit(error)
+    def __export_report_file(self):
+        self.report_exporter.export(self.__day_report, Path(self.__path), self.__file_type)
 
     def __disable_gui_and_show_exporting_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -36,6 +36,8 @@ class EditSalePresenter(AbstractPresenter):
         view.set_sale_id(self.__sale.id)
         view.set_paid_money(float(self.__sale.price.amount))
         view.set_cost_money(float(self.__sale.cost.amount))
+        view.set_maximum_sale_quantity(self.__sale.quantity + self.__sale.product.quantity)
+        view.set_sale_quantity(self.__sale.quantity)
         view.set_sale_date(self.__sale.date)
 
     def close_presenter(self):
@@ -61,6 +63,7 @@ class EditSalePresenter(AbstractPresenter):
             product_id=self.__sale.product_id,
             price=CUPMoney(self.get_view().get_paid_money_as_str()),
             cost=CUPMoney(self.get_view().get_cost_money_as_str()),
+            quantity=self.get_view().get_sale_quantity(),
             date=self.get_view().get_sale_date()
         )
 
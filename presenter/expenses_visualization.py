@@ -1,6 +1,6 @@
 from easy_mvp.abstract_presenter import AbstractPresenter
 
-from model.entity.models import Expense
+from model.entity.rows import ExpenseRow
 from view.expenses_visualization import ExpensesVisualizationView
 
 
@@ -36,12 +36,12 @@ class ExpensesVisualizationPresenter(AbstractPresenter):
             self.__add_expense_to_table(an_expense)
         self.get_view().resize_table_columns_to_contents()
 
-    def __add_expense_to_table(self, an_expense: Expense):
+    def __add_expense_to_table(self, an_expense: ExpenseRow):
         self.get_view().add_empty_row_at_the_end_of_table()
         row = self.get_view().get_last_row_index()
         self.__set_table_row_by_expense(row, an_expense)
 
-    def __set_table_row_by_expense(self, row: int, an_expense: Expense):
+    def __set_table_row_by_expense(self, row: int, an_expense: ExpenseRow):
         view = self.get_view()
         view.set_cell_in_table(row, ExpensesVisualizationView.ID_COLUMN, an_expense.id)
         view.set_cell_in_table(row, ExpensesVisualizationView.NAME_COLUMN, an_expense.name)
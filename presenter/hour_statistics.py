@@ -0,0 +1,60 @@
+from datetime import date
+
+from easy_mvp.abstract_presenter import AbstractPresenter
+
+from model.entity.sales_heatmap import SalesHeatmap, WEEKDAY_QUANTITY, HOUR_QUANTITY
+from model.repository.factory import RepositoryFactory
+from presenter.util.thread_worker import PresenterThreadWorker
+from view.hour_statistics import HourStatisticsView
+
+
+class HourStatisticsPresenter(AbstractPresenter):
+
+    def _on_initialize(self):
+        self._set_view(HourStatisticsView(self))
+        self.__initial_date: date = None
+        self.__final_date: date = None
+        self.__sale_repo = RepositoryFactory.get_sale_repository()
+        self.__heatmap: SalesHeatmap = None
+
+    def close_presenter(self):
+        self._close_this_presenter()
+
+    def get_default_window_title(self) -> str:
+        return 'Blue POS - Estadísticas por Hora'
+
+    def calculate_sales_heatmap(self):
+        self.__initial_date, self.__final_date = self.get_view().get_selected_date_range()
+        self.thread = PresenterThreadWorker(self.__load_sales_heatmap)
+
+        self.thread.when_started.connect(lambda: self.get_view().disable_gui(True))
+        self.thread.when_started.connect(lambda: self.get_view().set_status_bar_message('Calculando...'))
+
+        self.thread.when_finished.connect(self.__plot_heatmap)
+        self.thread.when_finished.connect(lambda: self.get_view().disable_gui(False))
+        self.thread.when_finished.connect(lambda: self.get_view().set_status_bar_message(''))
+
+        self.thread.start()
+
+    def __load_sales_heatmap(self, thread: PresenterThreadWorker):
+        self.__heatmap = self.__sale_repo.get_sales_heatmap(self.__initial_date, self.__final_date)
+
+    def __plot_heatmap(self):
+        self.change_shown_values_and_plot(self.get_view().get_shown_values_option())
+
+    def change_shown_values_and_plot(self, selected_option: str):
+        if self.__heatmap is None:
+            return
+
+        if selected_option == HourStatisticsView.ACQUIRED_MONEY_ITEM:
+            get_value = lambda weekday, hour: float(self.__heatmap.get_acquired_money(weekday, hour).amount)
+        else:
+            get_value = self.__heatmap.get_units
+
+        values = [[get_value(weekday, hour) for weekday in range(WEEKDAY_QUANTITY)] for hour in range(HOUR_QUANTITY)]
+        self.get_view().plot_values(values)
+
+    def create_tool_tip_for_cell(self, weekday: int, hour: int) -> str:
+        return f'{HourStatisticsView.WEEKDAY_NAMES[weekday]} de {hour}:00 a {hour}:59\n\n' \
+               f'Unidades vendidas: {self.__heatmap.get_units(weekday, hour)}\n' \
+               f'Dinero obtenido:   {self.__heatmap.get_acquired_money(weekday, hour).amount} CUP'
@@ -1,14 +1,15 @@
 from PyQt5.QtWidgets import QApplication
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
-from sqlalchemy import create_engine
-from model.entity.models import Base
+from model.connection import create_database_engine
+from model.migration import upgrade_database
 from model.repository.factory import DB_URL
 from presenter.about import AboutPresenter
 from presenter.custom_report import CustomSaleReportPresenter
 from presenter.day_report import DaySaleReportPresenter
 from presenter.expense_management import ExpenseManagementPresenter
 from presenter.month_report import MonthSaleReportPresenter
+from presenter.hour_statistics import HourStatisticsPresenter
 from presenter.month_statistics import MonthStatisticsPresenter
 from presenter.product_management import ProductManagementPresenter
 from presenter.week_report import WeekSaleReportPresenter
@@ -32,8 +33,9 @@ class MainPresenter(AbstractPresenter):
 
     @staticmethod
     def __create_database():
-        engine = create_engine(DB_URL, future=True)
-        Base.metadata.create_all(engine)
+        engine = create_database_engine(DB_URL, future=True)
+        upgrade_database(engine)
+        engine.dispose()
 
     @staticmethod
     def __set_app_style():
@@ -84,3 +86,7 @@ class MainPresenter(AbstractPresenter):
     def open_month_statistics_presenter(self):
         intent = Intent(MonthStatisticsPresenter)
         self._open_other_presenter(intent)
+
+    def open_hour_statistics_presenter(self):
+        intent = Intent(HourStatisticsPresenter)
+        self._open_other_presenter(intent)
@@ -5,19 +5,19 @@ from typing import List
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
-from model.entity.models import Expense
-from model.report.generators import generate_pdf_file, generate_html_file
+from model.entity.rows import ExpenseRow
 from model.report.month import MonthSaleReport
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
 from model.report.statistics import ReportStatistic
 from model.repository.factory import RepositoryFactory
 from presenter.expenses_visualization import ExpensesVisualizationPresenter
+from presenter.util.report_exporter import ReportExporter, ReportExportingPresenter
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.month_report import MonthSaleReportView
 from model.report.generators import DirectoryPermissionError
 
 
-class MonthSaleReportPresenter(AbstractPresenter):
+class MonthSaleReportPresenter(ReportExportingPresenter, AbstractPresenter):
 
     def _on_initialize(self):
         self._set_view(MonthSaleReportView(self))
@@ -26,7 +26,18 @@ class MonthSaleReportPresenter(AbstractPresenter):
         self.__grouped_sale_repo = RepositoryFactory.get_sales_grouped_by_product_repository()
         self.__grouped_sales: List[SalesGroupedByProduct] = None
         self.__report_statistic: ReportStatistic = None
-        self.__expenses: List[Expense] = None
+        self.__expenses: List[ExpenseRow] = None
+        self.thread: PresenterThreadWorker = None
+        self.__initialize_report_exporter()
+
+    def __initialize_report_exporter(self):
+        self.report_exporter = ReportExporter()
+        self.report_exporter.when_started.connect(self.__disable_gui_and_show_exporting_message)
+        self.report_exporter.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
+        self.report_exporter.error_found.connect(self.__handle_export_report_errors)
+        self.report_exporter.finished_without_error.connect(
+            lambda: self.get_view().show_success_toast_message('Reporte exportado')
+        )
 
     def close_presenter(self):
         self._close_this_presenter()
@@ -51,9 +62,10 @@ class MonthSaleReportPresenter(AbstractPresenter):
                                               sale_repository=self.__sale_repo,
                                               expense_repo=self.__expense_repo,
                                               grouped_sales_repo=self.__grouped_sale_repo)
-        self.__grouped_sales = self.__month_report.get_sales_grouped_by_product()
-        self.__report_statistic = self.__month_report.get_report_statistics()
-        self.__expenses = self.__month_report.get_expenses()
+        snapshot = self.__month_report.get_snapshot()
+        self.__grouped_sales = snapshot.sale_groups
+        self.__report_statistic = snapshot.statistic
+        self.__expenses = snapshot.expenses
 
     def __disable_gui_and_show_processing_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -95,7 +107,7 @@ class MonthSaleReportPresenter(AbstractPresenter):
         self.__path, self.__file_type = self.get_view().ask_user_to_save_report_as(suggested_filename)
         
         if self.__path or self.__file_type:
-            self.__execute_thread_to_generate_report_file()
+            self.__export_report_file()
 
     def __suggested_report_filename_using_date(self) -> str:
         report_date = self.get_view().get_date()
@@ -104,26 +116,8 @@ class MonthSaleReportPresenter(AbstractPresenter):
             report_date.month
         )
 
-    def __execute_thread_to_generate_report_file(self):
-        self.thread = PresenterThreadWorker(self.__export_report_to_specified_path)
-        self.thread.when_started.connect(self.__disable_gui_and_show_exporting_message)
-        self.thread.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
-        self.thread.error_found.connect(self.__handle_export_report_errors)
-        self.thread.finished_without_error.connect(
-            lambda: self.get_view().show_success_toast_message('Reporte exportado')
-        )
-        self.thread.start()
-
-    def __export_report_to_specified_path(self, thread: PresenterThreadWorker):
-        try:
-            if 'pdf' in self.__file_type:
-                generate_pdf_file(Path(self.__path), self.__month_report)
-            elif 'html' in self.__file_type:
-                generate_html_file(Path(self.__path), self.__month_report)
-            
-            thread.finished_without_error.emit()
-        except DirectoryPermissionError as error:
-            thread.error_found.emit(error)
+    def __export_report_file(self):
+        self.report_exporter.export(self.__month_report, Path(self.__path), self.__file_type)
 
     def __disable_gui_and_show_exporting_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -1,9 +1,11 @@
-from datetime import date, timedelta
+from calendar import monthrange
+from datetime import date
 from typing import Tuple
 
 from easy_mvp.abstract_presenter import AbstractPresenter
 
 from model.entity.economic_summary import EconomicSummary
+from model.repository.economic_summary import EconomicSummaryRepository
 from model.repository.factory import RepositoryFactory
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.month_statistics import MonthStatisticsView
@@ -37,15 +39,12 @@ class MonthStatisticsPresenter(AbstractPresenter):
         self.thread.start()
 
     def __load_day_summaries(self, thread: PresenterThreadWorker):
-        current_date = date(day=1, month=self.__selected_month_date.month, year=self.__selected_month_date.year)
-        summaries_list = []
+        first_date_of_month = date(day=1, month=self.__selected_month_date.month, year=self.__selected_month_date.year)
+        last_date_of_month = date(day=monthrange(first_date_of_month.year, first_date_of_month.month)[1],
+                                  month=first_date_of_month.month, year=first_date_of_month.year)
 
-        while current_date.month == self.__selected_month_date.month and current_date <= date.today():
-
-            summaries_list.append(self.__summary_repo.get_economic_summary_on_day(current_date))
-            current_date = current_date + timedelta(days=1)
-
-        self.__day_summaries = tuple(summaries_list)
+        self.__day_summaries = tuple(self.__summary_repo.get_economic_summaries_on_date_range(
+            first_date_of_month, min(last_date_of_month, date.today()), EconomicSummaryRepository.DAY))
 
     def __plot_summaries_on_graph(self):
         days = list(map(lambda summary: summary.initial_date.day, self.__day_summaries))
@@ -1,10 +1,12 @@
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
-from model.entity.models import Product
+from model.entity.rows import ProductRow
 from model.repository.factory import RepositoryFactory
+from model.repository.observer import DataChangedEvent
 from model.repository.product import ProductFilter
 from presenter.product_presenter import ProductPresenter
 from presenter.product_sale_management import ProductSaleManagementPresenter
+from presenter.util.data_changed_receiver import DataChangedReceiver
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.product_management import ProductManagementView
 
@@ -14,7 +16,18 @@ class ProductManagementPresenter(AbstractPresenter):
     def _on_initialize(self):
         self.__initialize_view()
         self.__product_repo = RepositoryFactory.get_product_repository()
+        self.__sale_repo = RepositoryFactory.get_sale_repository()
         self.__products = None
+        self.__changed_product_ids = set()
+        self.__deleted_product_ids = set()
+        self.__changed_products = []
+        self.__changed_products_thread: PresenterThreadWorker = None
+        self.__is_loading_changed_products = False
+        # Los productos creados, editados, eliminados o vendidos desde cualquier
+        # ventana se actualizan en la tabla sin volver a cargarla.
+        self.__data_changed_receiver = DataChangedReceiver(self.__update_changed_products_on_table)
+        self.__product_repo.add_on_data_changed_listener(self.__data_changed_receiver)
+        self.__sale_repo.add_on_data_changed_listener(self.__data_changed_receiver)
 
     def __initialize_view(self):
         view = ProductManagementView(self)
@@ -23,6 +36,10 @@ class ProductManagementPresenter(AbstractPresenter):
     def return_to_main(self):
         self._close_this_presenter()
 
+    def on_closing_presenter(self):
+        self.__product_repo.remove_on_data_changed_listener(self.__data_changed_receiver)
+        self.__sale_repo.remove_on_data_changed_listener(self.__data_changed_receiver)
+
     def get_default_window_title(self) -> str:
         return 'Blue POS - Gestión de productos'
 
@@ -37,7 +54,7 @@ class ProductManagementPresenter(AbstractPresenter):
         self.thread.start()
 
     def __load_products(self, thread: PresenterThreadWorker):
-        self.__products = self.__product_repo.get_all_products()
+        self.__products = self.__product_repo.get_all_product_rows()
 
     def __fill_table(self):
         self.get_view().clean_table()
@@ -55,12 +72,12 @@ class ProductManagementPresenter(AbstractPresenter):
     def __set_disabled_view_except_state_bar(self, disabled: bool):
         self.get_view().set_disabled_view_except_status_bar(disabled)
 
-    def __add_product_to_table(self, product: Product):
+    def __add_product_to_table(self, product: ProductRow):
         self.get_view().add_empty_row_at_the_end_of_table()
         row = self.get_view().get_last_row_index()
         self.__set_table_row_by_product(row, product)
 
-    def __set_table_row_by_product(self, row: int, product: Product):
+    def __set_table_row_by_product(self, row: int, product: ProductRow):
         view = self.get_view()
         view.set_cell_in_table(row, ProductManagementView.ID_COLUMN, product.id)
         view.set_cell_in_table(row, ProductManagementView.NAME_COLUMN, product.name)
@@ -132,30 +149,59 @@ class ProductManagementPresenter(AbstractPresenter):
         return products
 
     def on_view_discovered_with_result(self, action: str, result_data: dict, result: str):
+        # Las filas ya se actualizaron con el evento de los repositorios.
         if result == ProductPresenter.NEW_PRODUCT_RESULT:
-            self.__add_new_product_to_table(result_data)
+            self.get_view().show_success_toast_message('Producto creado')
         if result == ProductPresenter.UPDATED_PRODUCT_RESULT:
-            self.__update_product_on_table(result_data)
-        if result == ProductSaleManagementPresenter.MANAGED_SALES_RESULT:
-            self.__update_product_quantity_on_table(result_data)
-
-    def __add_new_product_to_table(self, result_data: dict):
-        new_product = result_data[ProductPresenter.NEW_PRODUCT]
-        self.__add_product_to_table(new_product)
+            self.get_view().show_success_toast_message('Producto actualizado')
+
+    def __update_changed_products_on_table(self, event: DataChangedEvent):
+        if self.__products is None:
+            # La tabla todavía no se ha llenado y la carga completa ya tendrá los cambios.
+            return
+
+        for a_product_id in event.get_ids(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED):
+            self.get_view().delete_product_row(a_product_id)
+            self.__changed_product_ids.discard(a_product_id)
+            self.__deleted_product_ids.add(a_product_id)
+
+        self.__changed_product_ids |= event.get_inserted_or_updated_ids(DataChangedEvent.PRODUCT)
+        self.__execute_thread_to_load_changed_products()
+
+    def __execute_thread_to_load_changed_products(self):
+        # Los cambios que llegan mientras se cargan otros se cargan al terminar.
+        if len(self.__changed_product_ids) == 0 or self.__is_loading_changed_products:
+            return
+
+        product_ids, self.__changed_product_ids = self.__changed_product_ids, set()
+        self.__deleted_product_ids.clear()
+        self.__is_loading_changed_products = True
+        if self.__changed_products_thread is not None:
+            # El hilo anterior ya avisó que terminó, pero puede no haber salido del todo.
+            self.__changed_products_thread.wait()
+        self.__changed_products_thread = PresenterThreadWorker(
+            lambda thread: self.__load_changed_products(product_ids))
+        # finished también se emite si la carga falla y así no se detienen las siguientes.
+        self.__changed_products_thread.finished.connect(self.__update_loaded_products_on_table)
+        self.__changed_products_thread.start()
+
+    def __load_changed_products(self, product_ids: set):
+        self.__changed_products = []
+        self.__changed_products = self.__product_repo.get_product_rows_by_ids(product_ids)
+
+    def __update_loaded_products_on_table(self):
+        self.__is_loading_changed_products = False
+        for a_product in self.__changed_products:
+            # Un producto eliminado mientras se cargaba no vuelve a la tabla.
+            if a_product.id in self.__deleted_product_ids:
+                continue
+            row = self.get_view().get_row_of_product(a_product.id)
+            if row == -1:
+                self.__add_product_to_table(a_product)
+            else:
+                self.__set_table_row_by_product(row, a_product)
         self.get_view().resize_table_columns_to_contents()
-        self.get_view().show_success_toast_message('Producto creado')
-
-    def __update_product_on_table(self, result_data: dict):
-        updated_product = result_data[ProductPresenter.UPDATED_PRODUCT]
-        row = self.get_view().get_selected_row_index()
-        self.__set_table_row_by_product(row, updated_product)
-        self.get_view().resize_table_columns_to_contents()
-        self.get_view().show_success_toast_message('Producto actualizado')
-
-    def __update_product_quantity_on_table(self, result_data: dict):
-        new_product_quantity = result_data[ProductSaleManagementPresenter.REMAINING_PRODUCT_QUANTITY]
-        row = self.get_view().get_selected_row_index()
-        self.get_view().set_cell_in_table(row, ProductManagementView.QUANTITY_COLUMN, new_product_quantity)
+        self.__execute_thread_to_load_changed_products()
 
     def open_product_sale_management_presenter(self):
         selected_product = self.__get_selected_product()
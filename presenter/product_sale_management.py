@@ -1,8 +1,12 @@
+from copy import copy
+
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
 from model.entity.models import Sale, Product
+from model.entity.rows import SaleRow
 from model.repository.factory import RepositoryFactory
+from model.repository.product import ProductFilter
 from model.repository.sale import SaleFilter
 from presenter.edit_sale import EditSalePresenter
 from presenter.sale_filter import SaleFilterPresenter
@@ -19,12 +23,32 @@ class ProductSaleManagementPresenter(AbstractPresenter):
 
     REMAINING_PRODUCT_QUANTITY = 'remaining_product_quantity'
 
+    SALE_PAGE_SIZE = 200
+
+    SORTING_BY_COLUMN = {
+        ProductSaleManagementView.SALE_ID_COLUMN: SaleFilter.ID,
+        ProductSaleManagementView.QUANTITY_COLUMN: SaleFilter.QUANTITY,
+        ProductSaleManagementView.PAYMENT_COLUMN: SaleFilter.PRICE,
+        ProductSaleManagementView.COST_COLUMN: SaleFilter.COST,
+        ProductSaleManagementView.PROFIT_COLUMN: SaleFilter.PROFIT,
+        ProductSaleManagementView.SALE_DATE_COLUMN: SaleFilter.SALE_DATE
+    }
+
     def _on_initialize(self):
         view = ProductSaleManagementView(self)
         self._set_view(view)
         self.__product: Product = self._get_intent_data()[self.PRODUCT_DATA]
         self.__sale_repo = RepositoryFactory.get_sale_repository()
+        self.__product_repo = RepositoryFactory.get_product_repository()
         self.__applied_sale_filter: SaleFilter = None
+        # Las ventas se cargan por páginas a medida que se desplaza la tabla.
+        self.__page_filter: SaleFilter = None
+        self.__loaded_sale_page: list = []
+        self.__last_loaded_sale: SaleRow = None
+        self.__sale_ids_on_table = set()
+        self.__are_all_sales_loaded = False
+        self.__is_loading_sale_page = False
+        self.page_thread: PresenterThreadWorker = None
 
     def close_presenter(self):
         result_data = {self.REMAINING_PRODUCT_QUANTITY: self.__product.quantity}
@@ -59,7 +83,8 @@ class ProductSaleManagementPresenter(AbstractPresenter):
             self.get_view().disable_sell_button(False)
 
     def __execute_thread_to_fill_table(self):
-        self.thread = PresenterThreadWorker(self.__load_product_sales)
+        self.__start_loading_sales_sorted_as_table()
+        self.thread = PresenterThreadWorker(self.__load_next_sale_page)
         self.thread.when_started.connect(self.__disable_gui_and_show_loading_sales_message)
 
         self.thread.when_finished.connect(self.__fill_table)
@@ -67,35 +92,88 @@ class ProductSaleManagementPresenter(AbstractPresenter):
 
         self.thread.start()
 
-    def __load_product_sales(self, thread: PresenterThreadWorker):
-        self.__product_sales = self.__get_sales_of_product()
+    def __start_loading_sales_sorted_as_table(self):
+        if self.page_thread is not None and self.page_thread.isRunning():
+            # La página que se está cargando es del orden o del filtro anterior.
+            self.page_thread.when_finished.disconnect()
+            self.page_thread.wait()
 
-    def __disable_gui_and_show_loading_sales_message(self):
-        self.get_view().set_disabled_view_except_status_bar(True)
-        self.get_view().set_status_bar_message('Cargando datos...')
+        if self.__applied_sale_filter is None:
+            self.__page_filter = SaleFilter()
+            self.__page_filter.product_id_list = [self.__product.id]
+        else:
+            self.__page_filter = copy(self.__applied_sale_filter)
 
-    def __fill_table(self):
-        self.get_view().clean_table()
-        for a_sale in self.__product_sales:
-            self.__add_sale_to_table(a_sale)
+        sorting_column, ascending_order = self.get_view().get_sorting_configuration()
+        self.__page_filter.sorted_by = self.SORTING_BY_COLUMN[sorting_column]
+        self.__page_filter.ascending_order = ascending_order
+
+        self.__last_loaded_sale = None
+        self.__are_all_sales_loaded = False
+        self.__is_loading_sale_page = True
+
+    def __load_next_sale_page(self, thread: PresenterThreadWorker = None):
+        if self.__last_loaded_sale is None:
+            self.__loaded_sale_page = self.__sale_repo.get_sale_rows_page_by_filter(self.__page_filter,
+                                                                                    self.SALE_PAGE_SIZE)
+        else:
+            self.__loaded_sale_page = self.__sale_repo.get_sale_rows_page_by_filter(
+                self.__page_filter, self.SALE_PAGE_SIZE,
+                self.__last_loaded_sale.id, self.__page_filter.get_sort_key(self.__last_loaded_sale))
+
+    def load_next_sale_page(self):
+        if self.__are_all_sales_loaded or self.__is_loading_sale_page:
+            return
+
+        self.__is_loading_sale_page = True
+        self.page_thread = PresenterThreadWorker(self.__load_next_sale_page)
+        self.page_thread.when_finished.connect(self.__add_loaded_sale_page_to_table)
+        self.page_thread.start()
+
+    def __add_loaded_sale_page_to_table(self):
+        # Una venta vendida o editada en esta ventana ya puede estar en la tabla.
+        for a_sale in self.__loaded_sale_page:
+            if a_sale.id not in self.__sale_ids_on_table:
+                self.__add_sale_to_table(a_sale)
+
+        if len(self.__loaded_sale_page) > 0:
+            self.__last_loaded_sale = self.__loaded_sale_page[-1]
+        self.__are_all_sales_loaded = len(self.__loaded_sale_page) < self.SALE_PAGE_SIZE
+        self.__is_loading_sale_page = False
 
         self.get_view().sort_table_rows()
         self.get_view().resize_table_columns_to_contents()
 
-    def __get_sales_of_product(self):
-        filter_by_product_id = SaleFilter()
-        filter_by_product_id.product_id_list = [self.__product.id]
+    def sort_sales(self):
+        if self.__are_all_sales_loaded:
+            self.get_view().sort_table_rows()
+            return
+
+        # Solo hay una parte de las ventas en la tabla, así que se vuelven a cargar
+        # desde el principio en el nuevo orden.
+        self.__execute_thread_to_fill_table()
 
-        return self.__sale_repo.get_sales_by_filter(filter_by_product_id)
+    def __disable_gui_and_show_loading_sales_message(self):
+        self.get_view().set_disabled_view_except_status_bar(True)
+        self.get_view().set_status_bar_message('Cargando datos...')
+
+    def __fill_table(self):
+        self.get_view().clean_table()
+        self.__sale_ids_on_table.clear()
+        self.__add_loaded_sale_page_to_table()
 
     def __add_sale_to_table(self, sale: Sale):
         self.get_view().add_empty_row_at_the_end_of_table()
         row = self.get_view().get_last_row_index()
         self.__set_table_row_by_sale(row, sale)
+        self.__sale_ids_on_table.add(sale.id)
 
     def __set_table_row_by_sale(self, row: int, sale: Sale):
+        # sale es una Sale cuando se vende o se edita en esta ventana y una SaleRow
+        # cuando se carga una página.
         view = self.get_view()
         view.set_cell_in_table(row, ProductSaleManagementView.SALE_ID_COLUMN, sale.id)
+        view.set_cell_in_table(row, ProductSaleManagementView.QUANTITY_COLUMN, sale.quantity)
         view.set_cell_in_table(row, ProductSaleManagementView.PAYMENT_COLUMN, sale.price)
         view.set_cell_in_table(row, ProductSaleManagementView.COST_COLUMN, sale.cost)
         view.set_cell_in_table(row, ProductSaleManagementView.PROFIT_COLUMN, sale.profit)
@@ -106,7 +184,10 @@ class ProductSaleManagementPresenter(AbstractPresenter):
         self.get_view().set_status_bar_message('')
 
     def undo_selected_sales(self):
-        if self.get_view().ask_user_to_confirm_undo_sales():
+        if len(self.get_view().get_selected_sale_ids()) == 1 and self.get_view().get_units_of_selected_sale() > 1:
+            self.__undo_units_of_selected_sale()
+
+        elif self.get_view().ask_user_to_confirm_undo_sales():
             self.__selected_sale_id_list = self.get_view().get_selected_sale_ids()
 
             self.thread = PresenterThreadWorker(self.__undo_selected_sales)
@@ -123,15 +204,53 @@ class ProductSaleManagementPresenter(AbstractPresenter):
             )
             self.thread.start()
 
+    def __undo_units_of_selected_sale(self):
+        self.__sold_units = self.get_view().get_units_of_selected_sale()
+        self.__units_to_undo = self.get_view().ask_user_for_units_to_undo(self.__sold_units)
+        if self.__units_to_undo == 0:
+            return
+
+        self.__selected_sale_id_list = self.get_view().get_selected_sale_ids()
+        self.thread = PresenterThreadWorker(self.__undo_selected_sale_units)
+
+        self.thread.when_started.connect(self.__disable_gui_and_show_undoing_sales_message)
+        self.thread.when_finished.connect(self.__update_units_of_selected_sale_on_table)
+        self.thread.when_finished.connect(self.__update_available_product_quantity_on_gui)
+        self.thread.when_finished.connect(
+            self.__set_sell_button_availability_depending_on_remaining_product_quantity)
+        self.thread.when_finished.connect(self.get_view().resize_table_columns_to_contents)
+        self.thread.when_finished.connect(self.__set_available_gui_and_show_no_message)
+        self.thread.when_finished.connect(
+            lambda: self.get_view().show_success_toast_message('Venta deshecha')
+        )
+        self.thread.start()
+
+    def __undo_selected_sale_units(self, thread: PresenterThreadWorker = None):
+        sale = Sale(id=self.__selected_sale_id_list[0], product_id=self.__product.id)
+        self.__sale_repo.undo_sale_units(sale, self.__units_to_undo)
+
+    def __update_units_of_selected_sale_on_table(self):
+        remaining_units = self.__sold_units - self.__units_to_undo
+        if remaining_units == 0:
+            self.get_view().delete_selected_sales_from_table()
+        else:
+            self.get_view().set_units_of_selected_sale(remaining_units)
+
     def __disable_gui_and_show_undoing_sales_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
         self.get_view().set_status_bar_message('Deshaciendo ventas...')
 
     def __update_available_product_quantity_on_gui(self):
-        # Aquí no es necesario realizar ninguna substracción porque SqlAlchemy
-        # se encarga de actualizar el valor de los atributos cada vez que son accedidos
+        # Las ventas se registran en la sesión de otro hilo, así que el producto se
+        # vuelve a leer para mostrar las unidades que realmente quedan.
+        self.__product = self.__get_product_from_database()
         self.get_view().set_available_product_quantity(self.__product.quantity)
 
+    def __get_product_from_database(self) -> Product:
+        a_filter = ProductFilter()
+        a_filter.id = self.__product.id
+        return self.__product_repo.get_products_by_filter(a_filter)[0]
+
     def __undo_selected_sales(self, thread: PresenterThreadWorker = None):
         self.__sale_repo.delete_sales(self.__selected_sale_id_list)
 
@@ -183,9 +302,7 @@ class ProductSaleManagementPresenter(AbstractPresenter):
 
     def __are_sales_matching_sale_filter_values(self, sales: list) -> bool:
         a_sale: Sale = sales[0]
-        return (self.__applied_sale_filter is not None
-                and self.__applied_sale_filter.minimum_date <= a_sale.date
-                and self.__applied_sale_filter.maximum_date >= a_sale.date)
+        return self.__applied_sale_filter is not None and self.__applied_sale_filter.is_it_match(a_sale)
 
     def __update_sale_on_table(self, result_data: dict):
         selected_row = self.get_view().get_selected_row_index()
@@ -198,6 +315,9 @@ class ProductSaleManagementPresenter(AbstractPresenter):
             self.get_view().sort_table_rows()
         elif not self.__are_sales_matching_sale_filter_values([updated_sale]):
             self.get_view().delete_selected_sales_from_table()
+
+        self.__update_available_product_quantity_on_gui()
+        self.__set_sell_button_availability_depending_on_remaining_product_quantity()
         
         self.get_view().show_success_toast_message('Venta actualizada')
 
@@ -217,12 +337,12 @@ class ProductSaleManagementPresenter(AbstractPresenter):
 
     def __execute_thread_to_apply_sale_filter(self, result_data: dict):
         self.__applied_sale_filter = result_data[SaleFilterPresenter.NEW_FILTER_DATA]
-        self.thread = PresenterThreadWorker(self.__load_sale_using_filter)
+        self.__start_loading_sales_sorted_as_table()
+        self.thread = PresenterThreadWorker(self.__load_next_sale_page)
 
         self.thread.when_started.connect(self.__disable_gui_and_show_filtering_message)
 
-        self.thread.when_finished.connect(self.__fill_table_with_filtered_sales)
-        self.thread.when_finished.connect(self.get_view().sort_table_rows)
+        self.thread.when_finished.connect(self.__fill_table)
         self.thread.when_finished.connect(self.__set_delete_filter_button_available)
         self.thread.when_finished.connect(self.get_view().resize_table_columns_to_contents)
         self.thread.when_finished.connect(
@@ -233,14 +353,6 @@ class ProductSaleManagementPresenter(AbstractPresenter):
         
         self.thread.start()
 
-    def __load_sale_using_filter(self, thread: PresenterThreadWorker):
-        self.__filtered_sales = self.__sale_repo.get_sales_by_filter(self.__applied_sale_filter)
-
-    def __fill_table_with_filtered_sales(self):
-        self.get_view().clean_table()
-        for a_sale in self.__filtered_sales:
-            self.__add_sale_to_table(a_sale)
-
     def __disable_gui_and_show_filtering_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
         self.get_view().set_status_bar_message('Filtrando ventas...')
@@ -255,7 +367,8 @@ class ProductSaleManagementPresenter(AbstractPresenter):
 
     def execute_thread_to_delete_applied_filter(self):
         self.__applied_sale_filter = None
-        self.thread = PresenterThreadWorker(self.__load_product_sales)
+        self.__start_loading_sales_sorted_as_table()
+        self.thread = PresenterThreadWorker(self.__load_next_sale_page)
 
         self.thread.when_started.connect(self.__disable_gui_and_show_loading_sales_message)
 
@@ -35,6 +35,9 @@ class SaleFilterPresenter(AbstractPresenter):
             view.set_final_date_check_box_checked(True)
             view.set_final_date(self.__applied_filter.maximum_date)
 
+        view.set_minimum_quantity(self.__applied_filter.minimum_quantity)
+        view.set_maximum_quantity(self.__applied_filter.maximum_quantity)
+
     def close_presenter(self):
         self._close_this_presenter()
 
@@ -48,6 +51,8 @@ class SaleFilterPresenter(AbstractPresenter):
 
         sale_filter.minimum_date = initial_date
         sale_filter.maximum_date = final_date
+        sale_filter.minimum_quantity = self.get_view().get_minimum_quantity()
+        sale_filter.maximum_quantity = self.get_view().get_maximum_quantity()
         if self.FILTER_BY_PRODUCT_ID_LIST_DATA in self._get_intent_data():
             sale_filter.product_id_list = self._get_intent_data()[self.FILTER_BY_PRODUCT_ID_LIST_DATA]
 
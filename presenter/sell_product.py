@@ -47,7 +47,7 @@ class MakeSalePresenter(AbstractPresenter):
         self.thread.start()
 
     def __do_sales(self, thread: PresenterThreadWorker):
-        self.__new_sales = self.__sale_repo.insert_sales(self.__mock_sale, self.__sale_quantity)
+        self.__new_sales = self.__sale_repo.checkout([self.__mock_sale]).sales
         thread.finished_without_error.emit()
 
     def __show_message_and_disable_controls(self):
@@ -64,7 +64,8 @@ class MakeSalePresenter(AbstractPresenter):
             product_id=self.__product.id,
             price=self.__product.price,
             cost=self.__product.cost,
-            date=self.get_view().get_sale_date()
+            date=self.get_view().get_sale_date(),
+            quantity=self.__sale_quantity
         )
 
     def cancel_sale(self):
@@ -0,0 +1,37 @@
+from threading import Lock
+
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
+
+from model.repository.observer import DataChangedEvent
+
+
+class DataChangedReceiver(QObject):
+    """
+    Listener de los repositorios para los presenters. Los repositorios notifican en
+    el hilo que hizo el cambio, que suele ser un PresenterThreadWorker, así que el
+    evento se entrega a on_data_changed en el hilo de la interfaz. Los eventos que
+    llegan antes de esa entrega se juntan en uno solo.
+    """
+
+    __event_received = pyqtSignal()
+
+    def __init__(self, on_data_changed):
+        super().__init__()
+        self.__on_data_changed = on_data_changed
+        self.__pending_event: DataChangedEvent = None
+        self.__lock = Lock()
+        self.__event_received.connect(self.__deliver_pending_event, Qt.QueuedConnection)
+
+    def on_data_changed(self, event: DataChangedEvent):
+        with self.__lock:
+            if self.__pending_event is not None:
+                self.__pending_event = self.__pending_event.merge(event)
+                return
+            self.__pending_event = event
+        self.__event_received.emit()
+
+    def __deliver_pending_event(self):
+        with self.__lock:
+            event, self.__pending_event = self.__pending_event, None
+        if event is not None:
+            self.__on_data_changed(event)
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from PyQt5.QtCore import QObject, pyqtSignal, Qt
+
+from model.report.abstract_report import AbstractSaleReport
+from model.report.generators import start_pdf_file_generation, generate_html_file, DirectoryPermissionError
+from model.report.pdf_rendering import get_pdf_rendering_service, PdfRenderingService
+from presenter.util.thread_worker import PresenterThreadWorker
+
+
+class ReportExporter(QObject):
+    """
+    Exporta el reporte de un presenter a PDF o HTML sin bloquear la interfaz. El HTML
+    se escribe en un PresenterThreadWorker. El PDF lo convierte el servicio de PDF, que
+    avisa el estado final desde uno de sus hilos, así que ese estado se entrega en el
+    hilo de la interfaz con una señal encolada.
+    """
+
+    when_started = pyqtSignal()
+    when_finished = pyqtSignal()
+    error_found = pyqtSignal(Exception)
+    finished_without_error = pyqtSignal()
+
+    __pdf_job_finished = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.__thread: PresenterThreadWorker = None
+        self.__pdf_job_id: int = None
+        self.__is_cancelled = False
+        self.__pdf_job_finished.connect(self.__finish_pdf_export, Qt.QueuedConnection)
+
+    def export(self, report: AbstractSaleReport, file_path: Path, file_type: str):
+        self.__pdf_job_id = None
+        self.__is_cancelled = False
+        self.__thread = PresenterThreadWorker(
+            lambda thread: self.__start_export(thread, report, file_path, file_type))
+        self.__thread.error_found.connect(self.__finish_export_with_error)
+        self.__thread.finished_without_error.connect(self.__finish_export)
+        self.when_started.emit()
+        self.__thread.start()
+
+    def __start_export(self, thread: PresenterThreadWorker, report: AbstractSaleReport,
+                       file_path: Path, file_type: str):
+        try:
+            if 'pdf' in file_type:
+                # La exportación termina cuando el servicio avisa el estado final del trabajo.
+                self.__pdf_job_id = start_pdf_file_generation(file_path, report, self.__on_pdf_progress)
+                if self.__is_cancelled:
+                    get_pdf_rendering_service().cancel(self.__pdf_job_id)
+                return
+            elif 'html' in file_type:
+                generate_html_file(file_path, report)
+
+            thread.finished_without_error.emit()
+
+        except DirectoryPermissionError as error:
+            thread.error_found.emit(error)
+
+    def __on_pdf_progress(self, job_id: int, state: str):
+        if state in (PdfRenderingService.FINISHED, PdfRenderingService.FAILED, PdfRenderingService.CANCELLED):
+            self.__pdf_job_finished.emit(state)
+
+    def __finish_pdf_export(self, state: str):
+        self.__pdf_job_id = None
+        self.when_finished.emit()
+        if state == PdfRenderingService.FINISHED:
+            self.finished_without_error.emit()
+
+    def __finish_export(self):
+        self.when_finished.emit()
+        self.finished_without_error.emit()
+
+    def __finish_export_with_error(self, error: Exception):
+        self.when_finished.emit()
+        self.error_found.emit(error)
+
+    def cancel(self):
+        # Si se está exportando el reporte a PDF, su trabajo se cancela.
+        self.__is_cancelled = True
+        if self.__pdf_job_id is not None:
+            get_pdf_rendering_service().cancel(self.__pdf_job_id)
+
+
+class ReportExportingPresenter:
+    """
+    Parte común de los presenters que exportan su reporte con self.report_exporter.
+    Al cerrar el presenter o su ventana se cancela la exportación a PDF en curso.
+    """
+
+    report_exporter: ReportExporter
+
+    def on_closing_presenter(self):
+        self.report_exporter.cancel()
+
+    def on_window_closing(self):
+        self.report_exporter.cancel()
@@ -1,5 +1,7 @@
 from PyQt5.QtCore import pyqtSignal, QThread
 
+from model.repository.factory import RepositoryFactory
+
 
 class PresenterThreadWorker(QThread):
 
@@ -14,6 +16,10 @@ class PresenterThreadWorker(QThread):
 
     def run(self):
         self.when_started.emit()
-        self.__a_callable(self)
+        try:
+            self.__a_callable(self)
+        finally:
+            # Cada tarea trabaja con su propia sesión de base de datos.
+            RepositoryFactory.remove_session()
         self.when_finished.emit()
 
@@ -4,19 +4,19 @@ from typing import List
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
-from model.entity.models import Expense
-from model.report.generators import generate_pdf_file, generate_html_file
+from model.entity.rows import ExpenseRow
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
 from model.report.statistics import ReportStatistic
 from model.report.week import WeekSaleReport
 from model.repository.factory import RepositoryFactory
 from presenter.expenses_visualization import ExpensesVisualizationPresenter
+from presenter.util.report_exporter import ReportExporter, ReportExportingPresenter
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.week_report import WeekSaleReportView
 from model.report.generators import DirectoryPermissionError
 
 
-class WeekSaleReportPresenter(AbstractPresenter):
+class WeekSaleReportPresenter(ReportExportingPresenter, AbstractPresenter):
 
     def _on_initialize(self):
         self.__sale_repo = RepositoryFactory.get_sale_repository()
@@ -24,8 +24,19 @@ class WeekSaleReportPresenter(AbstractPresenter):
         self.__expense_repo = RepositoryFactory.get_expense_repository()
         self.__report_statistic: ReportStatistic = None
         self.__sales_grouped_by_product_list: List[SalesGroupedByProduct] = None
-        self.__expenses: List[Expense] = None
+        self.__expenses: List[ExpenseRow] = None
+        self.thread: PresenterThreadWorker = None
         self._set_view(WeekSaleReportView(self))
+        self.__initialize_report_exporter()
+
+    def __initialize_report_exporter(self):
+        self.report_exporter = ReportExporter()
+        self.report_exporter.when_started.connect(self.__disable_gui_and_show_exporting_message)
+        self.report_exporter.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
+        self.report_exporter.error_found.connect(self.__handle_export_report_errors)
+        self.report_exporter.finished_without_error.connect(
+            lambda: self.get_view().show_success_toast_message('Reporte exportado')
+        )
 
     def close_presenter(self):
         self._close_this_presenter()
@@ -54,9 +65,10 @@ class WeekSaleReportPresenter(AbstractPresenter):
         self.__week_report = WeekSaleReport(week_day=initial_date, sale_repository=self.__sale_repo,
                                             grouped_sales_repo=self.__sale_group_repo,
                                             expense_repo=self.__expense_repo)
-        self.__sales_grouped_by_product_list = self.__week_report.get_sales_grouped_by_product()
-        self.__report_statistic = self.__week_report.get_report_statistics()
-        self.__expenses = self.__week_report.get_expenses()
+        snapshot = self.__week_report.get_snapshot()
+        self.__sales_grouped_by_product_list = snapshot.sale_groups
+        self.__report_statistic = snapshot.statistic
+        self.__expenses = snapshot.expenses
 
     def __disable_gui_and_show_processing_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -100,7 +112,7 @@ class WeekSaleReportPresenter(AbstractPresenter):
         self.__path, self.__file_type = self.get_view().ask_user_to_save_report_as(suggested_filename)
         
         if self.__path or self.__file_type:
-            self.__execute_thread_to_generate_report_file()
+            self.__export_report_file()
 
     def __suggested_report_filename_using_date(self) -> str:
         initial_date, final_date = self.get_view().get_limit_dates_of_week()
@@ -110,27 +122,8 @@ class WeekSaleReportPresenter(AbstractPresenter):
             initial_date.day
         )
 
-    def __execute_thread_to_generate_report_file(self):
-        self.thread = PresenterThreadWorker(self.__export_report_to_specified_path)
-        self.thread.when_started.connect(self.__disable_gui_and_show_exporting_message)
-        self.thread.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
-        self.thread.error_found.connect(self.__handle_export_report_errors)
-        self.thread.finished_without_error.connect(
-            lambda: self.get_view().show_success_toast_message('Reporte exportado')
-        )
-        self.thread.start()
-
-    def __export_report_to_specified_path(self, thread: PresenterThreadWorker):
-        try:
-            if 'pdf' in self.__file_type:
-                generate_pdf_file(Path(self.__path), self.__week_report)
-            elif 'html' in self.__file_type:
-                generate_html_file(Path(self.__path), self.__week_report)
-
-            thread.finished_without_error.emit()
-        
-        except DirectoryPermissionError as error:
-            thread.error_found.emit(error)
+    def __export_report_file(self):
+        self.report_exporter.export(self.__week_report, Path(self.__path), self.__file_type)
 
     def __disable_gui_and_show_exporting_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -5,19 +5,19 @@ from typing import List
 from easy_mvp.abstract_presenter import AbstractPresenter
 from easy_mvp.intent import Intent
 
-from model.entity.models import Expense
-from model.report.generators import generate_pdf_file, generate_html_file
+from model.entity.rows import ExpenseRow
 from model.entity.sales_grouped_by_product import SalesGroupedByProduct
 from model.report.statistics import ReportStatistic
 from model.report.year import YearSaleReport
 from model.repository.factory import RepositoryFactory
 from presenter.expenses_visualization import ExpensesVisualizationPresenter
+from presenter.util.report_exporter import ReportExporter, ReportExportingPresenter
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.year_report import YearSaleReportView
 from model.report.generators import DirectoryPermissionError
 
 
-class YearSaleReportPresenter(AbstractPresenter):
+class YearSaleReportPresenter(ReportExportingPresenter, AbstractPresenter):
 
     def _on_initialize(self):
         self._set_view(YearSaleReportView(self))
@@ -25,8 +25,19 @@ class YearSaleReportPresenter(AbstractPresenter):
         self.__sale_group_repo = RepositoryFactory.get_sales_grouped_by_product_repository()
         self.__expense_repo = RepositoryFactory.get_expense_repository()
         self.__sale_groups: List[SalesGroupedByProduct] = None
-        self.__expenses: List[Expense] = None
+        self.__expenses: List[ExpenseRow] = None
         self.__report_statistic: ReportStatistic = None
+        self.thread: PresenterThreadWorker = None
+        self.__initialize_report_exporter()
+
+    def __initialize_report_exporter(self):
+        self.report_exporter = ReportExporter()
+        self.report_exporter.when_started.connect(self.__disable_gui_and_show_exporting_message)
+        self.report_exporter.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
+        self.report_exporter.error_found.connect(self.__handle_export_report_errors)
+        self.report_exporter.finished_without_error.connect(
+            lambda: self.get_view().show_success_toast_message('Reporte exportado')
+        )
 
     def close_presenter(self):
         self._close_this_presenter()
@@ -51,9 +62,10 @@ class YearSaleReportPresenter(AbstractPresenter):
                                             sale_repo=self.__sale_repo,
                                             sale_group_repo=self.__sale_group_repo,
                                             expense_repo=self.__expense_repo)
-        self.__sale_groups = self.__year_report.get_sales_grouped_by_product()
-        self.__expenses = self.__year_report.get_expenses()
-        self.__report_statistic = self.__year_report.get_report_statistics()
+        snapshot = self.__year_report.get_snapshot()
+        self.__sale_groups = snapshot.sale_groups
+        self.__expenses = snapshot.expenses
+        self.__report_statistic = snapshot.statistic
 
     def __disable_gui_and_show_processing_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -95,32 +107,14 @@ class YearSaleReportPresenter(AbstractPresenter):
         self.__path, self.__file_type = self.get_view().ask_user_to_save_report_as(suggested_filename)
         
         if self.__path or self.__file_type:
-            self.__execute_thread_to_generate_report_file()
+            self.__export_report_file()
 
     def __suggested_report_filename_using_date(self) -> str:
         report_date = self.get_view().get_date()
         return 'Reporte ventas {}'.format(report_date.year)
 
-    def __execute_thread_to_generate_report_file(self):
-        self.thread = PresenterThreadWorker(self.__export_report_to_specified_path)
-        self.thread.when_started.connect(self.__disable_gui_and_show_exporting_message)
-        self.thread.when_finished.connect(self.__set_available_gui_and_show_no_state_bar_message)
-        self.thread.error_found.connect(self.__handle_export_report_errors)
-        self.thread.finished_without_error.connect(
-            lambda: self.get_view().show_success_toast_message('Reporte exportado')
-        )
-        self.thread.start()
-
-    def __export_report_to_specified_path(self, thread: PresenterThreadWorker):
-        try:
-            if 'pdf' in self.__file_type:
-                generate_pdf_file(Path(self.__path), self.__year_report)
-            elif 'html' in self.__file_type:
-                generate_html_file(Path(self.__path), self.__year_report)
-
-            thread.finished_without_error.emit()
-        except DirectoryPermissionError as error:
-            thread.error_found.emit(error)
+    def __export_report_file(self):
+        self.report_exporter.export(self.__year_report, Path(self.__path), self.__file_type)
 
     def __disable_gui_and_show_exporting_message(self):
         self.get_view().set_disabled_view_except_status_bar(True)
@@ -3,6 +3,7 @@ from typing import Tuple
 from easy_mvp.abstract_presenter import AbstractPresenter
 
 from model.entity.economic_summary import EconomicSummary
+from model.repository.economic_summary import EconomicSummaryRepository
 from model.repository.factory import RepositoryFactory
 from presenter.util.thread_worker import PresenterThreadWorker
 from view.year_statistics import YearStatisticsView
@@ -36,21 +37,12 @@ class YearStatisticsPresenter(AbstractPresenter):
         self.thread.start()
 
     def __load_summaries(self, thread: PresenterThreadWorker):
-        this_year = date.today().year
-        this_month = date.today().month
-        summaries_list = []
-        current_month = 1
-        while current_month <= 12:
-
-            if self.__selected_year == this_year and current_month > this_month:
-                # No se selecciona porque el mes no ha pasado
-                pass
-            else:
-                month_date = date(day=1, month=current_month, year=self.__selected_year)
-                summaries_list.append(self.__summary_repo.get_economic_summary_on_month(month_date))
-
-            current_month += 1
-        self.__month_summaries = tuple(summaries_list)
+        first_date_of_year = date(day=1, month=1, year=self.__selected_year)
+        last_date_of_year = date(day=31, month=12, year=self.__selected_year)
+
+        # Los meses que no han pasado no se seleccionan
+        self.__month_summaries = tuple(self.__summary_repo.get_economic_summaries_on_date_range(
+            first_date_of_year, min(last_date_of_year, date.today()), EconomicSummaryRepository.MONTH))
 
     def __plot_summaries_on_graph(self):
         months_values = list(map(lambda summary: summary.initial_date.month, self.__month_summaries))
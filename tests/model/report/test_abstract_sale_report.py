@@ -24,7 +24,7 @@ class TestAbstractSaleReport(TestCase):
         delete_all_products_from_database()
         delete_all_expenses_from_database()
 
-    def test_get_sales(self):
+    def test_get_sale_rows(self):
         products = ProductGenerator.generate_products_by_quantity(2)
         p1, p2 = products
         insert_products_in_database_and_return_them(products)
@@ -46,9 +46,10 @@ class TestAbstractSaleReport(TestCase):
                                     sale_repository=self.sale_repo,
                                     expense_repo=self.expense_repo,
                                     grouped_sales_repo=self.sale_group_repo)
-        sales_from_report = report.get_sales()
+        expected_ids = [s2.id, s3.id, s4.id, s5.id]
 
-        self.assertEqual(sales_from_report, [s2, s3, s4, s5])
+        self.assertEqual(list(map(lambda a_row: a_row.id, report.get_sale_rows())), expected_ids)
+        self.assertEqual(list(map(lambda a_row: a_row.id, report.iter_sale_rows())), expected_ids)
 
     def test_get_report_statistic(self):
         products = ProductGenerator.generate_products_by_quantity(2)
@@ -1,11 +1,15 @@
 import unittest
 from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
 from model.report.day import DaySaleReport
 from model.report.generators import generate_html_file, generate_pdf_file
 from model.repository.factory import RepositoryFactory
 from tests.util.general import TEST_DB_URL, delete_all_products_from_database, insert_product_and_return_it, \
     insert_sales_and_return_them, assert_sale_lists_are_equal_ignoring_id, insert_products_in_database_and_return_them, \
-    TEST_REPORT_PATH
+    TEST_REPORT_PATH, record_executed_queries, insert_sale_and_return_it
 from tests.util.generators.product import ProductGenerator
 from tests.util.generators.sale import SaleGenerator
 
@@ -62,3 +66,118 @@ class TestDaySaleReport(unittest.TestCase):
                                expense_repo=self.expense_repo,
                                grouped_sales_repo=self.grouped_sales_repo)
         generate_pdf_file(self.PDF_DAY_REPORT_PATH, report)
+
+    def test_html_report_does_not_read_the_product_of_each_sale(self):
+        products = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(2))
+        query_counts = []
+        for a_product in products:
+            sales = SaleGenerator.generate_sales_from_product(a_product, 3)
+            for a_sale in sales:
+                a_sale.date = self.TODAY
+            insert_sales_and_return_them(sales)
+            # Las ventas se insertan sin pasar por el repositorio, que invalidaría la caché.
+            RepositoryFactory.get_query_cache(TEST_DB_URL).clear()
+            report = DaySaleReport(self.TODAY,
+                                   sale_repo=self.sale_repository,
+                                   expense_repo=self.expense_repo,
+                                   grouped_sales_repo=self.grouped_sales_repo)
+
+            with record_executed_queries() as queries:
+                html = report.get_report_as_html()
+            query_counts.append(len(queries))
+            self.assertIn(a_product.name, html)
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_html_file_is_written_from_the_generated_chunks(self):
+        product, = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(1))
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        for a_sale in sales:
+            a_sale.date = self.TODAY
+        insert_sales_and_return_them(sales)
+        report = DaySaleReport(self.TODAY,
+                               sale_repo=self.sale_repository,
+                               expense_repo=self.expense_repo,
+                               grouped_sales_repo=self.grouped_sales_repo)
+
+        chunks = list(report.iter_report_as_html())
+        generate_html_file(self.HTML_DAY_REPORT_PATH, report)
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(self.HTML_DAY_REPORT_PATH.read_text(), ''.join(chunks))
+        self.assertEqual(''.join(chunks).count(product.name), 3)
+
+    def assert_html_totals_match_its_rows(self, html: str, sale_quantity: int):
+        self.assertIn(f'Cantidad de ventas: {sale_quantity} ', html)
+        self.assertEqual(html.count('<tr>'), sale_quantity)
+
+    def test_exported_report_matches_the_snapshot_when_a_sale_is_registered_after_it(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = self.TODAY
+        self.sale_repository.insert_sales(sale, 1)
+        report = DaySaleReport(self.TODAY,
+                               sale_repo=self.sale_repository,
+                               expense_repo=self.expense_repo,
+                               grouped_sales_repo=self.grouped_sales_repo)
+        snapshot, sale_rows = report.read_snapshot_and_sale_rows()
+        self.assertEqual((snapshot.statistic.sale_quantity(), len(sale_rows)), (1, 1))
+
+        self.sale_repository.insert_sales(sale, 1)
+        generate_html_file(self.HTML_DAY_REPORT_PATH, report)
+
+        self.assert_html_totals_match_its_rows(self.HTML_DAY_REPORT_PATH.read_text(), 1)
+
+    def test_exported_report_does_not_read_the_statistics_again(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = self.TODAY
+        self.sale_repository.insert_sales(sale, 1)
+        self.sale_repository.insert_sales(sale, 1)
+        report = DaySaleReport(self.TODAY,
+                               sale_repo=self.sale_repository,
+                               expense_repo=self.expense_repo,
+                               grouped_sales_repo=self.grouped_sales_repo)
+        report.read_snapshot_and_sale_rows()
+
+        with record_executed_queries() as queries:
+            generate_html_file(self.HTML_DAY_REPORT_PATH, report)
+
+        statements = [statement for statement, parameters in queries]
+        self.assertFalse([a_statement for a_statement in statements
+                          if 'daily_product_sales' in a_statement or 'expense' in a_statement])
+        self.assert_html_totals_match_its_rows(self.HTML_DAY_REPORT_PATH.read_text(), 2)
+
+    def test_exported_report_adds_up_when_a_sale_is_registered_while_it_is_generated(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = self.TODAY
+        self.sale_repository.insert_sales(sale, 1)
+        report = DaySaleReport(self.TODAY,
+                               sale_repo=self.sale_repository,
+                               expense_repo=self.expense_repo,
+                               grouped_sales_repo=self.grouped_sales_repo)
+        inserted_sales = []
+
+        def insert_sale_before_reading_the_rows(connection, cursor, statement, parameters, context, executemany):
+            # Se registra desde otra conexión cuando ya se leyeron las estadísticas.
+            if 'FROM sales' in statement and 'products.name' in statement and not inserted_sales:
+                other_sale = SaleGenerator.generate_one_sale_from_product(product)
+                other_sale.date = self.TODAY
+                inserted_sales.append(other_sale)
+                insert_sale_and_return_it(other_sale)
+
+        event.listen(Engine, 'before_cursor_execute', insert_sale_before_reading_the_rows)
+        try:
+            html = report.get_report_as_html()
+        finally:
+            event.remove(Engine, 'before_cursor_execute', insert_sale_before_reading_the_rows)
+
+        self.assertEqual(len(inserted_sales), 1)
+        self.assert_html_totals_match_its_rows(html, 1)
@@ -5,7 +5,8 @@ from model.report.generators import generate_html_file, generate_pdf_file
 from model.report.month import MonthSaleReport
 from model.repository.factory import RepositoryFactory
 from tests.util.general import TEST_REPORT_PATH, TEST_DB_URL, insert_product_and_return_it, \
-    insert_sales_and_return_them, assert_sale_lists_are_equal_ignoring_id, delete_all_products_from_database
+    insert_sales_and_return_them, assert_sale_lists_are_equal_ignoring_id, delete_all_products_from_database, \
+    record_executed_queries
 from tests.util.generators.product import ProductGenerator
 from tests.util.generators.sale import SaleGenerator
 
@@ -68,3 +69,22 @@ class TestMonthSaleReport(TestCase):
                                  expense_repo=self.expense_repo,
                                  grouped_sales_repo=self.sales_grouped_repo)
         generate_pdf_file(self.PDF_MONTH_REPORT_PATH, report)
+
+    def test_statistics_and_exported_report_are_built_from_the_snapshot_without_queries(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 3))
+        RepositoryFactory.get_query_cache(TEST_DB_URL).clear()
+        report = MonthSaleReport(self.FIRST_DATE_OF_THIS_MONTH,
+                                 sale_repository=self.sale_repository,
+                                 expense_repo=self.expense_repo,
+                                 grouped_sales_repo=self.sales_grouped_repo)
+        snapshot = report.get_snapshot()
+
+        with record_executed_queries() as queries:
+            report_statistic = report.get_report_statistics()
+            html = report.get_report_as_html()
+
+        self.assertEqual(queries, [])
+        self.assertIs(report_statistic, snapshot.statistic)
+        self.assertEqual(snapshot.statistic.sale_quantity(), 3)
+        self.assertIn(product.name, html)
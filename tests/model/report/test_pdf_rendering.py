@@ -0,0 +1,73 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from model.report.pdf_rendering import PdfRenderingService
+
+HTML = '<html><body><h1>Reporte</h1><p>{}</p></body></html>'
+
+
+class TestPdfRenderingService(TestCase):
+
+    def setUp(self):
+        self.service = PdfRenderingService(max_workers=2)
+        self.directory = tempfile.TemporaryDirectory()
+        self.directory_path = Path(self.directory.name)
+
+    def tearDown(self):
+        self.service.shutdown()
+        self.directory.cleanup()
+
+    def test_jobs_render_their_files_and_report_progress(self):
+        progress = []
+        first_path = self.directory_path.joinpath('first.pdf')
+        second_path = self.directory_path.joinpath('second.pdf')
+
+        first_job_id = self.service.submit(HTML.format(1), first_path,
+                                           on_progress=lambda job_id, state: progress.append(state))
+        second_job_id = self.service.submit(HTML.format(2), second_path)
+
+        self.assertNotEqual(first_job_id, second_job_id)
+        self.assertEqual(self.service.wait(first_job_id, timeout=60), PdfRenderingService.FINISHED)
+        self.assertEqual(self.service.wait(second_job_id, timeout=60), PdfRenderingService.FINISHED)
+        self.assertEqual(progress[0], PdfRenderingService.QUEUED)
+        self.assertEqual(progress[-1], PdfRenderingService.FINISHED)
+        self.assertTrue(first_path.read_bytes().startswith(b'%PDF'))
+        self.assertTrue(second_path.read_bytes().startswith(b'%PDF'))
+        self.assertEqual(sorted(map(lambda a_path: a_path.name, self.directory_path.iterdir())),
+                         ['first.pdf', 'second.pdf'])
+
+    def test_cancelled_job_does_not_write_its_file(self):
+        file_path = self.directory_path.joinpath('cancelled.pdf')
+        job_id = self.service.submit(HTML.format(1), file_path)
+
+        self.assertTrue(self.service.cancel(job_id))
+
+        self.assertEqual(self.service.wait(job_id, timeout=60), PdfRenderingService.CANCELLED)
+        self.assertFalse(self.service.cancel(job_id))
+        self.assertEqual(list(self.directory_path.iterdir()), [])
+
+    def test_job_can_be_cancelled_as_soon_as_it_is_queued(self):
+        file_path = self.directory_path.joinpath('cancelled.pdf')
+        cancelled = []
+
+        def cancel_when_queued(job_id: int, state: str):
+            if state == PdfRenderingService.QUEUED:
+                cancelled.append(self.service.cancel(job_id))
+
+        job_id = self.service.submit(HTML.format(1), file_path, on_progress=cancel_when_queued)
+
+        self.assertEqual(self.service.wait(job_id, timeout=60), PdfRenderingService.CANCELLED)
+        self.assertEqual(cancelled, [True])
+        self.assertFalse(file_path.exists())
+
+    def test_old_finished_jobs_are_forgotten(self):
+        self.service.KEPT_FINISHED_JOBS = 1
+        first_job_id = self.service.submit(HTML.format(1), self.directory_path.joinpath('first.pdf'))
+        self.service.wait(first_job_id, timeout=60)
+        second_job_id = self.service.submit(HTML.format(2), self.directory_path.joinpath('second.pdf'))
+        self.service.wait(second_job_id, timeout=60)
+
+        self.assertEqual(self.service.get_state(second_job_id), PdfRenderingService.FINISHED)
+        self.assertRaises(KeyError, self.service.get_state, first_job_id)
+        self.assertFalse(self.service.cancel(first_job_id))
@@ -0,0 +1,29 @@
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+from jinja2 import ModuleLoader
+
+from model.report.template_registry import get_report_template, create_report_environment, \
+    compile_report_templates
+
+
+class TestTemplateRegistry(TestCase):
+
+    def test_template_is_compiled_once_per_process(self):
+        first_template = get_report_template('month_report.html')
+        second_template = get_report_template('month_report.html')
+
+        self.assertIs(first_template, second_template)
+
+    def test_precompiled_templates_render_like_the_source_templates(self):
+        context = dict(month_date=date(2022, 5, 1), sale_quantity=3, total_collected_money='30.00',
+                       total_cost='15.00', total_profit='15.00', total_expense='0.00',
+                       net_profit='15.00', sale_groups=[])
+
+        with tempfile.TemporaryDirectory() as directory:
+            compile_report_templates(directory)
+            compiled_environment = create_report_environment(ModuleLoader(directory))
+
+            self.assertEqual(compiled_environment.get_template('month_report.html').render(**context),
+                             get_report_template('month_report.html').render(**context))
@@ -2,10 +2,12 @@ from datetime import date
 from unittest import TestCase
 
 from model.entity.economic_summary import EconomicSummary
+from model.repository.economic_summary import EconomicSummaryRepository
 from model.repository.factory import RepositoryFactory
 from model.util.monetary_types import CUPMoney
 from tests.util.general import TEST_DB_URL, delete_all_products_from_database, delete_all_expenses_from_database, \
-    insert_products_in_database_and_return_them, insert_sales_and_return_them, insert_expenses_in_database
+    insert_products_in_database_and_return_them, insert_sales_and_return_them, insert_expenses_in_database, \
+    record_executed_queries
 from tests.util.generators.expense import ExpenseGenerator
 from tests.util.generators.product import ProductGenerator
 from tests.util.generators.sale import SaleGenerator
@@ -75,3 +77,117 @@ class TestEconomicSummaryRepository(TestCase):
             total_expense=CUPMoney('0.00'),
             net_profit=CUPMoney('0.00')
         ))
+
+    def test_economic_summary_sums_money_exactly(self):
+        products = ProductGenerator.generate_products_by_quantity(1)
+        p1, = products
+        p1.price, p1.cost = CUPMoney('0.10'), CUPMoney('0.07')
+        insert_products_in_database_and_return_them(products)
+        sales_of_p1 = SaleGenerator.generate_sales_from_product(p1, 3)
+        for a_sale in sales_of_p1:
+            a_sale.date = date(year=2000, month=12, day=1)
+        insert_sales_and_return_them(sales_of_p1)
+
+        december_summary = self.economic_summary_repo.get_economic_summary_on_month(
+            date(year=2000, month=12, day=1)
+        )
+
+        self.assertEqual(december_summary.acquired_money.amount, CUPMoney('0.30').amount)
+        self.assertEqual(str(december_summary.total_profit.amount), '0.09')
+
+    def insert_sales_and_expenses_for_bucket_tests(self):
+        products = ProductGenerator.generate_products_by_quantity(1)
+        p1, = products
+        p1.price, p1.cost = CUPMoney('3.00'), CUPMoney('2.00')
+        insert_products_in_database_and_return_them(products)
+        s1, s2, s3 = SaleGenerator.generate_sales_from_product(p1, 3)
+        s1.date = date(year=2000, month=12, day=29)  # Viernes
+        s2.date, s2.quantity = date(year=2000, month=12, day=31), 2  # Domingo
+        s3.date = date(year=2001, month=1, day=1)  # Lunes
+        insert_sales_and_return_them([s1, s2, s3])
+        e1, = ExpenseGenerator.generate_expenses_by_quantity(1)
+        e1.date, e1.spent_money = date(year=2000, month=12, day=31), CUPMoney('1.50')
+        insert_expenses_in_database([e1])
+
+    def test_get_economic_summaries_by_day_fills_empty_days(self):
+        self.insert_sales_and_expenses_for_bucket_tests()
+
+        summaries = self.economic_summary_repo.get_economic_summaries_on_date_range(
+            date(year=2000, month=12, day=29), date(year=2001, month=1, day=1), EconomicSummaryRepository.DAY)
+
+        self.assertEqual(summaries, [
+            self.economic_summary_repo.get_economic_summary_on_day(date(year=2000, month=12, day=29)),
+            self.economic_summary_repo.get_economic_summary_on_day(date(year=2000, month=12, day=30)),
+            self.economic_summary_repo.get_economic_summary_on_day(date(year=2000, month=12, day=31)),
+            self.economic_summary_repo.get_economic_summary_on_day(date(year=2001, month=1, day=1)),
+        ])
+        self.assertEqual(list(map(lambda a_summary: a_summary.sale_quantity, summaries)), [1, 0, 2, 1])
+
+    def test_get_economic_summaries_by_week_uses_iso_weeks(self):
+        self.insert_sales_and_expenses_for_bucket_tests()
+
+        summaries = self.economic_summary_repo.get_economic_summaries_on_date_range(
+            date(year=2000, month=12, day=20), date(year=2001, month=1, day=3), EconomicSummaryRepository.WEEK)
+
+        self.assertEqual(summaries, [
+            EconomicSummary(
+                initial_date=date(year=2000, month=12, day=20),
+                final_date=date(year=2000, month=12, day=24),
+                sale_quantity=0,
+                acquired_money=CUPMoney('0.00'),
+                total_cost=CUPMoney('0.00'),
+                total_profit=CUPMoney('0.00'),
+                total_expense=CUPMoney('0.00'),
+                net_profit=CUPMoney('0.00')
+            ),
+            EconomicSummary(
+                initial_date=date(year=2000, month=12, day=25),
+                final_date=date(year=2000, month=12, day=31),
+                sale_quantity=3,
+                acquired_money=CUPMoney('9.00'),
+                total_cost=CUPMoney('6.00'),
+                total_profit=CUPMoney('3.00'),
+                total_expense=CUPMoney('1.50'),
+                net_profit=CUPMoney('1.50')
+            ),
+            EconomicSummary(
+                initial_date=date(year=2001, month=1, day=1),
+                final_date=date(year=2001, month=1, day=3),
+                sale_quantity=1,
+                acquired_money=CUPMoney('3.00'),
+                total_cost=CUPMoney('2.00'),
+                total_profit=CUPMoney('1.00'),
+                total_expense=CUPMoney('0.00'),
+                net_profit=CUPMoney('1.00')
+            ),
+        ])
+
+    def test_get_economic_summaries_by_month_and_year(self):
+        self.insert_sales_and_expenses_for_bucket_tests()
+
+        month_summaries = self.economic_summary_repo.get_economic_summaries_on_date_range(
+            date(year=2000, month=11, day=1), date(year=2001, month=1, day=31), EconomicSummaryRepository.MONTH)
+        year_summaries = self.economic_summary_repo.get_economic_summaries_on_date_range(
+            date(year=2000, month=1, day=1), date(year=2001, month=12, day=31), EconomicSummaryRepository.YEAR)
+
+        self.assertEqual(month_summaries, [
+            self.economic_summary_repo.get_economic_summary_on_month(date(year=2000, month=11, day=1)),
+            self.economic_summary_repo.get_economic_summary_on_month(date(year=2000, month=12, day=1)),
+            self.economic_summary_repo.get_economic_summary_on_month(date(year=2001, month=1, day=1)),
+        ])
+        self.assertEqual(list(map(lambda a_summary: a_summary.sale_quantity, year_summaries)), [3, 1])
+        self.assertEqual(list(map(lambda a_summary: a_summary.final_date, year_summaries)),
+                         [date(year=2000, month=12, day=31), date(year=2001, month=12, day=31)])
+
+    def test_get_economic_summaries_uses_one_query_for_sales_and_one_for_expenses(self):
+        with record_executed_queries() as queries:
+            summaries = self.economic_summary_repo.get_economic_summaries_on_date_range(
+                date(year=2000, month=1, day=1), date(year=2000, month=12, day=31), EconomicSummaryRepository.DAY)
+
+        self.assertEqual(len(summaries), 366)
+        self.assertEqual(len(queries), 2)
+
+    def test_get_economic_summaries_with_invalid_bucket_raises_exception(self):
+        with self.assertRaises(ValueError):
+            self.economic_summary_repo.get_economic_summaries_on_date_range(
+                date(year=2000, month=1, day=1), date(year=2000, month=12, day=31), 'decade')
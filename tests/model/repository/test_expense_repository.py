@@ -1,13 +1,18 @@
 import unittest
 from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import Mock
+
+from model.entity.rows import ExpenseRow
 
 from model.repository.exc.expense import UniqueExpenseNameException, EmptyExpenseNameException, \
     NonPositiveExpenseMoneyException, NonExistentExpenseException
 from model.repository.expense import ExpenseFilter
+from model.repository.observer import DataChangedEvent
 from model.repository.factory import RepositoryFactory
 from model.util.monetary_types import CUPMoney
 from tests.util.general import TEST_DB_URL, delete_all_expenses_from_database, get_all_expenses_from_database, \
-    insert_one_expense_in_database, insert_expenses_in_database
+    insert_one_expense_in_database, insert_expenses_in_database, get_rollup_inconsistencies
 from tests.util.generators.expense import ExpenseGenerator
 
 
@@ -70,6 +75,20 @@ class TestExpenseRepository(unittest.TestCase):
         updated_expense_in_database = get_all_expenses_from_database()[0]
         self.assertEqual(updated_expense_in_database, updated_expense)
 
+    def test_update_expense_notifies_the_old_and_new_dates(self):
+        expense = insert_one_expense_in_database(ExpenseGenerator.generate_one_expense())
+        old_date = expense.date
+        expense.date = old_date - timedelta(days=1)
+        listener = Mock()
+        self.expense_repo.add_on_data_changed_listener(listener)
+
+        self.expense_repo.update_expense(expense)
+        self.expense_repo.remove_on_data_changed_listener(listener)
+
+        event, = listener.on_data_changed.call_args.args
+        self.assertEqual(event.get_ids(DataChangedEvent.EXPENSE, DataChangedEvent.UPDATED), {expense.id})
+        self.assertEqual(event.get_dates(DataChangedEvent.EXPENSE), {old_date, expense.date})
+
     def test_update_expense_with_unassigned_id_raises_exception(self):
         expense = ExpenseGenerator.generate_one_expense()
         expense.id = 1
@@ -91,6 +110,36 @@ class TestExpenseRepository(unittest.TestCase):
 
         self.assertRaises(NonPositiveExpenseMoneyException, self.expense_repo.update_expense, expense)
 
+    def test_daily_expense_totals_follow_expense_changes(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(4)
+        e1, e2, e3, e4 = expenses
+        e1.date = e2.date = date(year=2000, month=6, day=20)
+        e3.date = e4.date = date(year=2000, month=6, day=21)
+        for an_expense in expenses:
+            self.expense_repo.insert_expense(an_expense)
+
+        e1.date, e1.spent_money = date(year=2000, month=6, day=22), CUPMoney('7.25')
+        self.expense_repo.update_expense(e1)
+        self.expense_repo.delete_expenses([e3.id, e4.id])
+
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_get_total_expense_on_date_range(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(3)
+        e1, e2, e3 = expenses
+        e1.date, e1.spent_money = date(year=2000, month=6, day=19), CUPMoney('1.00')
+        e2.date, e2.spent_money = date(year=2000, month=6, day=20), CUPMoney('2.50')
+        e3.date, e3.spent_money = date(year=2000, month=6, day=30), CUPMoney('3.25')
+        insert_expenses_in_database(expenses)
+
+        total_expense = self.expense_repo.get_total_expense_on_date_range(date(year=2000, month=6, day=20),
+                                                                          date(year=2000, month=6, day=30))
+        empty_total = self.expense_repo.get_total_expense_on_date_range(date(year=2001, month=1, day=1),
+                                                                        date(year=2001, month=1, day=31))
+
+        self.assertEqual(total_expense, CUPMoney('5.75'))
+        self.assertEqual(empty_total, CUPMoney('0.00'))
+
     def test_get_expenses_by_filter_using_date_filtering(self):
         expenses = ExpenseGenerator.generate_expenses_by_quantity(5)
         exp1, exp2, exp3, exp4, exp5 = expenses
@@ -109,6 +158,19 @@ class TestExpenseRepository(unittest.TestCase):
 
         self.assertEqual(filtered_expense, [exp2, exp3, exp4])
 
+    def test_get_expense_rows_by_filter_returns_the_filtered_expenses_as_rows(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(2)
+        exp1, exp2 = expenses
+        exp1.date, exp1.spent_money = date(year=2000, month=6, day=1), CUPMoney('10.05')
+        exp2.date = date(year=2000, month=6, day=2)
+        insert_expenses_in_database(expenses)
+
+        date_filter = ExpenseFilter()
+        date_filter.maximum_date = date(year=2000, month=6, day=1)
+        filtered_rows = self.expense_repo.get_expense_rows_by_filter(date_filter)
+
+        self.assertEqual(filtered_rows, [ExpenseRow(exp1.id, exp1.name, exp1.description, Decimal('10.05'), exp1.date)])
+
     def test_get_expense_by_filter_find_expense_with_phrase_in_name(self):
         expenses = ExpenseGenerator.generate_expenses_by_quantity(3)
         exp1, exp2, exp3 = expenses
@@ -141,4 +203,69 @@ class TestExpenseRepository(unittest.TestCase):
         phrase_filter.phrase = 'bombillo'
         filtered_expenses = self.expense_repo.get_expenses_by_filter(phrase_filter)
 
-        self.assertEqual(filtered_expenses, [exp1, exp3])
\ No newline at end of file
+        self.assertEqual(filtered_expenses, [exp1, exp3])
+
+    def test_get_expenses_by_filter_ranks_the_most_relevant_expenses_first(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(3)
+        exp1, exp2, exp3 = expenses
+        exp1.name = 'Pintura'
+        exp1.description = 'Para las paredes del almacén y la tienda'
+        exp2.name = 'Salario'
+        exp2.description = ''
+        exp3.name = 'Pintura blanca'
+        exp3.description = 'Pintura para el local'
+        insert_expenses_in_database(expenses)
+
+        phrase_filter = ExpenseFilter()
+        phrase_filter.phrase = 'pint'
+        filtered_expenses = self.expense_repo.get_expenses_by_filter(phrase_filter)
+
+        self.assertEqual(list(map(lambda an_expense: an_expense.id, filtered_expenses)), [exp3.id, exp1.id])
+
+    def test_get_expenses_by_filter_requires_every_word_and_ignores_accents(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(3)
+        exp1, exp2, exp3 = expenses
+        exp1.name = 'Camión de carga'
+        exp1.description = 'Alquiler del último mes'
+        exp2.name = 'Camión de carga'
+        exp2.description = 'Combustible'
+        exp3.name = 'Alquiler'
+        exp3.description = ''
+        insert_expenses_in_database(expenses)
+
+        phrase_filter = ExpenseFilter()
+        phrase_filter.phrase = 'CAMION alquil'
+        filtered_expenses = self.expense_repo.get_expenses_by_filter(phrase_filter)
+
+        self.assertEqual(filtered_expenses, [exp1])
+
+    def test_get_expenses_by_filter_finds_updated_and_not_deleted_expenses(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(2)
+        exp1, exp2 = expenses
+        exp1.name = 'Sillas'
+        exp1.description = ''
+        exp2.name = 'Mesas'
+        exp2.description = ''
+        insert_expenses_in_database(expenses)
+        exp1.name = 'Bombillos'
+        self.expense_repo.update_expense(exp1)
+        self.expense_repo.delete_expenses([exp2.id])
+
+        phrase_filter = ExpenseFilter()
+        for a_phrase, expected_expenses in (('sillas', []), ('bombillos', [exp1]), ('mesas', [])):
+            phrase_filter.phrase = a_phrase
+            filtered_expenses = self.expense_repo.get_expenses_by_filter(phrase_filter)
+            self.assertEqual(filtered_expenses, expected_expenses)
+
+    def test_expense_filter_matches_phrase_like_the_database(self):
+        expense = ExpenseGenerator.generate_one_expense()
+        expense.name = 'Camión de carga'
+        expense.description = 'Alquiler del último mes'
+        phrase_filter = ExpenseFilter()
+
+        for a_phrase in ('camion', 'ULTIMO alq', '', 'carga mes'):
+            phrase_filter.phrase = a_phrase
+            self.assertTrue(phrase_filter.is_it_match(expense))
+        for a_phrase in ('amion', 'camion combustible'):
+            phrase_filter.phrase = a_phrase
+            self.assertFalse(phrase_filter.is_it_match(expense))
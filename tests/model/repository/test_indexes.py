@@ -0,0 +1,87 @@
+from datetime import date
+from unittest import TestCase
+
+from model.repository.factory import RepositoryFactory
+from model.repository.sale import SaleFilter
+from tests.util.general import TEST_DB_URL, record_executed_queries, get_query_plan
+
+
+class TestIndexes(TestCase):
+
+    def setUp(self):
+        self.sale_repo = RepositoryFactory.get_sale_repository(TEST_DB_URL)
+        self.grouped_sales_repo = RepositoryFactory.get_sales_grouped_by_product_repository(TEST_DB_URL)
+        self.economic_summary_repo = RepositoryFactory.get_economic_summary_repository(TEST_DB_URL)
+        self.ticket_repo = RepositoryFactory.get_ticket_repository(TEST_DB_URL)
+
+    def tearDown(self):
+        RepositoryFactory.close_session()
+
+    def get_plans_of_queries_executed_by(self, a_callable) -> list:
+        with record_executed_queries() as queries:
+            a_callable()
+        return list(map(lambda a_query: get_query_plan(*a_query), queries))
+
+    def test_get_sales_by_filter_using_product_uses_product_index(self):
+        the_filter = SaleFilter()
+        the_filter.product_id_list = [1]
+        the_filter.minimum_date = date(year=2000, month=6, day=1)
+
+        plan, = self.get_plans_of_queries_executed_by(lambda: self.sale_repo.get_sales_by_filter(the_filter))
+
+        self.assertIn('ix_sales_product_id_date', plan)
+
+    def test_get_sales_by_filter_using_dates_uses_date_index(self):
+        the_filter = SaleFilter()
+        the_filter.minimum_date = date(year=2000, month=6, day=1)
+        the_filter.maximum_date = date(year=2000, month=6, day=30)
+
+        plan, = self.get_plans_of_queries_executed_by(lambda: self.sale_repo.get_sales_by_filter(the_filter))
+
+        self.assertIn('ix_sales_date_product_id', plan)
+
+    def test_get_groups_on_date_range_searches_daily_product_sales_by_date(self):
+        plan, = self.get_plans_of_queries_executed_by(
+            lambda: self.grouped_sales_repo.get_groups_on_date_range(date(year=2000, month=6, day=1),
+                                                                     date(year=2000, month=6, day=30)))
+
+        self.assertIn('SEARCH daily_product_sales USING INDEX sqlite_autoindex_daily_product_sales_1 (date>? AND date<?)',
+                      plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_get_economic_summary_on_day_uses_date_indexes(self):
+        sale_plan, expense_plan = self.get_plans_of_queries_executed_by(
+            lambda: self.economic_summary_repo.get_economic_summary_on_day(date(year=2000, month=6, day=1)))
+
+        self.assertIn('sqlite_autoindex_daily_product_sales_1', sale_plan)
+        self.assertIn('sqlite_autoindex_daily_expense_totals_1', expense_plan)
+
+    def test_ticket_queries_search_tickets_by_date_or_time(self):
+        a_day = date(year=2000, month=6, day=1)
+        for a_query, index in ((lambda: self.ticket_repo.get_tickets_on_date(a_day), 'ix_tickets_date (date=?)'),
+                               (lambda: self.ticket_repo.get_ticket_summaries_by_day(a_day, a_day),
+                                'ix_tickets_date (date>? AND date<?)'),
+                               (lambda: self.ticket_repo.get_ticket_summaries_by_hour(a_day),
+                                'ix_tickets_created_at (created_at>? AND created_at<?)')):
+            plan, = self.get_plans_of_queries_executed_by(a_query)
+
+            self.assertIn('tickets USING', plan)
+            self.assertIn(f'INDEX {index}', plan)
+
+    def test_get_sales_heatmap_only_reads_the_time_index(self):
+        plan, = self.get_plans_of_queries_executed_by(
+            lambda: self.sale_repo.get_sales_heatmap(date(year=2000, month=6, day=1), date(year=2000, month=6, day=30)))
+
+        self.assertIn('COVERING INDEX ix_sales_sold_at (sold_at>? AND sold_at<?)', plan)
+
+    def test_get_sales_page_by_filter_of_a_product_sorted_by_date_reads_the_product_index(self):
+        the_filter = SaleFilter()
+        the_filter.product_id_list = [1]
+        the_filter.sorted_by = SaleFilter.SALE_DATE
+        the_filter.ascending_order = False
+
+        plan, = self.get_plans_of_queries_executed_by(
+            lambda: self.sale_repo.get_sales_page_by_filter(the_filter, 100, 10, date(year=2000, month=6, day=1)))
+
+        self.assertIn('INDEX ix_sales_product_id_date (product_id=? AND date<?)', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
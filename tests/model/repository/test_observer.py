@@ -0,0 +1,33 @@
+import unittest
+from datetime import date
+
+from model.repository.observer import DataChangedEvent
+
+
+class TestDataChangedEvent(unittest.TestCase):
+
+    def test_changes_of_same_entity_and_operation_are_coalesced(self):
+        event = DataChangedEvent()\
+            .add_change(DataChangedEvent.SALE, DataChangedEvent.INSERTED, [1, 2], [date(2022, 1, 1)])\
+            .add_change(DataChangedEvent.SALE, DataChangedEvent.INSERTED, [2, 3], [date(2022, 1, 2)])
+
+        self.assertEqual(event.get_ids(DataChangedEvent.SALE, DataChangedEvent.INSERTED), {1, 2, 3})
+        self.assertEqual(event.get_dates(DataChangedEvent.SALE), {date(2022, 1, 1), date(2022, 1, 2)})
+        self.assertEqual(event.get_entities(), {DataChangedEvent.SALE})
+
+    def test_merge_keeps_the_last_operation_of_each_id(self):
+        first_event = DataChangedEvent()\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.INSERTED, [1])\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED, [2])
+        later_event = DataChangedEvent()\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED, [1])\
+            .add_change(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED, [2])\
+            .add_change(DataChangedEvent.EXPENSE, DataChangedEvent.INSERTED, [7], [date(2022, 3, 1)])
+
+        event = first_event.merge(later_event)
+
+        self.assertEqual(event.get_ids(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED), {1})
+        self.assertEqual(event.get_inserted_or_updated_ids(DataChangedEvent.PRODUCT), {2})
+        self.assertTrue(event.has_dates_between(DataChangedEvent.EXPENSE, date(2022, 2, 1), date(2022, 3, 31)))
+        self.assertFalse(event.has_dates_between(DataChangedEvent.EXPENSE, date(2022, 4, 1), date(2022, 4, 30)))
+        self.assertEqual(first_event.get_ids(DataChangedEvent.PRODUCT, DataChangedEvent.INSERTED), {1})
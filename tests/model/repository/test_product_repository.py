@@ -1,13 +1,21 @@
 import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock
+
+from model.connection import MAX_BOUND_PARAMETERS
+
+from model.entity.rows import ProductRow
 from model.repository.exc.product import UniqueProductNameException, NonExistentProductException, \
     InvalidProductQuantityException, NoPositivePriceException, EmptyProductNameException, NegativeCostException
 from model.repository.factory import RepositoryFactory
+from model.repository.observer import DataChangedEvent
 from model.repository.product import ProductFilter
 from model.util.monetary_types import CUPMoney
 from tests.util.generators.product import ProductGenerator
 from tests.util.general import TEST_DB_URL, get_all_products_in_database, insert_product_and_return_it, \
     get_one_product_from_database, insert_products_in_database_and_return_them, delete_all_products_from_database, \
-    insert_sales_and_return_them, get_all_sales_from_database
+    insert_sales_and_return_them, get_all_sales_from_database, get_rollup_inconsistencies
 from tests.util.generators.sale import SaleGenerator
 
 
@@ -120,6 +128,47 @@ class TestProductRepository(unittest.TestCase):
         self.product_repository.delete_products([product.id])
 
         self.assertEqual(get_all_sales_from_database(), [])
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_deleting_products_notifies_the_days_of_their_sales_without_their_ids(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        sales[0].date = sales[1].date = date(year=2000, month=6, day=20)
+        sales[2].date = date(year=2000, month=6, day=22)
+        insert_sales_and_return_them(sales)
+        listener = Mock()
+        self.product_repository.add_on_data_changed_listener(listener)
+
+        self.product_repository.delete_products([product.id])
+        self.product_repository.remove_on_data_changed_listener(listener)
+
+        event, = listener.on_data_changed.call_args.args
+        self.assertEqual(event.get_ids(DataChangedEvent.PRODUCT, DataChangedEvent.DELETED), {product.id})
+        self.assertEqual(event.get_ids(DataChangedEvent.SALE, DataChangedEvent.DELETED), set())
+        self.assertEqual(event.get_dates(DataChangedEvent.SALE),
+                         {date(year=2000, month=6, day=20), date(year=2000, month=6, day=22)})
+
+    def test_delete_more_products_than_the_bound_parameter_limit(self):
+        products = ProductGenerator.generate_products_by_quantity(MAX_BOUND_PARAMETERS + 1)
+        for index, a_product in enumerate(products):
+            a_product.name = f'producto {index}'
+        products = insert_products_in_database_and_return_them(products)
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(products[-1], 2))
+
+        self.product_repository.delete_products(list(map(lambda a_product: a_product.id, products)))
+
+        self.assertEqual(get_all_products_in_database(), [])
+        self.assertEqual(get_all_sales_from_database(), [])
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_deleting_a_product_also_deletes_its_daily_sales(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 2))
+
+        self.product_repository.delete_product(product)
+
+        self.assertEqual(get_rollup_inconsistencies(), {})
 
     def test_product_is_updated_successfully(self):
         old_product = ProductGenerator.generate_one_product()
@@ -223,6 +272,17 @@ class TestProductRepository(unittest.TestCase):
         retrieved_products = self.product_repository.get_all_products()
         self.assertEqual(products, retrieved_products)
 
+    def test_get_all_product_rows_has_the_amounts_as_decimals(self):
+        product = ProductGenerator.generate_one_product()
+        product.price, product.cost = CUPMoney('1250.50'), CUPMoney('1000.25')
+        product = insert_product_and_return_it(product)
+
+        product_rows = self.product_repository.get_all_product_rows()
+
+        self.assertEqual(product_rows, [ProductRow(product.id, product.name, Decimal('1250.50'), Decimal('1000.25'),
+                                                   product.quantity)])
+        self.assertEqual(product_rows[0].profit, Decimal('250.25'))
+
     def test_get_products_by_filter_id(self):
         product = ProductGenerator.generate_one_product()
         product = insert_product_and_return_it(product)
@@ -242,11 +302,22 @@ class TestProductRepository(unittest.TestCase):
         product_1, product_2 = products
 
         the_filter = ProductFilter()
-        the_filter.name = 'TC'
+        the_filter.name = 'WAT'
         filtered_products = self.product_repository.get_products_by_filter(the_filter)
 
         self.assertEqual([product_2], filtered_products)
 
+    def test_get_products_by_filter_using_name_without_words_finds_nothing(self):
+        products = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(2))
+
+        punctuation_filter = ProductFilter()
+        punctuation_filter.name = '¿?!.'
+        blank_filter = ProductFilter()
+        blank_filter.name = '  '
+
+        self.assertEqual(self.product_repository.get_products_by_filter(punctuation_filter), [])
+        self.assertEqual(len(self.product_repository.get_products_by_filter(blank_filter)), len(products))
+
     def test_get_products_by_filter_using_description(self):
         products = ProductGenerator.generate_products_by_quantity(3)
         product_0, product_1, product_2 = products
@@ -256,10 +327,28 @@ class TestProductRepository(unittest.TestCase):
         products = insert_products_in_database_and_return_them(products)
 
         the_filter = ProductFilter()
-        the_filter.description = 'LL'
+        the_filter.description = 'p'
         filtered_products = self.product_repository.get_products_by_filter(the_filter)
 
-        self.assertEqual([product_1, product_2], filtered_products)
+        self.assertEqual([product_0, product_2], filtered_products)
+
+    def test_get_products_by_filter_using_name_and_description_finds_updated_products(self):
+        products = ProductGenerator.generate_products_by_quantity(2)
+        product_0, product_1 = products
+        product_0.name = 'Running shoes'
+        product_0.description = 'Blue'
+        product_1.name = 'Walking shoes'
+        product_1.description = 'Red'
+        product_0, product_1 = insert_products_in_database_and_return_them(products)
+        product_0.description = 'Red'
+        self.product_repository.update_product(product_0)
+
+        the_filter = ProductFilter()
+        the_filter.name = 'shoe'
+        the_filter.description = 'red'
+        filtered_products = self.product_repository.get_products_by_filter(the_filter)
+
+        self.assertEqual([product_0, product_1], filtered_products)
 
     def test_get_products_by_filter_using_price_range(self):
         products = ProductGenerator.generate_products_by_quantity(4)
@@ -277,6 +366,21 @@ class TestProductRepository(unittest.TestCase):
 
         self.assertEqual([product_0, product_1, product_2], filtered_products)
 
+    def test_get_products_by_filter_compares_prices_numerically(self):
+        products = ProductGenerator.generate_products_by_quantity(3)
+        product_0, product_1, product_2 = products
+        product_0.price = CUPMoney('9.00')
+        product_1.price = CUPMoney('10.00')
+        product_2.price = CUPMoney('100.50')
+        products = insert_products_in_database_and_return_them(products)
+
+        the_filter = ProductFilter()
+        the_filter.more_than_price = CUPMoney('9.50')
+        the_filter.less_than_price = CUPMoney('100.50')
+        filtered_products = self.product_repository.get_products_by_filter(the_filter)
+
+        self.assertEqual([product_1, product_2], filtered_products)
+
     def test_get_products_by_filter_using_profit_range(self):
         products = ProductGenerator.generate_products_by_quantity(4)
         product_0, product_1, product_2, product_3 = products
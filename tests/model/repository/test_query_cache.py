@@ -0,0 +1,118 @@
+import unittest
+from datetime import date
+
+from model.repository.factory import RepositoryFactory
+from model.repository.observer import DataChangedEvent
+from model.repository.query_cache import QueryCache
+from model.util.monetary_types import CUPMoney
+from tests.util.general import TEST_DB_URL, delete_all_products_from_database, delete_all_expenses_from_database, \
+    insert_product_and_return_it, record_executed_queries
+from tests.util.generators.expense import ExpenseGenerator
+from tests.util.generators.product import ProductGenerator
+from tests.util.generators.sale import SaleGenerator
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_repeated_key_is_loaded_once_and_counted_as_hit(self):
+        query_cache = QueryCache()
+        loads = []
+
+        first_result = query_cache.get_or_load(('kind', 1), (QueryCache.SALES,), lambda: loads.append(1) or 'result')
+        second_result = query_cache.get_or_load(('kind', 1), (QueryCache.SALES,), lambda: loads.append(1) or 'other')
+
+        self.assertEqual((first_result, second_result), ('result', 'result'))
+        self.assertEqual(len(loads), 1)
+        self.assertEqual((query_cache.get_hit_count(), query_cache.get_miss_count()), (1, 1))
+
+    def test_least_recently_used_result_is_discarded_when_cache_is_full(self):
+        query_cache = QueryCache(maximum_size=2)
+        query_cache.get_or_load(('kind', 1), (QueryCache.SALES,), lambda: 1)
+        query_cache.get_or_load(('kind', 2), (QueryCache.SALES,), lambda: 2)
+        query_cache.get_or_load(('kind', 1), (QueryCache.SALES,), lambda: 1)
+
+        query_cache.get_or_load(('kind', 3), (QueryCache.SALES,), lambda: 3)
+
+        self.assertEqual(query_cache.get_size(), 2)
+        self.assertEqual(query_cache.get_or_load(('kind', 1), (QueryCache.SALES,), lambda: 'reloaded'), 1)
+        self.assertEqual(query_cache.get_or_load(('kind', 2), (QueryCache.SALES,), lambda: 'reloaded'), 'reloaded')
+
+    def test_invalidate_discards_only_results_that_read_the_table(self):
+        query_cache = QueryCache()
+        query_cache.get_or_load(('sales',), (QueryCache.SALES, QueryCache.PRODUCTS), lambda: 'sales')
+        query_cache.get_or_load(('expenses',), (QueryCache.EXPENSES,), lambda: 'expenses')
+
+        query_cache.on_data_changed(
+            DataChangedEvent().add_change(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED, [1]))
+
+        self.assertEqual(query_cache.get_or_load(('sales',), (QueryCache.SALES,), lambda: 'new sales'), 'new sales')
+        self.assertEqual(query_cache.get_or_load(('expenses',), (QueryCache.EXPENSES,), lambda: 'new'), 'expenses')
+
+    def test_result_loaded_while_its_table_changes_is_not_stored(self):
+        query_cache = QueryCache()
+
+        def load_while_sales_change():
+            query_cache.invalidate(QueryCache.SALES)
+            return 'old sales'
+
+        query_cache.get_or_load(('sales',), (QueryCache.SALES,), load_while_sales_change)
+
+        self.assertEqual(query_cache.get_size(), 0)
+
+    def test_cache_without_size_does_not_store_results(self):
+        query_cache = QueryCache(maximum_size=0)
+        query_cache.get_or_load(('kind',), (QueryCache.SALES,), lambda: 'result')
+
+        self.assertEqual(query_cache.get_or_load(('kind',), (QueryCache.SALES,), lambda: 'new'), 'new')
+        self.assertRaises(ValueError, QueryCache, -1)
+
+
+class TestRepositoryQueryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.query_cache = RepositoryFactory.get_query_cache(TEST_DB_URL)
+        self.sale_repo = RepositoryFactory.get_sale_repository(TEST_DB_URL)
+        self.expense_repo = RepositoryFactory.get_expense_repository(TEST_DB_URL)
+        self.grouped_sales_repo = RepositoryFactory.get_sales_grouped_by_product_repository(TEST_DB_URL)
+        self.summary_repo = RepositoryFactory.get_economic_summary_repository(TEST_DB_URL)
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        self.product = insert_product_and_return_it(product)
+
+    def tearDown(self):
+        RepositoryFactory.close_session()
+        delete_all_products_from_database()
+        delete_all_expenses_from_database()
+
+    def test_repeated_summary_does_not_query_the_database(self):
+        self.summary_repo.get_economic_summary_on_day(SaleGenerator.DEFAULT_DATE)
+        hit_count = self.query_cache.get_hit_count()
+
+        with record_executed_queries() as queries:
+            self.summary_repo.get_economic_summary_on_day(SaleGenerator.DEFAULT_DATE)
+
+        self.assertEqual(queries, [])
+        self.assertEqual(self.query_cache.get_hit_count(), hit_count + 1)
+
+    def test_inserted_sale_invalidates_the_sale_groups(self):
+        self.assertEqual(self.grouped_sales_repo.get_groups_on_year(SaleGenerator.DEFAULT_DATE), [])
+
+        self.sale_repo.insert_sales(SaleGenerator.generate_one_sale_from_product(self.product), 2)
+
+        group, = self.grouped_sales_repo.get_groups_on_year(SaleGenerator.DEFAULT_DATE)
+        self.assertEqual(group.sale_quantity, 2)
+
+    def test_inserted_expense_invalidates_expense_totals_but_not_the_sale_groups(self):
+        today = date.today()
+        self.grouped_sales_repo.get_groups_on_date_range(today, today)
+        self.assertEqual(self.expense_repo.get_total_expense_on_date_range(today, today), CUPMoney('0.00'))
+
+        self.expense_repo.insert_expense(ExpenseGenerator.generate_one_expense())
+
+        self.assertEqual(self.expense_repo.get_total_expense_on_date_range(today, today),
+                         ExpenseGenerator.DEFAULT_SPENT_MONEY)
+        self.assertEqual(self.summary_repo.get_economic_summary_on_day(today).total_expense,
+                         ExpenseGenerator.DEFAULT_SPENT_MONEY)
+        with record_executed_queries() as queries:
+            self.grouped_sales_repo.get_groups_on_date_range(today, today)
+        self.assertEqual(queries, [])
@@ -0,0 +1,61 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from model.repository.factory import RepositoryFactory
+from model.repository.product import ProductFilter
+from tests.util.general import TEST_DB_URL, delete_all_products_from_database, insert_product_and_return_it, \
+    get_one_product_from_database
+from tests.util.generators.product import ProductGenerator
+from tests.util.generators.sale import SaleGenerator
+
+
+class TestRepositoryFactory(unittest.TestCase):
+
+    def setUp(self):
+        self.product_repository = RepositoryFactory.get_product_repository(TEST_DB_URL)
+        self.sale_repository = RepositoryFactory.get_sale_repository(TEST_DB_URL)
+
+    def tearDown(self):
+        RepositoryFactory.close_session()
+        delete_all_products_from_database()
+
+    def get_product_by_id(self, product_id: int):
+        a_filter = ProductFilter()
+        a_filter.id = product_id
+        return self.product_repository.get_products_by_filter(a_filter)[0]
+
+    def test_each_thread_works_with_its_own_session(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            products = list(executor.map(lambda _: self.get_product_by_id(product.id), range(2)))
+
+        self.assertIsNot(products[0], products[1])
+        self.assertIsNot(products[0], self.get_product_by_id(product.id))
+
+    def test_reads_see_changes_made_by_other_threads(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        product_read_before_sales = self.get_product_by_id(product.id)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(self.sale_repository.insert_sales, sale, 4).result()
+
+        self.assertEqual(self.get_product_by_id(product.id).quantity, 6)
+        self.assertEqual(product_read_before_sales.quantity, 6)
+
+    def test_concurrent_sales_do_not_lose_updates(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 20
+        product = insert_product_and_return_it(product)
+
+        def sell_one_unit(_):
+            self.sale_repository.insert_sales(SaleGenerator.generate_one_sale_from_product(product), 1)
+            RepositoryFactory.remove_session()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(sell_one_unit, range(8)))
+
+        self.assertEqual(get_one_product_from_database().quantity, 12)
@@ -1,15 +1,21 @@
 import unittest
-from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock
+from sqlalchemy.exc import InvalidRequestError
 from model.repository.exc.product import NonExistentProductException, NoPositivePriceException, NegativeCostException
 from model.repository.exc.sale import NoEnoughProductQuantityException, NonExistentSaleException, \
-    ChangeProductIdInSaleException
+    ChangeProductIdInSaleException, NoEnoughSaleUnitsException
 from model.repository.factory import RepositoryFactory
-from model.repository.sale import SaleFilter
+from model.repository.observer import DataChangedEvent
+from model.repository.sale import SaleFilter, SaleRepository
+from model.entity.rows import SaleRow
+from model.entity.sales_heatmap import SalesHeatmap
 from model.util.monetary_types import CUPMoney
 from tests.util.general import TEST_DB_URL, delete_all_products_from_database, insert_product_and_return_it, \
     get_all_sales_from_database, assert_sale_lists_are_equal_ignoring_id, get_one_product_from_database, \
     insert_sale_and_return_it, get_one_sale_from_database, insert_products_in_database_and_return_them, \
-    insert_sales_and_return_them, get_all_products_in_database
+    insert_sales_and_return_them, get_all_products_in_database, get_rollup_inconsistencies, record_executed_queries
 from tests.util.generators.product import ProductGenerator
 from tests.util.generators.sale import SaleGenerator
 
@@ -29,11 +35,11 @@ class TestSaleRepository(unittest.TestCase):
         product = insert_product_and_return_it(product)
         sale = SaleGenerator.generate_one_sale_from_product(product)
 
+        sale.quantity = 3
         self.sale_repository.insert_sales(sale, 3)
 
         inserted_sales = get_all_sales_from_database()
-        correct_sales = [sale] * 3
-        assert_sale_lists_are_equal_ignoring_id(inserted_sales, correct_sales)
+        assert_sale_lists_are_equal_ignoring_id(inserted_sales, [sale])
 
     def test_sale_insertion_with_zero_quantity_raises_exception(self):
         product = ProductGenerator.generate_one_product()
@@ -84,6 +90,116 @@ class TestSaleRepository(unittest.TestCase):
 
         self.assertRaises(NegativeCostException, self.sale_repository.insert_sales, sale, 1)
 
+    def test_concurrent_sales_never_sell_more_units_than_available(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 60
+        product = insert_product_and_return_it(product)
+
+        def try_to_sell_units(units: int) -> bool:
+            try:
+                self.sale_repository.insert_sales(SaleGenerator.generate_one_sale_from_product(product), units)
+                return True
+            except NoEnoughProductQuantityException:
+                return False
+            finally:
+                RepositoryFactory.remove_session()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            attempted_units = [1 + index % 3 for index in range(80)]
+            were_sold = list(executor.map(try_to_sell_units, attempted_units))
+
+        sold_units = sum(units for units, was_sold in zip(attempted_units, were_sold) if was_sold)
+        self.assertEqual(sum(map(lambda a_sale: a_sale.quantity, get_all_sales_from_database())), sold_units)
+        self.assertEqual(get_one_product_from_database().quantity, 60 - sold_units)
+        self.assertGreater(sold_units, 57)
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_selling_more_units_than_available_changes_nothing(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 2
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+
+        with self.assertRaises(NoEnoughProductQuantityException) as context:
+            self.sale_repository.insert_sales(sale, 3)
+
+        self.assertEqual(context.exception.get_remaining_quantity(), 2)
+        self.assertEqual(get_one_product_from_database().quantity, 2)
+        self.assertEqual(get_all_sales_from_database(), [])
+
+    def test_checkout_inserts_all_lines_under_one_ticket(self):
+        products = ProductGenerator.generate_products_by_quantity(2)
+        p1, p2 = products
+        p1.quantity, p2.quantity = 10, 4
+        p1, p2 = insert_products_in_database_and_return_them(products)
+        lines = SaleGenerator.generate_sales_from_product(p1, 2) + [SaleGenerator.generate_one_sale_from_product(p2)]
+        lines[0].quantity, lines[1].quantity, lines[2].quantity = 3, 2, 4
+
+        with record_executed_queries() as queries:
+            ticket = self.sale_repository.checkout(lines)
+
+        sales = get_all_sales_from_database()
+        self.assertEqual(sales, ticket.sales)
+        self.assertEqual(list(map(lambda a_sale: a_sale.ticket_id, sales)), [ticket.id] * 3)
+        self.assertEqual(list(map(lambda a_sale: a_sale.quantity, sales)), [3, 2, 4])
+        p1, p2 = get_all_products_in_database()
+        self.assertEqual((p1.quantity, p2.quantity), (5, 0))
+        self.assertEqual(get_rollup_inconsistencies(), {})
+        stock_queries = list(filter(lambda a_query: a_query[0].startswith('SELECT products.id, products.quantity'),
+                                    queries))
+        self.assertEqual(len(stock_queries), 1)
+
+    def test_checkout_without_enough_units_of_one_product_changes_nothing(self):
+        products = ProductGenerator.generate_products_by_quantity(2)
+        p1, p2 = products
+        p1.quantity, p2.quantity = 10, 1
+        p1, p2 = insert_products_in_database_and_return_them(products)
+        lines = [SaleGenerator.generate_one_sale_from_product(p1), SaleGenerator.generate_one_sale_from_product(p2)]
+        lines[1].quantity = 2
+
+        with self.assertRaises(NoEnoughProductQuantityException) as context:
+            self.sale_repository.checkout(lines)
+
+        self.assertEqual(context.exception.get_product_id(), p2.id)
+        self.assertEqual(context.exception.get_remaining_quantity(), 1)
+        self.assertEqual(get_all_sales_from_database(), [])
+        self.assertEqual(list(map(lambda a_product: a_product.quantity, get_all_products_in_database())), [10, 1])
+
+    def test_sales_are_inserted_with_their_time(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        checkout_time = datetime(year=2000, month=6, day=20, hour=15, minute=30)
+
+        self.sale_repository.insert_sales(sale, 1)
+        ticket = self.sale_repository.checkout([SaleGenerator.generate_one_sale_from_product(product)],
+                                               created_at=checkout_time)
+
+        inserted_sale = get_all_sales_from_database()[0]
+        self.assertEqual(inserted_sale.sold_at.date(), inserted_sale.date)
+        self.assertEqual(ticket.sales[0].sold_at, checkout_time)
+
+    def test_sales_of_a_past_day_are_inserted_without_time(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = date(year=2000, month=6, day=20)
+
+        self.sale_repository.insert_sales(sale, 1)
+
+        self.assertIsNone(get_one_sale_from_database().sold_at)
+        self.assertEqual(self.sale_repository.get_sales_heatmap(sale.date, sale.date),
+                         SalesHeatmap(sale.date, sale.date))
+
+    def test_checkout_with_nonexistent_product_raises_exception(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        lines = SaleGenerator.generate_sales_from_product(product, 2)
+        lines[1].product_id = product.id + 1
+
+        self.assertRaises(NonExistentProductException, self.sale_repository.checkout, lines)
+        self.assertEqual(get_all_sales_from_database(), [])
+
+    def test_checkout_without_lines_raises_exception(self):
+        self.assertRaises(ValueError, self.sale_repository.checkout, [])
+
     def test_sales_are_deleted_successfully(self):
         product = ProductGenerator.generate_one_product()
         product = insert_product_and_return_it(product)
@@ -96,6 +212,56 @@ class TestSaleRepository(unittest.TestCase):
         remaining_sales = get_all_sales_from_database()
         self.assertEqual(remaining_sales, [s2])
 
+    def test_deleting_sale_lines_restores_all_their_units(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 0
+        product = insert_product_and_return_it(product)
+        sales = SaleGenerator.generate_sales_from_product(product, 2)
+        s1, s2 = sales
+        s1.quantity, s2.quantity = 3, 4
+        insert_sales_and_return_them(sales)
+
+        self.sale_repository.delete_sales([s1.id, s2.id])
+
+        product = get_one_product_from_database()
+        self.assertEqual(product.quantity, 7)
+
+    def test_undo_some_units_of_a_sale(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 0
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.quantity = 5
+        sale = insert_sale_and_return_it(sale)
+
+        self.sale_repository.undo_sale_units(sale, 2)
+
+        sale.quantity = 3
+        self.assertEqual(get_all_sales_from_database(), [sale])
+        self.assertEqual(get_one_product_from_database().quantity, 2)
+
+    def test_undo_all_units_of_a_sale_deletes_it(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 0
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.quantity = 5
+        sale = insert_sale_and_return_it(sale)
+
+        self.sale_repository.undo_sale_units(sale, 5)
+
+        self.assertEqual(get_all_sales_from_database(), [])
+        self.assertEqual(get_one_product_from_database().quantity, 5)
+
+    def test_undo_more_units_than_sold_raises_exception(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.quantity = 2
+        sale = insert_sale_and_return_it(sale)
+
+        self.assertRaises(NoEnoughSaleUnitsException, self.sale_repository.undo_sale_units, sale, 3)
+
     def test_sale_is_deleted_successfully(self):
         product = ProductGenerator.generate_one_product()
         product = insert_product_and_return_it(product)
@@ -163,6 +329,75 @@ class TestSaleRepository(unittest.TestCase):
         expected_p1, expected_p2 = get_all_products_in_database()
         self.assertTrue(expected_p1.quantity == 2 and expected_p2.quantity == 3)
 
+    def test_deleting_more_sales_than_the_parameter_limit_restores_stock_per_product(self):
+        products = ProductGenerator.generate_products_by_quantity(2)
+        p1, p2 = products
+        p1.quantity, p2.quantity = 0, 5
+        p1, p2 = insert_products_in_database_and_return_them(products)
+        sales = SaleGenerator.generate_sales_from_product(p1, 1200) + SaleGenerator.generate_sales_from_product(p2, 900)
+        for index, a_sale in enumerate(sales):
+            a_sale.date = self.TODAY_DATE - timedelta(days=index % 7)
+            a_sale.quantity = 1 + index % 3
+        sales = insert_sales_and_return_them(sales)
+        kept_sale = sales.pop()
+
+        with record_executed_queries() as queries:
+            self.sale_repository.delete_sales(list(map(lambda a_sale: a_sale.id, sales)))
+
+        p1, p2 = get_all_products_in_database()
+        self.assertEqual((p1.quantity, p2.quantity), (2400, 5 + 1800 - kept_sale.quantity))
+        self.assertEqual(get_all_sales_from_database(), [kept_sale])
+        self.assertEqual(get_rollup_inconsistencies(), {})
+        product_updates = list(filter(lambda a_query: a_query[0].startswith('UPDATE products'), queries))
+        self.assertEqual(len(product_updates), 2)
+        self.assertLess(len(queries), 50)
+
+    def test_deleting_sales_notifies_listeners_once(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        sales = insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 3))
+        listener = Mock()
+        self.sale_repository.add_on_data_changed_listener(listener)
+
+        sale_ids = list(map(lambda a_sale: a_sale.id, sales))
+        self.sale_repository.delete_sales(sale_ids + sale_ids[:1])
+        self.sale_repository.remove_on_data_changed_listener(listener)
+
+        listener.on_data_changed.assert_called_once()
+        event, = listener.on_data_changed.call_args.args
+        self.assertEqual(event.get_ids(DataChangedEvent.SALE, DataChangedEvent.DELETED),
+                         set(map(lambda a_sale: a_sale.id, sales)))
+        self.assertEqual(event.get_dates(DataChangedEvent.SALE), {SaleGenerator.DEFAULT_DATE})
+        self.assertEqual(event.get_ids(DataChangedEvent.PRODUCT, DataChangedEvent.UPDATED), {product.id})
+
+    def test_updating_a_sale_date_notifies_both_dates(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sale = insert_sale_and_return_it(SaleGenerator.generate_one_sale_from_product(product))
+        old_date = sale.date
+        sale.date = old_date - timedelta(days=3)
+        listener = Mock()
+        self.sale_repository.add_on_data_changed_listener(listener)
+
+        self.sale_repository.update_sale(sale)
+        self.sale_repository.remove_on_data_changed_listener(listener)
+
+        event, = listener.on_data_changed.call_args.args
+        self.assertEqual(event.get_ids(DataChangedEvent.SALE, DataChangedEvent.UPDATED), {sale.id})
+        self.assertEqual(event.get_dates(DataChangedEvent.SALE), {old_date, sale.date})
+        self.assertFalse(event.has_changes_of(DataChangedEvent.EXPENSE))
+
+    def test_deleting_sales_with_a_nonexistent_id_changes_nothing(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 0
+        product = insert_product_and_return_it(product)
+        sales = insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 1500))
+        sale_ids = list(map(lambda a_sale: a_sale.id, sales))
+
+        self.assertRaises(NonExistentSaleException, self.sale_repository.delete_sales, sale_ids + [len(sales) + 1])
+
+        self.assertEqual(get_one_product_from_database().quantity, 0)
+        self.assertEqual(len(get_all_sales_from_database()), 1500)
+
     def test_sale_is_updated_successfully(self):
         product = ProductGenerator.generate_one_product()
         product = insert_product_and_return_it(product)
@@ -178,6 +413,30 @@ class TestSaleRepository(unittest.TestCase):
         sales_in_db = get_all_sales_from_database()
         self.assertEqual([s1, s2], sales_in_db)
 
+    def test_updating_sale_quantity_updates_product_quantity(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 5
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.quantity = 2
+        sale = insert_sale_and_return_it(sale)
+
+        sale.quantity = 6
+        self.sale_repository.update_sale(sale)
+
+        self.assertEqual(get_one_sale_from_database().quantity, 6)
+        self.assertEqual(get_one_product_from_database().quantity, 1)
+
+    def test_updating_sale_quantity_without_enough_products_raises_exception(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 1
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale = insert_sale_and_return_it(sale)
+
+        sale.quantity = 3
+        self.assertRaises(NoEnoughProductQuantityException, self.sale_repository.update_sale, sale)
+
     def test_trying_to_update_nonexistent_sale_raises_exception(self):
         product = ProductGenerator.generate_one_product()
         product = insert_product_and_return_it(product)
@@ -213,6 +472,43 @@ class TestSaleRepository(unittest.TestCase):
         sale.cost = CUPMoney('-1.00')
         self.assertRaises(NegativeCostException, self.sale_repository.update_sale, sale)
 
+    def test_daily_product_sales_follow_inserted_sales(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+
+        self.sale_repository.insert_sales(sale, 2)
+        self.sale_repository.insert_sales(sale, 3)
+
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_daily_product_sales_follow_updated_and_undone_sales(self):
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 10
+        product = insert_product_and_return_it(product)
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        s1, s2, s3 = sales
+        s1.quantity, s2.quantity, s3.quantity = 2, 3, 4
+        insert_sales_and_return_them(sales)
+
+        s1.date, s1.price, s1.quantity = s1.date - timedelta(days=1), CUPMoney('50'), 5
+        self.sale_repository.update_sale(s1)
+        self.sale_repository.undo_sale_units(s2, 1)
+        self.sale_repository.delete_sale(s3)
+
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_daily_product_sales_follow_deleted_sales(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        insert_sales_and_return_them(sales)
+
+        self.sale_repository.delete_sales([sales[0].id, sales[1].id])
+
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
     def test_all_sales_are_read_from_database(self):
         product = ProductGenerator.generate_one_product()
         product.quantity = 5
@@ -327,3 +623,204 @@ class TestSaleRepository(unittest.TestCase):
         filtered_sales = self.sale_repository.get_sales_by_filter(the_filter)
 
         self.assertEqual(filtered_sales, [s5, s4, s3, s2, s1])
+
+    def test_get_sales_by_filter_using_quantity_range(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        s1, s2, s3 = sales
+        s1.quantity, s2.quantity, s3.quantity = 1, 5, 10
+        insert_sales_and_return_them(sales)
+
+        the_filter = SaleFilter()
+        the_filter.minimum_quantity = 2
+        the_filter.maximum_quantity = 10
+        filtered_sales = self.sale_repository.get_sales_by_filter(the_filter)
+
+        self.assertEqual(filtered_sales, [s2, s3])
+
+    def test_get_sales_by_filter_sorted_by_quantity_descending(self):
+        product = ProductGenerator.generate_one_product()
+        product = insert_product_and_return_it(product)
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        s1, s2, s3 = sales
+        s1.quantity, s2.quantity, s3.quantity = 4, 9, 2
+        insert_sales_and_return_them(sales)
+
+        the_filter = SaleFilter()
+        the_filter.sorted_by = SaleFilter.QUANTITY
+        the_filter.ascending_order = False
+        filtered_sales = self.sale_repository.get_sales_by_filter(the_filter)
+
+        self.assertEqual(filtered_sales, [s2, s1, s3])
+
+    def test_update_sale_keeps_the_time_of_the_sale(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = date(year=2000, month=6, day=20)
+        sale.sold_at = datetime(year=2000, month=6, day=20, hour=9, minute=15)
+        sale = insert_sale_and_return_it(sale)
+
+        sale.date = date(year=2000, month=6, day=22)
+        self.sale_repository.update_sale(sale)
+
+        self.assertEqual(get_one_sale_from_database().sold_at, datetime(year=2000, month=6, day=22, hour=9, minute=15))
+
+    def test_get_sales_heatmap_groups_sales_by_weekday_and_hour(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 4)
+        s1, s2, s3, s4 = sales
+        # El 19 de junio del 2000 fue lunes.
+        s1.sold_at, s1.quantity, s1.price = datetime(year=2000, month=6, day=19, hour=9), 2, CUPMoney('10.00')
+        s2.sold_at, s2.quantity, s2.price = datetime(year=2000, month=6, day=19, hour=9, minute=59), 1, CUPMoney('5.00')
+        s3.sold_at, s3.quantity, s3.price = datetime(year=2000, month=6, day=25, hour=23), 3, CUPMoney('1.00')
+        # Fuera del rango de fechas.
+        s4.sold_at, s4.quantity, s4.price = datetime(year=2000, month=6, day=26), 7, CUPMoney('1.00')
+        for a_sale in sales:
+            a_sale.date = a_sale.sold_at.date()
+        insert_sales_and_return_them(sales)
+
+        heatmap = self.sale_repository.get_sales_heatmap(date(year=2000, month=6, day=19),
+                                                         date(year=2000, month=6, day=25))
+
+        expected_heatmap = SalesHeatmap(date(year=2000, month=6, day=19), date(year=2000, month=6, day=25))
+        expected_heatmap.set_cell(0, 9, 3, CUPMoney('25.00'))
+        expected_heatmap.set_cell(6, 23, 3, CUPMoney('3.00'))
+        self.assertEqual(heatmap, expected_heatmap)
+
+    def test_get_sales_heatmap_ignores_sales_without_time(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sale = SaleGenerator.generate_one_sale_from_product(product)
+        sale.date = date(year=2000, month=6, day=19)
+        insert_sale_and_return_it(sale)
+
+        heatmap = self.sale_repository.get_sales_heatmap(sale.date, sale.date)
+
+        self.assertEqual(heatmap, SalesHeatmap(sale.date, sale.date))
+
+    def test_get_sales_page_by_filter_walks_all_sales_with_every_sorting(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 7)
+        for index, a_sale in enumerate(sales):
+            # Valores repetidos para que las páginas tengan que desempatar por id.
+            a_sale.date = date(year=2000, month=6, day=1 + index % 3)
+            a_sale.quantity = 1 + index % 2
+            a_sale.price, a_sale.cost = CUPMoney(str(10 + index % 3)), CUPMoney(str(index % 2))
+        sales = insert_sales_and_return_them(sales)
+
+        for sorted_by in (None, SaleFilter.ID, SaleFilter.PRODUCT_ID, SaleFilter.SALE_DATE, SaleFilter.PRICE,
+                          SaleFilter.COST, SaleFilter.PROFIT, SaleFilter.QUANTITY):
+            for ascending_order in (True, False):
+                the_filter = SaleFilter()
+                the_filter.product_id_list = [product.id]
+                the_filter.sorted_by = sorted_by
+                the_filter.ascending_order = ascending_order
+
+                walked_sales = []
+                page = self.sale_repository.get_sales_page_by_filter(the_filter, 3)
+                while len(page) > 0:
+                    walked_sales += page
+                    last_sale = page[-1]
+                    page = self.sale_repository.get_sales_page_by_filter(the_filter, 3, last_sale.id,
+                                                                         the_filter.get_sort_key(last_sale))
+
+                expected_sales = sorted(sales, key=lambda a_sale: (the_filter.get_sort_key(a_sale), a_sale.id),
+                                        reverse=not ascending_order)
+                self.assertEqual(walked_sales, expected_sales, (sorted_by, ascending_order))
+
+    def test_get_sales_page_by_filter_applies_the_filter(self):
+        products = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(2))
+        p1_sales = insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(products[0], 3))
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(products[1], 3))
+
+        the_filter = SaleFilter()
+        the_filter.product_id_list = [products[0].id]
+        page = self.sale_repository.get_sales_page_by_filter(the_filter, 2, p1_sales[0].id)
+
+        self.assertEqual(page, p1_sales[1:])
+
+    def test_get_sales_page_by_filter_without_positive_limit_raises_exception(self):
+        self.assertRaises(ValueError, self.sale_repository.get_sales_page_by_filter, SaleFilter(), 0)
+
+    def test_iter_sale_rows_can_stop_before_the_last_sale(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 3))
+
+        sale_rows = self.sale_repository.iter_sale_rows(SaleFilter(), batch_size=1)
+        first_row = next(sale_rows)
+        sale_rows.close()
+
+        self.assertEqual(first_row.id, sales[0].id)
+        self.assertEqual(self.sale_repository.get_sales_by_filter(SaleFilter()), sales)
+
+    def test_iter_sale_rows_without_positive_batch_size_raises_exception(self):
+        self.assertRaises(ValueError, self.sale_repository.iter_sale_rows, SaleFilter(), 0)
+
+    def test_get_sales_by_filter_loads_the_products_with_one_more_query(self):
+        products = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(3))
+        for a_product in products:
+            insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(a_product, 2))
+
+        with record_executed_queries() as queries:
+            sales = self.sale_repository.get_sales_by_filter(SaleFilter(), SaleRepository.SELECTIN_PRODUCT)
+            product_names = list(map(lambda a_sale: a_sale.product.name, sales))
+
+        self.assertEqual(product_names, [a_product.name for a_product in products for _ in range(2)])
+        self.assertEqual(len(queries), 2)
+
+    def test_sales_read_without_product_raise_exception_when_the_product_is_read(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(product, 2))
+
+        sale = self.sale_repository.get_sales_by_filter(SaleFilter(), SaleRepository.WITHOUT_PRODUCT)[0]
+
+        self.assertEqual(sale.product_id, product.id)
+        self.assertRaises(InvalidRequestError, lambda: sale.product)
+
+    def test_get_sales_by_filter_with_unknown_product_loading_raises_exception(self):
+        self.assertRaises(ValueError, self.sale_repository.get_sales_by_filter, SaleFilter(), 'lazy')
+
+    def test_iter_sale_rows_yields_the_filtered_rows_from_one_query(self):
+        products = insert_products_in_database_and_return_them(ProductGenerator.generate_products_by_quantity(2))
+        p1_sales = insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(products[0], 2))
+        insert_sales_and_return_them(SaleGenerator.generate_sales_from_product(products[1], 2))
+        the_filter = SaleFilter()
+        the_filter.product_id_list = [products[0].id]
+
+        with record_executed_queries() as queries:
+            sale_rows = list(self.sale_repository.iter_sale_rows(the_filter, batch_size=1))
+
+        self.assertEqual(list(map(lambda a_row: (a_row.id, a_row.product_name), sale_rows)),
+                         [(a_sale.id, products[0].name) for a_sale in p1_sales])
+        self.assertEqual(len(queries), 1)
+
+    def test_get_sale_rows_by_filter_returns_the_sales_as_rows(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 3)
+        for index, a_sale in enumerate(sales):
+            a_sale.price, a_sale.cost, a_sale.quantity = CUPMoney(f'{3 - index}.50'), CUPMoney('0.25'), index + 1
+        sales = insert_sales_and_return_them(sales)
+        the_filter = SaleFilter()
+        the_filter.sorted_by = SaleFilter.PRICE
+
+        sale_rows = self.sale_repository.get_sale_rows_by_filter(the_filter)
+
+        self.assertEqual(sale_rows, [SaleRow(a_sale.id, product.id, product.name, a_sale.date, a_sale.quantity,
+                                             a_sale.price.amount, a_sale.cost.amount)
+                                     for a_sale in reversed(sales)])
+        self.assertEqual(sale_rows[0].total_profit, sales[2].total_profit.amount)
+
+    def test_get_sale_rows_page_by_filter_continues_after_a_row_sorted_by_money(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 4)
+        for index, a_sale in enumerate(sales):
+            a_sale.price, a_sale.cost = CUPMoney('10.00'), CUPMoney(str(index % 2))
+        s1, s2, s3, s4 = insert_sales_and_return_them(sales)
+        the_filter = SaleFilter()
+        the_filter.sorted_by = SaleFilter.PROFIT
+
+        first_page = self.sale_repository.get_sale_rows_page_by_filter(the_filter, 2)
+        second_page = self.sale_repository.get_sale_rows_page_by_filter(
+            the_filter, 2, first_page[-1].id, the_filter.get_sort_key(first_page[-1]))
+
+        self.assertEqual(list(map(lambda a_row: a_row.id, first_page + second_page)), [s2.id, s4.id, s1.id, s3.id])
@@ -212,3 +212,24 @@ class TestSalesGroupedByProductRepository(TestCase):
                                   initial_date=date(year=2000, month=6, day=1),
                                   final_date=date(year=2000, month=6, day=30))
         ])
+
+    def test_groups_sum_units_of_sale_lines(self):
+        products = ProductGenerator.generate_products_by_quantity(1)
+        p1, = products
+        p1.price, p1.cost = CUPMoney('3.00'), CUPMoney('2.00')  # 1.00 profit
+        insert_products_in_database_and_return_them(products)
+        sales_of_p1 = SaleGenerator.generate_sales_from_product(p1, 2)
+        s1_p1, s2_p1 = sales_of_p1
+        s1_p1.date, s1_p1.quantity = date(year=2000, month=6, day=1), 4
+        s2_p1.date, s2_p1.quantity = date(year=2000, month=6, day=2), 6
+        insert_sales_and_return_them(sales_of_p1)
+
+        groups = self.sales_grouped_repo.get_groups_on_month(month_date=date(year=2000, month=6, day=1))
+
+        self.assertEqual(groups, [
+            SalesGroupedByProduct(product_id=p1.id, product_name=p1.name, sale_quantity=10,
+                                  acquired_money=p1.price * 10, total_cost=p1.cost * 10,
+                                  total_profit=p1.profit * 10,
+                                  initial_date=date(year=2000, month=6, day=1),
+                                  final_date=date(year=2000, month=6, day=30))
+        ])
@@ -0,0 +1,127 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from model.repository.factory import RepositoryFactory
+from model.util.monetary_types import CUPMoney
+from tests.util.general import TEST_DB_URL, delete_all_products_from_database, insert_product_and_return_it, \
+    get_rollup_inconsistencies
+from tests.util.generators.product import ProductGenerator
+from tests.util.generators.sale import SaleGenerator
+
+
+class TestTicketRepository(unittest.TestCase):
+
+    DAY = date(year=2000, month=6, day=20)
+
+    def setUp(self):
+        self.sale_repository = RepositoryFactory.get_sale_repository(TEST_DB_URL)
+        self.ticket_repository = RepositoryFactory.get_ticket_repository(TEST_DB_URL)
+        product = ProductGenerator.generate_one_product()
+        product.quantity = 100
+        product.price = CUPMoney('2.50')
+        self.product = insert_product_and_return_it(product)
+
+    def tearDown(self):
+        RepositoryFactory.close_session()
+        delete_all_products_from_database()
+
+    def checkout_units(self, units_per_line: list, created_at: datetime):
+        lines = SaleGenerator.generate_sales_from_product(self.product, len(units_per_line))
+        for a_line, units in zip(lines, units_per_line):
+            a_line.date = created_at.date()
+            a_line.quantity = units
+        return self.sale_repository.checkout(lines, created_at)
+
+    def test_checkout_stores_ticket_time_and_total(self):
+        created_at = datetime.combine(self.DAY, datetime.min.time()) + timedelta(hours=10, minutes=5)
+
+        ticket = self.checkout_units([1, 3], created_at)
+
+        self.assertEqual(self.ticket_repository.get_tickets_on_date(self.DAY), [ticket])
+        self.assertEqual((ticket.created_at, ticket.total), (created_at, CUPMoney('10.00')))
+
+    def test_get_tickets_on_date_returns_the_tickets_of_that_day_in_order(self):
+        day_start = datetime.combine(self.DAY, datetime.min.time())
+        late_ticket = self.checkout_units([1], day_start + timedelta(hours=23, minutes=59))
+        early_ticket = self.checkout_units([2], day_start)
+        self.checkout_units([1], day_start + timedelta(days=1))
+        self.checkout_units([1], day_start - timedelta(seconds=1))
+
+        self.assertEqual(self.ticket_repository.get_tickets_on_date(self.DAY), [early_ticket, late_ticket])
+
+    def test_get_ticket_summaries_by_day(self):
+        day_start = datetime.combine(self.DAY, datetime.min.time())
+        self.checkout_units([1], day_start + timedelta(hours=9))
+        self.checkout_units([2, 2], day_start + timedelta(hours=18))
+        self.checkout_units([3], day_start + timedelta(days=2, hours=12))
+
+        summaries = self.ticket_repository.get_ticket_summaries_by_day(self.DAY, self.DAY + timedelta(days=2))
+
+        self.assertEqual(list(map(lambda a_summary: a_summary.initial_time, summaries)),
+                         [day_start + timedelta(days=days) for days in range(3)])
+        self.assertEqual(list(map(lambda a_summary: a_summary.ticket_quantity, summaries)), [2, 0, 1])
+        self.assertEqual(list(map(lambda a_summary: a_summary.total, summaries)),
+                         [CUPMoney('12.50'), CUPMoney('0.00'), CUPMoney('7.50')])
+        self.assertEqual(list(map(lambda a_summary: a_summary.average_ticket, summaries)),
+                         [CUPMoney('6.25'), CUPMoney('0.00'), CUPMoney('7.50')])
+
+    def test_get_ticket_summaries_by_hour(self):
+        day_start = datetime.combine(self.DAY, datetime.min.time())
+        self.checkout_units([1], day_start + timedelta(hours=9, minutes=15))
+        self.checkout_units([1], day_start + timedelta(hours=9, minutes=45))
+        self.checkout_units([4], day_start + timedelta(hours=23, minutes=30))
+
+        summaries = self.ticket_repository.get_ticket_summaries_by_hour(self.DAY)
+
+        self.assertEqual(len(summaries), 24)
+        self.assertEqual((summaries[9].initial_time, summaries[9].final_time),
+                         (day_start + timedelta(hours=9), day_start + timedelta(hours=10)))
+        self.assertEqual({an_hour: (a_summary.ticket_quantity, a_summary.total)
+                          for an_hour, a_summary in enumerate(summaries) if a_summary.ticket_quantity > 0},
+                         {9: (2, CUPMoney('5.00')), 23: (1, CUPMoney('10.00'))})
+
+    def test_checkout_of_a_past_day_without_time_is_left_out_of_the_hours(self):
+        line = SaleGenerator.generate_one_sale_from_product(self.product)
+        line.date = self.DAY
+
+        ticket = self.sale_repository.checkout([line])
+
+        self.assertEqual((ticket.date, ticket.created_at, ticket.sales[0].sold_at), (self.DAY, None, None))
+        self.assertEqual(self.ticket_repository.get_tickets_on_date(self.DAY), [ticket])
+        day_summary, = self.ticket_repository.get_ticket_summaries_by_day(self.DAY, self.DAY)
+        self.assertEqual((day_summary.ticket_quantity, day_summary.total), (1, CUPMoney('2.50')))
+        self.assertTrue(all(map(lambda a_summary: a_summary.ticket_quantity == 0,
+                                self.ticket_repository.get_ticket_summaries_by_hour(self.DAY))))
+
+    def test_ticket_totals_follow_updated_and_undone_sales(self):
+        created_at = datetime.combine(self.DAY, datetime.min.time())
+        first_ticket = self.checkout_units([1, 2, 3], created_at)
+        second_ticket = self.checkout_units([1], created_at)
+        s1, s2, s3 = first_ticket.sales
+
+        self.sale_repository.undo_sale_units(s3, 1)
+        s2.quantity = 4
+        self.sale_repository.update_sale(s2)
+        self.sale_repository.delete_sales([s1.id])
+        self.sale_repository.delete_sale(second_ticket.sales[0])
+
+        ticket, = self.ticket_repository.get_tickets_on_date(self.DAY)
+        self.assertEqual((ticket.id, ticket.total), (first_ticket.id, CUPMoney('15.00')))
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_deleting_a_product_updates_the_tickets_of_its_sales(self):
+        other_product = ProductGenerator.generate_one_product()
+        other_product.quantity = 10
+        other_product.price = CUPMoney('1.00')
+        other_product = insert_product_and_return_it(other_product)
+        lines = [SaleGenerator.generate_one_sale_from_product(self.product),
+                 SaleGenerator.generate_one_sale_from_product(other_product)]
+        product_ticket = self.sale_repository.checkout(lines[:1])
+        mixed_ticket = self.sale_repository.checkout(lines)
+
+        RepositoryFactory.get_product_repository(TEST_DB_URL).delete_products([self.product.id])
+
+        ticket, = self.ticket_repository.get_tickets_on_date(date.today())
+        self.assertEqual((ticket.id, ticket.total), (mixed_ticket.id, CUPMoney('1.00')))
+        self.assertNotEqual(ticket.id, product_ticket.id)
+        self.assertEqual(get_rollup_inconsistencies(), {})
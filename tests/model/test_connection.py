@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest import TestCase
+
+from model.connection import create_database_engine
+
+
+class TestConnection(TestCase):
+
+    TEST_CONNECTION_DATABASE_PATH = 'test_connection.db'
+
+    def setUp(self):
+        self.delete_database_files()
+        self.engine = create_database_engine(f'sqlite:///{self.TEST_CONNECTION_DATABASE_PATH}')
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.delete_database_files()
+
+    def delete_database_files(self):
+        for a_suffix in ('', '-wal', '-shm'):
+            database_path = Path(self.TEST_CONNECTION_DATABASE_PATH + a_suffix)
+            if database_path.exists():
+                database_path.unlink()
+
+    def get_pragma(self, name: str):
+        with self.engine.connect() as connection:
+            return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+    def test_default_pragmas_are_applied_on_connect(self):
+        self.assertEqual(self.get_pragma('journal_mode'), 'wal')
+        self.assertEqual(self.get_pragma('synchronous'), 1)
+        self.assertEqual(self.get_pragma('cache_size'), -16000)
+        self.assertEqual(self.get_pragma('temp_store'), 2)
+        self.assertEqual(self.get_pragma('foreign_keys'), 1)
+
+    def test_custom_pragmas_replace_default_ones(self):
+        self.engine.dispose()
+        self.engine = create_database_engine(f'sqlite:///{self.TEST_CONNECTION_DATABASE_PATH}',
+                                             pragmas={'cache_size': -4000})
+
+        self.assertEqual(self.get_pragma('cache_size'), -4000)
+        self.assertEqual(self.get_pragma('journal_mode'), 'delete')
+
+    def test_connections_are_reused(self):
+        with self.engine.connect() as connection:
+            first_dbapi_connection = connection.connection.dbapi_connection
+
+        with self.engine.connect() as connection:
+            self.assertIs(connection.connection.dbapi_connection, first_dbapi_connection)
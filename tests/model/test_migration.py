@@ -0,0 +1,213 @@
+import sqlite3
+from pathlib import Path
+from unittest import TestCase
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+
+from model.migration import upgrade_database, SCHEMA_VERSION, NewerSchemaVersionException
+
+LEGACY_SCHEMA = (
+    'CREATE TABLE products (id INTEGER NOT NULL, name VARCHAR(80) NOT NULL, description VARCHAR(300), '
+    'price TEXT NOT NULL, cost TEXT NOT NULL, quantity INTEGER NOT NULL, PRIMARY KEY (id), UNIQUE (name))',
+    'CREATE TABLE sales (id INTEGER NOT NULL, product_id INTEGER NOT NULL, date DATE NOT NULL, '
+    'price TEXT NOT NULL, cost TEXT NOT NULL, PRIMARY KEY (id), '
+    'FOREIGN KEY(product_id) REFERENCES products (id) ON DELETE CASCADE)',
+    'CREATE TABLE expenses (id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, description VARCHAR(600), '
+    'spent_money TEXT NOT NULL, date DATE NOT NULL, PRIMARY KEY (id))'
+)
+
+
+class TestMigration(TestCase):
+
+    TEST_MIGRATION_DATABASE_PATH = 'test_migration.db'
+
+    def setUp(self):
+        self.delete_database_file()
+        self.engine = create_engine(f'sqlite:///{self.TEST_MIGRATION_DATABASE_PATH}')
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.delete_database_file()
+
+    def delete_database_file(self):
+        database_path = Path(self.TEST_MIGRATION_DATABASE_PATH)
+        if database_path.exists():
+            database_path.unlink()
+
+    def create_legacy_database(self, statements: list):
+        connection = sqlite3.connect(self.TEST_MIGRATION_DATABASE_PATH)
+        for a_statement in LEGACY_SCHEMA + tuple(statements):
+            connection.execute(a_statement)
+        connection.commit()
+        connection.close()
+
+    def execute_query(self, query: str) -> list:
+        connection = sqlite3.connect(self.TEST_MIGRATION_DATABASE_PATH)
+        rows = connection.execute(query).fetchall()
+        connection.close()
+        return rows
+
+    def upgrade_test_database(self):
+        upgrade_database(self.engine)
+
+    def test_new_database_is_created_with_last_schema_version(self):
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('PRAGMA user_version'), [(SCHEMA_VERSION,)])
+
+    def test_identical_unit_sales_are_collapsed_into_sale_lines(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "10.00", "5.00", 3)',
+            'INSERT INTO sales VALUES (1, 1, "2000-06-20", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (2, 1, "2000-06-20", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (3, 1, "2000-06-21", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (4, 1, "2000-06-20", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (5, 1, "2000-06-20", "12.00", "5.00")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT id, date, quantity FROM sales ORDER BY id'), [
+            (1, '2000-06-20', 3),
+            (3, '2000-06-21', 1),
+            (5, '2000-06-20', 1),
+        ])
+
+    def test_money_is_converted_to_integer_cents(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "10.5", "5.00", 3)',
+            'INSERT INTO sales VALUES (1, 1, "2000-06-20", "10.50", "0.05")',
+            'INSERT INTO expenses VALUES (1, "rent", "", "1234.56", "2000-06-20")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT price, cost, typeof(price) FROM products'),
+                         [(1050, 500, 'integer')])
+        self.assertEqual(self.execute_query('SELECT price, cost, typeof(cost) FROM sales'),
+                         [(1050, 5, 'integer')])
+        self.assertEqual(self.execute_query('SELECT spent_money, typeof(spent_money) FROM expenses'),
+                         [(123456, 'integer')])
+
+    def test_upgraded_database_has_date_and_product_indexes(self):
+        self.create_legacy_database([])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT name FROM sqlite_master WHERE type = "index" '
+                                            'AND name LIKE "ix_%date%" ORDER BY name'), [
+            ('ix_expenses_date',),
+            ('ix_sales_date_product_id',),
+            ('ix_sales_product_id_date',),
+            ('ix_tickets_date',),
+        ])
+
+    def test_current_database_is_not_migrated_again(self):
+        self.upgrade_test_database()
+        executed_statements = []
+        event.listen(self.engine, 'before_cursor_execute',
+                     lambda connection, cursor, statement, *args: executed_statements.append(statement))
+
+        self.upgrade_test_database()
+
+        self.assertEqual(executed_statements, ['PRAGMA user_version'])
+
+    def test_newer_database_is_rejected(self):
+        self.create_legacy_database([f'PRAGMA user_version = {SCHEMA_VERSION + 1}'])
+
+        with self.assertRaises(NewerSchemaVersionException) as context:
+            self.upgrade_test_database()
+
+        self.assertEqual(context.exception.get_database_version(), SCHEMA_VERSION + 1)
+
+    def test_failed_step_is_rolled_back(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "not money", "5.00", 3)',
+        ])
+
+        with self.assertRaises(OperationalError):
+            self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('PRAGMA user_version'), [(1,)])
+        self.assertEqual(self.execute_query('SELECT price, typeof(price) FROM products'),
+                         [('not money', 'text')])
+        self.assertEqual(self.execute_query('SELECT name FROM sqlite_master WHERE name LIKE "new_%"'), [])
+
+    def test_upgraded_database_has_daily_product_sales(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "10.00", "5.00", 3)',
+            'INSERT INTO sales VALUES (1, 1, "2000-06-20", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (2, 1, "2000-06-20", "10.00", "5.00")',
+            'INSERT INTO sales VALUES (3, 1, "2000-06-20", "12.00", "5.00")',
+            'INSERT INTO sales VALUES (4, 1, "2000-06-21", "10.00", "5.00")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT * FROM daily_product_sales ORDER BY date'), [
+            ('2000-06-20', 1, 3, 3200, 1500),
+            ('2000-06-21', 1, 1, 1000, 500),
+        ])
+
+    def test_upgraded_database_has_daily_expense_totals(self):
+        self.create_legacy_database([
+            'INSERT INTO expenses VALUES (1, "rent", "", "10.50", "2000-06-20")',
+            'INSERT INTO expenses VALUES (2, "food", "", "1.25", "2000-06-20")',
+            'INSERT INTO expenses VALUES (3, "rent", "", "3.00", "2000-06-21")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT * FROM daily_expense_totals ORDER BY date'), [
+            ('2000-06-20', 1175),
+            ('2000-06-21', 300),
+        ])
+
+    def test_upgraded_database_has_full_text_search_indexes(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "Silla blanca", "De madera", "10.00", "5.00", 3)',
+            'INSERT INTO expenses VALUES (1, "Alquiler", "Local de la tienda", "10.50", "2000-06-20")',
+        ])
+
+        self.upgrade_test_database()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql('INSERT INTO products (name, description, price, cost, quantity) '
+                                       'VALUES ("Mesa", "De madera", 1000, 500, 1)')
+            connection.exec_driver_sql('UPDATE expenses SET description = "Pago mensual" WHERE id = 1')
+
+        self.assertEqual(self.execute_query(
+            'SELECT rowid FROM products_fts WHERE products_fts MATCH \'"mad"*\' ORDER BY rowid'), [(1,), (2,)])
+        self.assertEqual(self.execute_query(
+            'SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH \'"tienda"*\''), [])
+        self.assertEqual(self.execute_query(
+            'SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH \'"mensual"*\''), [(1,)])
+
+    def test_upgraded_database_has_tickets(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "10.00", "5.00", 3)',
+            'INSERT INTO sales VALUES (1, 1, "2000-06-20", "10.00", "5.00")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT id, ticket_id FROM sales'), [(1, None)])
+        self.assertEqual(self.execute_query('SELECT id, date, created_at, total FROM tickets'), [])
+        self.assertIn('ix_tickets_date', self.execute_query('EXPLAIN QUERY PLAN SELECT total FROM tickets '
+                                                             'WHERE date = "2000-06-20"')[0][-1])
+        self.assertIn('ix_tickets_created_at', self.execute_query('EXPLAIN QUERY PLAN SELECT total FROM tickets '
+                                                                   'WHERE created_at >= "2000-06-20"')[0][-1])
+        self.assertIn('ix_sales_ticket_id', self.execute_query('EXPLAIN QUERY PLAN SELECT id FROM sales '
+                                                                'WHERE ticket_id = 1')[0][-1])
+
+    def test_upgraded_sales_keep_their_date_without_time(self):
+        self.create_legacy_database([
+            'INSERT INTO products VALUES (1, "chair", "", "10.00", "5.00", 3)',
+            'INSERT INTO sales VALUES (1, 1, "2000-06-20", "10.00", "5.00")',
+        ])
+
+        self.upgrade_test_database()
+
+        self.assertEqual(self.execute_query('SELECT date, sold_at FROM sales'), [('2000-06-20', None)])
+        self.assertIn('ix_sales_sold_at', self.execute_query('EXPLAIN QUERY PLAN SELECT quantity FROM sales '
+                                                              'WHERE sold_at >= "2000-06-20"')[0][-1])
@@ -0,0 +1,90 @@
+from datetime import date
+from unittest import TestCase
+
+from sqlalchemy import update
+
+from model.entity.models import DailyProductSales, DailyExpenseTotal, Ticket
+from model.rollup import rebuild_rollups, verify_daily_product_sales, verify_daily_expense_totals, \
+    verify_ticket_totals
+from model.util.monetary_types import CUPMoney
+from tests.util.general import create_test_session, delete_all_products_from_database, \
+    insert_product_and_return_it, insert_sales_and_return_them, get_rollup_inconsistencies, \
+    delete_all_expenses_from_database, insert_expenses_in_database
+from tests.util.generators.expense import ExpenseGenerator
+from tests.util.generators.product import ProductGenerator
+from tests.util.generators.sale import SaleGenerator
+
+
+class TestRollup(TestCase):
+
+    def tearDown(self):
+        delete_all_products_from_database()
+        delete_all_expenses_from_database()
+
+    def insert_two_sales_on_the_same_day(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 2)
+        for a_sale in sales:
+            a_sale.date = date(year=2000, month=6, day=20)
+            a_sale.price, a_sale.cost = CUPMoney('3.00'), CUPMoney('2.00')
+            a_sale.quantity = 2
+        insert_sales_and_return_them(sales)
+        return product
+
+    def test_daily_product_sales_hold_one_row_per_product_and_day(self):
+        product = self.insert_two_sales_on_the_same_day()
+
+        with create_test_session() as session:
+            rows = session.query(DailyProductSales).all()
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0].date, rows[0].product_id, rows[0].units, rows[0].revenue, rows[0].cost),
+                         (date(year=2000, month=6, day=20), product.id, 4, CUPMoney('12.00'), CUPMoney('8.00')))
+
+    def test_verify_finds_and_rebuild_fixes_inconsistent_rows(self):
+        product = self.insert_two_sales_on_the_same_day()
+        with create_test_session() as session:
+            session.execute(update(DailyProductSales).values(units=1))
+            session.commit()
+
+        with create_test_session() as session:
+            inconsistent_keys = verify_daily_product_sales(session.connection())
+            rebuild_rollups(session.connection())
+            session.commit()
+
+        self.assertEqual(inconsistent_keys, [(date(year=2000, month=6, day=20), product.id)])
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_verify_finds_missing_daily_expense_totals(self):
+        expenses = ExpenseGenerator.generate_expenses_by_quantity(2)
+        for an_expense in expenses:
+            an_expense.date = date(year=2000, month=6, day=20)
+        insert_expenses_in_database(expenses)
+        with create_test_session() as session:
+            session.query(DailyExpenseTotal).delete()
+            session.commit()
+
+        with create_test_session() as session:
+            inconsistent_dates = verify_daily_expense_totals(session.connection())
+            rebuild_rollups(session.connection())
+            session.commit()
+
+        self.assertEqual(inconsistent_dates, [date(year=2000, month=6, day=20)])
+        self.assertEqual(get_rollup_inconsistencies(), {})
+
+    def test_verify_finds_wrong_and_empty_tickets(self):
+        product = insert_product_and_return_it(ProductGenerator.generate_one_product())
+        sales = SaleGenerator.generate_sales_from_product(product, 2)
+        with create_test_session() as session:
+            tickets = [Ticket(date=date(year=2000, month=6, day=20), total=CUPMoney('1.00'), sales=sales),
+                       Ticket(date=date(year=2000, month=6, day=20), total=CUPMoney('1.00'))]
+            session.add_all(tickets)
+            session.commit()
+
+        with create_test_session() as session:
+            inconsistent_ticket_ids = verify_ticket_totals(session.connection())
+            rebuild_rollups(session.connection())
+            session.commit()
+
+        self.assertEqual(inconsistent_ticket_ids, [tickets[0].id, tickets[1].id])
+        self.assertEqual(get_rollup_inconsistencies(), {})
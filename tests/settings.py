@@ -7,9 +7,10 @@ from tests.util.general import TEST_REPORT_PATH
 
 
 def __delete_test_database():
-    db_file = Path('test.db')
-    if db_file.exists():
-        db_file.unlink()
+    for a_file_name in ('test.db', 'test.db-wal', 'test.db-shm'):
+        db_file = Path(a_file_name)
+        if db_file.exists():
+            db_file.unlink()
 
 
 def __create_generated_report_folder():
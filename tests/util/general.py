@@ -1,10 +1,16 @@
+import sqlite3
+from contextlib import contextmanager
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, select, event
 from model.entity.models import Product, Sale, Expense
+from model.rollup import rebuild_rollups, verify_rollups
 from pathlib import Path
 
 
-TEST_DB_URL = 'sqlite:///test.db'
+TEST_DB_PATH = 'test.db'
+
+TEST_DB_URL = f'sqlite:///{TEST_DB_PATH}'
 
 TEST_REPORT_PATH = Path('generated').joinpath('reports')
 
@@ -66,6 +72,8 @@ def delete_all_products_from_database():
         statement = select(Product)
         for a_product in session.scalars(statement):
             session.delete(a_product)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
 
 
@@ -81,12 +89,15 @@ def get_one_sale_from_database() -> Sale:
 
 def __are_sales_equal_ignoring_id(sale_1: Sale, sale_2: Sale):
     return (sale_1.product_id == sale_2.product_id and sale_1.date == sale_2.date
-            and sale_1.price == sale_2.price and sale_1.profit == sale_2.profit)
+            and sale_1.price == sale_2.price and sale_1.profit == sale_2.profit
+            and sale_1.quantity == sale_2.quantity)
 
 
 def insert_sale_and_return_it(sale: Sale):
     with create_test_session() as session:
         session.add(sale)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
         return sale
 
@@ -94,6 +105,8 @@ def insert_sale_and_return_it(sale: Sale):
 def insert_sales_and_return_them(sales: list) -> list:
     with create_test_session() as session:
         session.add_all(sales)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
         return sales
 
@@ -112,6 +125,8 @@ def delete_all_expenses_from_database():
         statement = select(Expense)
         for an_expense in session.scalars(statement):
             session.delete(an_expense)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
 
 
@@ -123,6 +138,8 @@ def get_all_expenses_from_database() -> list:
 def insert_one_expense_in_database(an_expense: Expense) -> Expense:
     with create_test_session() as session:
         session.add(an_expense)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
         return an_expense
 
@@ -130,5 +147,42 @@ def insert_one_expense_in_database(an_expense: Expense) -> Expense:
 def insert_expenses_in_database(expenses: list) -> list:
     with create_test_session() as session:
         session.add_all(expenses)
+        session.flush()
+        rebuild_rollups(session.connection())
         session.commit()
         return expenses
+
+
+@contextmanager
+def record_executed_queries():
+    """
+    Records the (statement, parameters) pairs sent to the database by any engine
+    while the context is active.
+    """
+    queries = []
+
+    def record_query(connection, cursor, statement, parameters, context, executemany):
+        queries.append((statement, parameters))
+
+    event.listen(Engine, 'before_cursor_execute', record_query)
+    try:
+        yield queries
+    finally:
+        event.remove(Engine, 'before_cursor_execute', record_query)
+
+
+def get_query_plan(statement: str, parameters) -> str:
+    connection = sqlite3.connect(TEST_DB_PATH)
+    plan_rows = connection.execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    connection.close()
+    return '\n'.join(map(lambda a_row: a_row[-1], plan_rows))
+
+
+def get_rollup_inconsistencies() -> dict:
+    """
+    Returns the keys of the summary tables rows that do not match the raw tables,
+    only for the summary tables with inconsistencies.
+    """
+    with create_test_session() as session:
+        inconsistencies = verify_rollups(session.connection())
+    return {table_name: keys for table_name, keys in inconsistencies.items() if keys}
@@ -24,6 +24,7 @@ class SaleGenerator:
         sale.product = product
         sale.price = product.price
         sale.cost = product.cost
+        sale.quantity = 1
 
         return sale
 
@@ -33,4 +34,5 @@ class SaleGenerator:
         sale.date = SaleGenerator.DEFAULT_DATE
         sale.price = CUPMoney('2.00')
         sale.cost = CUPMoney('1.00')
+        sale.quantity = 1
         return sale
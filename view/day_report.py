@@ -19,9 +19,10 @@ class DaySaleReportView(QFrame, ErrorView, ToastView):
     SALE_ID_COLUMN = 0
     PRODUCT_NAME_COLUMN = 1
     PRODUCT_ID_COLUMN = 2
-    SALE_PRICE_COLUMN = 3
-    SALE_COST_COLUMN = 4
-    SALE_PROFIT_COLUMN = 5
+    SALE_QUANTITY_COLUMN = 3
+    SALE_PRICE_COLUMN = 4
+    SALE_COST_COLUMN = 5
+    SALE_PROFIT_COLUMN = 6
 
     def __init__(self, presenter):
         super().__init__()
@@ -53,11 +54,12 @@ class DaySaleReportView(QFrame, ErrorView, ToastView):
         self.back_button.set_icon(QPixmap(resource_path('view/ui/images/back.png')))
 
     def __set_up_table_format(self):
-        self.sale_group_table.setColumnCount(6)
+        self.sale_group_table.setColumnCount(7)
         self.sale_group_table.setHorizontalHeaderLabels([
             'Id. Venta',
             'Producto',
             'Id. Producto',
+            'Cantidad',
             'Pagado',
             'Costo',
             'Ganancia'
@@ -146,7 +148,7 @@ class DaySaleReportView(QFrame, ErrorView, ToastView):
         item = QTableWidgetItem(str(data))
         if column in [self.SALE_PRICE_COLUMN, self.SALE_COST_COLUMN, self.SALE_PROFIT_COLUMN]:
             item = QCUPMoneyTableItem(str(data))
-        elif column == self.SALE_ID_COLUMN or column == self.PRODUCT_ID_COLUMN:
+        elif column in [self.SALE_ID_COLUMN, self.PRODUCT_ID_COLUMN, self.SALE_QUANTITY_COLUMN]:
             item = QIntegerTableItem(str(data))
         self.sale_group_table.setItem(row, column, item)
 
@@ -1,6 +1,6 @@
 from datetime import date
 from PyQt5.QtCore import QDate
-from PyQt5.QtWidgets import QFrame, QMessageBox
+from PyQt5.QtWidgets import QFrame, QMessageBox, QSpinBox
 from PyQt5.uic import loadUi
 from model.util.monetary_types import CUPMoney
 from view.util.cup_spin_box import CUPSpinBox
@@ -15,12 +15,14 @@ class EditSaleView(QFrame):
 
         self.paid_money_spin_box: CUPSpinBox = None
         self.cost_money_spin_box: CUPSpinBox = None
+        self.sale_quantity_spin_box: QSpinBox = None
 
         self.set_up_gui()
 
     def set_up_gui(self):
         loadUi(resource_path('view/ui/edit_sale_form.ui'), self)
         self.__setup_price_and_profit_spin_boxes()
+        self.__setup_sale_quantity_spin_box()
         self.sale_date_edit.setMaximumDate(QDate.currentDate())
         self.wire_up_gui_connections()
 
@@ -33,6 +35,11 @@ class EditSaleView(QFrame):
         self.paid_money_spin_box.valueChanged.connect(self.__update_profit_label)
         self.cost_money_spin_box.valueChanged.connect(self.__update_profit_label)
 
+    def __setup_sale_quantity_spin_box(self):
+        self.sale_quantity_spin_box = QSpinBox()
+        self.sale_quantity_spin_box.setMinimum(1)
+        self.grid_form_frame.layout().addWidget(self.sale_quantity_spin_box, 2, 1)
+
     def __update_profit_label(self):
         price = CUPMoney(self.get_paid_money_as_str())
         cost = CUPMoney(self.get_cost_money_as_str())
@@ -68,6 +75,15 @@ class EditSaleView(QFrame):
         """This returns the numeric part of a string like '10.55 CUP'. '10.55' would be returned."""
         return self.cost_money_spin_box.cleanText().split()[0]
 
+    def set_sale_quantity(self, quantity: int):
+        self.sale_quantity_spin_box.setValue(quantity)
+
+    def set_maximum_sale_quantity(self, maximum_quantity: int):
+        self.sale_quantity_spin_box.setMaximum(maximum_quantity)
+
+    def get_sale_quantity(self) -> int:
+        return self.sale_quantity_spin_box.value()
+
     def set_sale_date(self, sale_date: date):
         q_date = QDate()
         q_date.setDate(
@@ -0,0 +1,145 @@
+from datetime import date
+
+from PyQt5.QtCore import QDate, QPointF
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QFrame, QToolBar, QHBoxLayout
+from pyqtgraph import PlotWidget, mkPen, AxisItem, ImageItem, ColorMap
+from PyQt5.uic import loadUi
+import numpy
+
+from model.entity.sales_heatmap import WEEKDAY_QUANTITY, HOUR_QUANTITY
+from view.util.text_tool_button import ToolButtonWithTextAndIcon
+from util.resources_path import resource_path
+
+
+class HourStatisticsView(QFrame):
+
+    UNITS_ITEM = 'Unidades vendidas'
+    ACQUIRED_MONEY_ITEM = 'Dinero obtenido'
+
+    WEEKDAY_NAMES = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+
+    def __init__(self, presenter):
+        super().__init__()
+        self.__presenter = presenter
+        self.__has_values = False
+
+        self.__setup_gui()
+
+    def __setup_gui(self):
+        loadUi(resource_path('view/ui/hour_statistics.ui'), self)
+        self.__setup_back_tool_button()
+        self.__setup_date_edits()
+        self.__setup_values_combo_box()
+        self.__setup_graph()
+        self.__setup_gui_connections()
+
+    def __setup_back_tool_button(self):
+        self.tool_bar = QToolBar()
+        self.tool_bar_frame.setLayout(QHBoxLayout())
+        self.tool_bar_frame.layout().setContentsMargins(0, 0, 0, 0)
+        self.tool_bar_frame.layout().setMenuBar(self.tool_bar)
+
+        self.back_button = ToolButtonWithTextAndIcon('Atrás')
+        self.back_button.set_icon(QPixmap(resource_path('view/ui/images/back.png')))
+        self.tool_bar.addWidget(self.back_button)
+
+    def __setup_date_edits(self):
+        self.initial_date_edit.setMaximumDate(QDate.currentDate())
+        self.initial_date_edit.setDate(QDate.currentDate().addDays(-27))
+        self.final_date_edit.setMaximumDate(QDate.currentDate())
+        self.final_date_edit.setDate(QDate.currentDate())
+
+    def __setup_values_combo_box(self):
+        self.vertical_axes_combo_box.addItems([
+            self.UNITS_ITEM,
+            self.ACQUIRED_MONEY_ITEM
+        ])
+        self.vertical_axes_combo_box.setCurrentIndex(0)
+
+    def __setup_graph(self):
+        layout = self.graph_frame.layout()
+        self.plot_widget = PlotWidget(parent=self.graph_frame, background='white', foreground='black')
+        layout.addWidget(self.plot_widget)
+        self.__set_axis_style()
+        self.__set_axis_ticks()
+
+        view_box = self.plot_widget.getPlotItem().getViewBox()
+        view_box.setMouseEnabled(x=False, y=False)
+        view_box.setMenuEnabled(False)
+        view_box.invertY(True)
+        view_box.setRange(xRange=(0, HOUR_QUANTITY), yRange=(0, WEEKDAY_QUANTITY), padding=0)
+        self.plot_widget.getPlotItem().hideButtons()
+
+        self.image_item = ImageItem()
+        color_map = ColorMap(pos=[0.0, 1.0], color=[(255, 255, 255), (0x55, 0x99, 0xff)])
+        self.image_item.setLookupTable(color_map.getLookupTable())
+        self.plot_widget.addItem(self.image_item)
+
+    def __set_axis_style(self):
+        black_pen = mkPen(color='black')
+
+        bottom_axis: AxisItem = self.plot_widget.getPlotItem().getAxis('bottom')
+        bottom_axis.setPen(black_pen)
+        bottom_axis.setTextPen(black_pen)
+
+        left_axis: AxisItem = self.plot_widget.getPlotItem().getAxis('left')
+        left_axis.setPen(black_pen)
+        left_axis.setTextPen(black_pen)
+
+    def __set_axis_ticks(self):
+        # Cada celda ocupa una unidad del gráfico, así que las marcas van en su centro.
+        self.plot_widget.getPlotItem().getAxis('bottom').setTicks(
+            [[(hour + 0.5, str(hour)) for hour in range(HOUR_QUANTITY)]])
+        self.plot_widget.getPlotItem().getAxis('left').setTicks(
+            [[(weekday + 0.5, name) for weekday, name in enumerate(self.WEEKDAY_NAMES)]])
+
+    def __setup_gui_connections(self):
+        self.back_button.clicked.connect(self.__presenter.close_presenter)
+        self.calculate_button.clicked.connect(self.__presenter.calculate_sales_heatmap)
+        self.calculate_button.clicked.connect(lambda: self.vertical_axes_combo_box.setDisabled(False))
+        self.calculate_button.clicked.connect(self.__set_graph_title)
+        self.vertical_axes_combo_box.currentTextChanged.connect(self.__presenter.change_shown_values_and_plot)
+        self.vertical_axes_combo_box.currentTextChanged.connect(self.__set_graph_title)
+        self.plot_widget.scene().sigMouseMoved.connect(self.__show_tool_tip_of_hovered_cell)
+
+    def __set_graph_title(self):
+        initial_date, final_date = self.get_selected_date_range()
+        self.plot_widget.getPlotItem() \
+            .setTitle(f'<span style="color: black">{self.get_shown_values_option()} por hora del '
+                      f'{initial_date.strftime("%d/%m/%Y")} al {final_date.strftime("%d/%m/%Y")}</span>')
+
+    def __show_tool_tip_of_hovered_cell(self, position: QPointF):
+        point = self.plot_widget.getPlotItem().getViewBox().mapSceneToView(position)
+        hour, weekday = int(point.x()), int(point.y())
+
+        if self.__has_values and 0 <= point.x() < HOUR_QUANTITY and 0 <= point.y() < WEEKDAY_QUANTITY:
+            self.plot_widget.setToolTip(self.__presenter.create_tool_tip_for_cell(weekday, hour))
+        else:
+            self.plot_widget.setToolTip('')
+
+    def get_selected_date_range(self) -> tuple:
+        initial_qdate: QDate = self.initial_date_edit.date()
+        final_qdate: QDate = self.final_date_edit.date()
+        initial_date = date(day=initial_qdate.day(), month=initial_qdate.month(), year=initial_qdate.year())
+        final_date = date(day=final_qdate.day(), month=final_qdate.month(), year=final_qdate.year())
+        return min(initial_date, final_date), max(initial_date, final_date)
+
+    def get_shown_values_option(self) -> str:
+        return self.vertical_axes_combo_box.currentText()
+
+    def disable_gui(self, disable: bool):
+        self.tool_bar_frame.setDisabled(disable)
+        self.main_content_frame.setDisabled(disable)
+
+    def set_status_bar_message(self, message: str):
+        self.status_bar_label.setText(message)
+
+    def plot_values(self, values_by_hour: list):
+        """
+        Dibuja el mapa de calor. values_by_hour tiene una lista por cada hora con el
+        valor de cada día de la semana.
+        """
+        image = numpy.array(values_by_hour, dtype=float)
+        self.image_item.setImage(image, levels=(0, max(image.max(), 1)))
+        self.__has_values = True
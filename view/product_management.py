@@ -180,6 +180,22 @@ class ProductManagementView(QFrame, ToastView):
         self.product_table.clearSelection()
         self.__disable_edit_and_delete_buttons_if_no_row_selected()
 
+    def get_row_of_product(self, product_id: int) -> int:
+        """
+        Devuelve la fila del producto en la tabla o -1 si no está.
+        """
+        for a_row in range(self.product_table.rowCount()):
+            id_item = self.product_table.item(a_row, self.ID_COLUMN)
+            if id_item is not None and int(id_item.text()) == product_id:
+                return a_row
+        return -1
+
+    def delete_product_row(self, product_id: int):
+        row = self.get_row_of_product(product_id)
+        if row != -1:
+            self.product_table.removeRow(row)
+            self.__disable_edit_and_delete_buttons_if_no_row_selected()
+
     def get_last_row_index(self) -> int:
         return self.product_table.rowCount() - 1
 
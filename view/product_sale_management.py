@@ -1,7 +1,7 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QFrame, QTableWidget, QTableWidgetItem, QMessageBox, QToolBar, QHBoxLayout, \
-    QPushButton
+    QPushButton, QInputDialog
 from PyQt5.uic import loadUi
 from view.util.table_columns import QCUPMoneyTableItem, QIntegerTableItem
 from view.util.text_tool_button import ToolButtonWithTextAndIcon
@@ -12,10 +12,14 @@ from util.resources_path import resource_path
 class ProductSaleManagementView(QFrame, ToastView):
 
     SALE_ID_COLUMN = 0
-    PAYMENT_COLUMN = 1
-    COST_COLUMN = 2
-    PROFIT_COLUMN = 3
-    SALE_DATE_COLUMN = 4
+    QUANTITY_COLUMN = 1
+    PAYMENT_COLUMN = 2
+    COST_COLUMN = 3
+    PROFIT_COLUMN = 4
+    SALE_DATE_COLUMN = 5
+
+    # Filas que faltan por mostrar cuando se piden más ventas al desplazar la tabla.
+    LOAD_MORE_SALES_SCROLL_MARGIN = 20
 
     def __init__(self, presenter):
         super().__init__()
@@ -71,9 +75,10 @@ class ProductSaleManagementView(QFrame, ToastView):
         self.delete_filter_button.set_icon(QPixmap(resource_path('view/ui/images/delete_filter.png')))
 
     def __set_table_format(self):
-        self.sale_table.setColumnCount(5)
+        self.sale_table.setColumnCount(6)
         self.sale_table.setHorizontalHeaderLabels([
             'Id. Venta',
+            'Cantidad',
             'Pago',
             'Costo del producto',
             'Ganancia',
@@ -95,7 +100,8 @@ class ProductSaleManagementView(QFrame, ToastView):
         self.filter_button.clicked.connect(self.__presenter.open_filter_presenter)
         self.delete_filter_button.clicked.connect(self.__presenter.execute_thread_to_delete_applied_filter)
         self.sale_table.horizontalHeader().sectionClicked.connect(self.__change_sorting_configuration)
-        self.sale_table.horizontalHeader().sectionClicked.connect(self.sort_table_rows)
+        self.sale_table.horizontalHeader().sectionClicked.connect(self.__presenter.sort_sales)
+        self.sale_table.verticalScrollBar().valueChanged.connect(self.__load_more_sales_when_reaching_the_end)
 
     def __disable_buttons_depending_on_table_selection(self):
         selected_sale_quantity = self.__get_selected_sale_quantity()
@@ -130,6 +136,13 @@ class ProductSaleManagementView(QFrame, ToastView):
             self.__sorting_column = clicked_header_section
             self.__sorting_order = Qt.AscendingOrder
 
+    def __load_more_sales_when_reaching_the_end(self, scroll_value: int):
+        if scroll_value >= self.sale_table.verticalScrollBar().maximum() - self.LOAD_MORE_SALES_SCROLL_MARGIN:
+            self.__presenter.load_next_sale_page()
+
+    def get_sorting_configuration(self) -> tuple:
+        return self.__sorting_column, self.__sorting_order == Qt.AscendingOrder
+
     def sort_table_rows(self):
         horizontal_header = self.sale_table.horizontalHeader()
         horizontal_header.setSortIndicator(self.__sorting_column, self.__sorting_order)
@@ -140,8 +153,7 @@ class ProductSaleManagementView(QFrame, ToastView):
         self.delete_filter_button.setDisabled(set_disabled)
 
     def clean_table(self):
-        while self.sale_table.rowCount() > 0:
-            self.sale_table.removeRow(0)
+        self.sale_table.setRowCount(0)
 
     def add_empty_row_at_the_end_of_table(self):
         new_row_index = self.sale_table.rowCount()
@@ -155,7 +167,7 @@ class ProductSaleManagementView(QFrame, ToastView):
         item = QTableWidgetItem(str(data))
         if column in [self.PAYMENT_COLUMN, self.COST_COLUMN, self.PROFIT_COLUMN]:
             item = QCUPMoneyTableItem(str(data))
-        elif column == self.SALE_ID_COLUMN:
+        elif column in [self.SALE_ID_COLUMN, self.QUANTITY_COLUMN]:
             item = QIntegerTableItem(str(data))
         self.sale_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
         self.sale_table.setItem(row, column, item)
@@ -196,6 +208,28 @@ class ProductSaleManagementView(QFrame, ToastView):
         pressed_button = message_box.exec()
         return message_box.clickedButton() == undo_button
 
+    def ask_user_for_units_to_undo(self, sold_units: int) -> int:
+        """
+        Devuelve la cantidad de unidades que el usuario quiere deshacer, o 0 si canceló
+        el diálogo.
+        """
+        units, accepted = QInputDialog.getInt(self.window(),
+                                              'Blue POS - Deshacer venta',
+                                              f'Esta venta tiene {sold_units} unidades.\n\n'
+                                              '¿Cuántas unidades desea deshacer?',
+                                              value=sold_units, min=1, max=sold_units)
+        if accepted:
+            return units
+        return 0
+
+    def get_units_of_selected_sale(self) -> int:
+        row = self.sale_table.selectionModel().selectedRows(self.SALE_ID_COLUMN)[0].row()
+        return int(self.sale_table.item(row, self.QUANTITY_COLUMN).text())
+
+    def set_units_of_selected_sale(self, units: int):
+        row = self.sale_table.selectionModel().selectedRows(self.SALE_ID_COLUMN)[0].row()
+        self.set_cell_in_table(row, self.QUANTITY_COLUMN, units)
+
     def __get_selected_sale_quantity(self) -> int:
         return len(self.sale_table.selectionModel().selectedRows(self.SALE_ID_COLUMN))
 
@@ -57,6 +57,18 @@ class SaleFilterView(QFrame):
         self.final_sale_date_check_box.stateChanged.connect(
             self.__change_filter_button_availability
         )
+        self.minimum_quantity_check_box.stateChanged.connect(
+            lambda: self.minimum_quantity_spin_box.setDisabled(not self.minimum_quantity_check_box.isChecked())
+        )
+        self.minimum_quantity_check_box.stateChanged.connect(
+            self.__change_filter_button_availability
+        )
+        self.maximum_quantity_check_box.stateChanged.connect(
+            lambda: self.maximum_quantity_spin_box.setDisabled(not self.maximum_quantity_check_box.isChecked())
+        )
+        self.maximum_quantity_check_box.stateChanged.connect(
+            self.__change_filter_button_availability
+        )
 
     def __change_initial_sale_date_availability(self):
         self.initial_date_edit.setDisabled(
@@ -70,7 +82,9 @@ class SaleFilterView(QFrame):
 
     def __change_filter_button_availability(self):
         if (self.initial_sale_date_check_box.isChecked() or
-                self.final_sale_date_check_box.isChecked()):
+                self.final_sale_date_check_box.isChecked() or
+                self.minimum_quantity_check_box.isChecked() or
+                self.maximum_quantity_check_box.isChecked()):
             self.filter_button.setDisabled(False)
         else:
             self.filter_button.setDisabled(True)
@@ -125,4 +139,28 @@ class SaleFilterView(QFrame):
         if checked:
             self.final_sale_date_check_box.setCheckState(Qt.Checked)
         else:
-            self.final_sale_date_check_box.setCheckState(Qt.Unchecked)
\ No newline at end of file
+            self.final_sale_date_check_box.setCheckState(Qt.Unchecked)
+
+    def get_minimum_quantity(self) -> int:
+        if not self.minimum_quantity_check_box.isChecked():
+            return None
+        return self.minimum_quantity_spin_box.value()
+
+    def set_minimum_quantity(self, quantity: int):
+        if quantity is None:
+            return
+
+        self.minimum_quantity_check_box.setCheckState(Qt.Checked)
+        self.minimum_quantity_spin_box.setValue(quantity)
+
+    def get_maximum_quantity(self) -> int:
+        if not self.maximum_quantity_check_box.isChecked():
+            return None
+        return self.maximum_quantity_spin_box.value()
+
+    def set_maximum_quantity(self, quantity: int):
+        if quantity is None:
+            return
+
+        self.maximum_quantity_check_box.setCheckState(Qt.Checked)
+        self.maximum_quantity_spin_box.setValue(quantity)
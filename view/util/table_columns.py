@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QTableWidgetItem
-from model.util.monetary_types import CUPMoney
+from model.util.monetary_types import CUPMoney, format_amount
 
 
 class QCustomTableItemTypes:
@@ -14,6 +14,9 @@ class QCUPMoneyTableItem(QTableWidgetItem):
         if 'CUP' in text:
             cup, amount = text.split()
             text = f'{amount}'
+        # Las filas de solo lectura traen los montos como Decimal, que se escriben sin
+        # comas; todas las celdas de dinero se muestran como Money.
+        text = format_amount(self.__create_cup_money(text).amount)
         super().__init__(text, type=QCustomTableItemTypes.CUP_MONEY_TYPE)
 
     def __lt__(self, other):